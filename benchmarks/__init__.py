@@ -0,0 +1 @@
+"""Reproducible benchmarks for video-tools against local stand-in servers."""
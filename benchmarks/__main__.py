@@ -0,0 +1,90 @@
+"""CLI: ``python -m benchmarks run`` / ``python -m benchmarks compare``."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from video_tools.youtube import parse_rate
+
+from .runner import compare, run_benchmarks, run_child
+from .scenarios import SCENARIOS
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="video-tools benchmark harness.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run scenarios and write JSON results.")
+    run_parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run (repeatable; default: all).",
+    )
+    run_parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario.")
+    run_parser.add_argument(
+        "--bandwidth", help="Per-connection bandwidth of the stand-in server (e.g., 20M)."
+    )
+    run_parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added before every response."
+    )
+    run_parser.add_argument(
+        "--media", action="store_true", help="Encode real MP4/HLS media with FFmpeg."
+    )
+    run_parser.add_argument(
+        "--segment-workers", type=int, default=8, help="Workers for segment scenarios."
+    )
+    run_parser.add_argument("--output", type=Path, help="Results file (default: stdout).")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files.")
+    compare_parser.add_argument("base", type=Path)
+    compare_parser.add_argument("head", type=Path)
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Relative change counted as a regression."
+    )
+
+    child_parser = subparsers.add_parser("_child")
+    child_parser.add_argument("name")
+    child_parser.add_argument("base_url")
+    child_parser.add_argument("work_dir", type=Path)
+    child_parser.add_argument("options")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    if args.command == "_child":
+        result = run_child(args.name, args.base_url, args.work_dir, json.loads(args.options))
+        print(json.dumps(result))
+        return 0
+    if args.command == "run":
+        results = run_benchmarks(
+            args.scenario or list(SCENARIOS),
+            repeat=args.repeat,
+            bandwidth=parse_rate(args.bandwidth) if args.bandwidth else None,
+            latency=args.latency,
+            media=args.media,
+            options={"segment_workers": args.segment_workers},
+        )
+        text = json.dumps(results, indent=2)
+        if args.output:
+            args.output.write_text(text + "\n", encoding="utf-8")
+        else:
+            print(text)
+        return 0
+
+    base = json.loads(args.base.read_text(encoding="utf-8"))
+    head = json.loads(args.head.read_text(encoding="utf-8"))
+    rows = compare(base, head, threshold=args.threshold)
+    for name, metric, old, new, change, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:<15} {metric:<26} {old:>12.4g} -> {new:<12.4g} {change:+7.1%} {flag}")
+    print(f"{base.get('commit')} -> {head.get('commit')}: {len(rows)} metric(s) compared")
+    return 1 if any(row[-1] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
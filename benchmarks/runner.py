@@ -0,0 +1,140 @@
+"""Run scenarios in isolated child processes and compare result files across commits."""
+
+from __future__ import annotations
+
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .scenarios import SCENARIOS
+from .server import StandInServer, generate_media
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def run_child(name: str, base_url: str, work_dir: Path, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Entry point inside the child process: run one scenario and add peak RSS."""
+
+    result = SCENARIOS[name](base_url, work_dir, options)
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    scale = 1 if sys.platform == "darwin" else 1024
+    result["peak_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+    if children:
+        result["children_peak_rss_bytes"] = children
+    return result
+
+
+def run_benchmarks(
+    names: Iterable[str],
+    *,
+    repeat: int = 3,
+    bandwidth: float | None = None,
+    latency: float = 0.0,
+    media: bool = False,
+    options: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """Run each scenario ``repeat`` times against a fresh stand-in server."""
+
+    options = dict(options or {}, media=media)
+    results: Dict[str, Any] = {
+        "commit": _git_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"repeat": repeat, "bandwidth": bandwidth, "latency": latency, **options},
+        "scenarios": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="video-tools-bench-") as scratch:
+        media_dir = generate_media(Path(scratch) / "media") if media else None
+        if media and media_dir is None:
+            options["media"] = False
+        server = StandInServer(bandwidth=bandwidth, latency=latency, media_dir=media_dir)
+        with server:
+            for name in names:
+                runs = []
+                for attempt in range(repeat):
+                    work_dir = Path(scratch) / f"{name}-{attempt}"
+                    work_dir.mkdir()
+                    runs.append(_spawn(name, server.base_url, work_dir, options))
+                    if "skipped" in runs[-1]:
+                        break
+                results["scenarios"][name] = {"runs": runs, "median": _median(runs)}
+                print(f"{name}: {_summary(results['scenarios'][name]['median'])}", file=sys.stderr)
+    return results
+
+
+def _spawn(name: str, base_url: str, work_dir: Path, options: Dict[str, Any]) -> Dict[str, Any]:
+    command = [sys.executable, "-m", "benchmarks", "_child", name, base_url, str(work_dir)]
+    completed = subprocess.run(
+        command + [json.dumps(options)], cwd=ROOT, capture_output=True, text=True, check=False
+    )
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1:] or ["failed"]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _median(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if not runs or "skipped" in runs[0] or any("error" in run for run in runs):
+        return runs[0] if runs else {}
+    return {
+        key: statistics.median(run[key] for run in runs)
+        for key, value in runs[0].items()
+        if isinstance(value, (int, float))
+    }
+
+
+def _summary(median: Dict[str, Any]) -> str:
+    return ", ".join(
+        f"{key}={value:.4g}" if isinstance(value, float) else f"{key}={value}"
+        for key, value in median.items()
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_second")
+
+
+def compare(
+    base: Dict[str, Any], head: Dict[str, Any], *, threshold: float = 0.10
+) -> List[Tuple[str, str, float, float, float, bool]]:
+    """Rows of ``(scenario, metric, base, head, relative change, regressed)``.
+
+    Counts (``bytes``, ``segments``, ...) are skipped; a change is a regression
+    when it moves in the wrong direction by more than ``threshold``.
+    """
+
+    rows = []
+    for name, scenario in head["scenarios"].items():
+        before = base["scenarios"].get(name, {}).get("median", {})
+        for metric, value in scenario["median"].items():
+            if metric not in before or not isinstance(value, (int, float)):
+                continue
+            if not (metric.endswith(("_seconds", "_per_second", "_bytes")) or metric == "seconds"):
+                continue
+            old = before[metric]
+            change = (value - old) / old if old else 0.0
+            worse = -change if higher_is_better(metric) else change
+            rows.append((name, metric, old, value, change, worse > threshold))
+    return rows
@@ -0,0 +1,202 @@
+"""Benchmark scenarios; each returns a flat dict of measurements (or a ``skipped`` reason)."""
+
+from __future__ import annotations
+
+import importlib.util
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from video_tools import ranged, scraper, segments, youtube
+from video_tools.net import Session
+
+from .server import PASSWORD, USERNAME
+
+Measurements = Dict[str, Any]
+Scenario = Callable[[str, Path, Dict[str, Any]], Measurements]
+
+NAVIGATION = [
+    "xpath://*[@id='body-pendingSeminar']/tr[1]/td[2]/div[2]/a[1]",
+    "xpath://*[@id='myTab']/li[2]/a",
+]
+VIDEO_LINKS = "css:#grid-list-courseSchedule td > div a"
+
+
+def startup(base_url: str, work_dir: Path, options: Dict[str, Any]) -> Measurements:
+    """Cold interpreter start: ``import video_tools`` and ``video-tools --help``."""
+
+    def median_run(command: list) -> float:
+        samples = []
+        for _ in range(options.get("startup_runs", 5)):
+            started = time.perf_counter()
+            subprocess.run(command, check=True, capture_output=True)
+            samples.append(time.perf_counter() - started)
+        return statistics.median(samples)
+
+    return {
+        "import_seconds": median_run([sys.executable, "-c", "import video_tools"]),
+        "cli_help_seconds": median_run([sys.executable, "-m", "video_tools", "--help"]),
+    }
+
+
+def ttfb(base_url: str, work_dir: Path, options: Dict[str, Any]) -> Measurements:
+    """Time to first body byte on a fresh connection and on a pooled keep-alive one."""
+
+    def first_byte(session: Session) -> float:
+        started = time.perf_counter()
+        response = session.get(base_url + "/video.mp4", headers={"Range": "bytes=0-65535"})
+        next(response.iter_content(1))
+        elapsed = time.perf_counter() - started
+        response.read()
+        return elapsed
+
+    with Session() as session:
+        cold = first_byte(session)
+        warm = statistics.median(first_byte(session) for _ in range(5))
+    return {"ttfb_cold_seconds": cold, "ttfb_warm_seconds": warm}
+
+
+def progressive_throughput(base_url: str, work_dir: Path, options: Dict[str, Any]) -> Measurements:
+    """Single-stream progressive MP4 transfer through the shared HTTP session."""
+
+    target = work_dir / "video.mp4"
+    started = time.perf_counter()
+    with Session() as session, target.open("wb") as handle:
+        for chunk in session.get(base_url + "/video.mp4").iter_content():
+            handle.write(chunk)
+    elapsed = time.perf_counter() - started
+    size = target.stat().st_size
+    return {"seconds": elapsed, "bytes": size, "bytes_per_second": size / elapsed}
+
+
+def ranged_throughput(base_url: str, work_dir: Path, options: Dict[str, Any]) -> Measurements:
+    """The same progressive MP4 over parallel byte-range connections (``ranged``)."""
+
+    connections = options.get("segment_workers", 8)
+    target = work_dir / "ranged.mp4"
+    started = time.perf_counter()
+    ranged.download_ranged(base_url + "/video.mp4", target, connections=connections)
+    elapsed = time.perf_counter() - started
+    size = target.stat().st_size
+    return {
+        "seconds": elapsed,
+        "bytes": size,
+        "bytes_per_second": size / elapsed,
+        "connections": connections,
+    }
+
+
+def segment_throughput(base_url: str, work_dir: Path, options: Dict[str, Any]) -> Measurements:
+    """Parallel HLS segment fetch and join (the part of a download before the remux)."""
+
+    workers = options.get("segment_workers", 8)
+    started = time.perf_counter()
+    with Session() as session:
+        (playlist,) = segments.resolve_manifest(base_url + "/hls/index.m3u8", session)
+        joined = segments.fetch_playlist(playlist, work_dir / "segments", session, workers=workers)
+    elapsed = time.perf_counter() - started
+    size = joined.stat().st_size
+    return {
+        "seconds": elapsed,
+        "bytes": size,
+        "bytes_per_second": size / elapsed,
+        "segments": len(playlist.segments),
+        "workers": workers,
+    }
+
+
+def ffmpeg_download(base_url: str, work_dir: Path, options: Dict[str, Any]) -> Measurements:
+    """``download_with_ffmpeg`` end to end for the MP4 and the HLS rendition (needs --media)."""
+
+    if shutil.which("ffmpeg") is None:
+        return {"skipped": "ffmpeg not found"}
+    if not options.get("media"):
+        return {"skipped": "needs real media (run with --media)"}
+    results: Measurements = {}
+    for name, path in (("mp4", "/video.mp4"), ("hls", "/hls/index.m3u8")):
+        started = time.perf_counter()
+        scraper.download_with_ffmpeg(
+            base_url + path,
+            work_dir / f"{name}.mp4",
+            segment_workers=options.get("segment_workers", 8),
+        )
+        results[f"{name}_seconds"] = time.perf_counter() - started
+    return results
+
+
+def yt_dlp_generic(base_url: str, work_dir: Path, options: Dict[str, Any]) -> Measurements:
+    """``youtube.download_channel`` (``build_yt_dlp_options`` + yt-dlp) on a direct MP4 URL."""
+
+    if importlib.util.find_spec("yt_dlp") is None:
+        return {"skipped": "yt-dlp not installed"}
+    started = time.perf_counter()
+    youtube.download_channel(
+        base_url + "/video.mp4", output_dir=work_dir / "yt", video_format="best", retries=1
+    )
+    elapsed = time.perf_counter() - started
+    size = sum(path.stat().st_size for path in (work_dir / "yt").rglob("*") if path.is_file())
+    return {"seconds": elapsed, "bytes": size, "bytes_per_second": size / elapsed}
+
+
+def _scrape(engine: str, base_url: str, options: Dict[str, Any]) -> Measurements:
+    login = dict(
+        url=base_url + "/login",
+        username=USERNAME,
+        password=PASSWORD,
+        username_field="Email",
+        password_field="Password",
+        navigation_steps=NAVIGATION,
+        video_attribute="href",
+        headless=True,
+        engine=engine,
+    )
+    started = time.perf_counter()
+    scraper.scrape_portal(
+        video_selector=VIDEO_LINKS, download=False, output_file=Path("unused.mp4"), **login
+    )
+    single = time.perf_counter() - started
+
+    started = time.perf_counter()
+    videos = list(
+        scraper.scrape_portal_many(
+            video_selector=VIDEO_LINKS, next_page_selector="css:a.next", **login
+        )
+    )
+    elapsed = time.perf_counter() - started
+    return {
+        "scrape_seconds": single,
+        "scrape_all_seconds": elapsed,
+        "pages": max(video.page for video in videos),
+        "urls_per_second": len(videos) / elapsed,
+    }
+
+
+def scrape_http(base_url: str, work_dir: Path, options: Dict[str, Any]) -> Measurements:
+    """Login, legacy navigation and URL extraction with the HTTP engine."""
+
+    return _scrape("http", base_url, options)
+
+
+def scrape_browser(base_url: str, work_dir: Path, options: Dict[str, Any]) -> Measurements:
+    """The same workflow in headless Chrome (includes browser startup)."""
+
+    if importlib.util.find_spec("selenium") is None:
+        return {"skipped": "selenium not installed"}
+    return _scrape("browser", base_url, options)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "startup": startup,
+    "ttfb": ttfb,
+    "progressive": progressive_throughput,
+    "ranged": ranged_throughput,
+    "segments": segment_throughput,
+    "ffmpeg": ffmpeg_download,
+    "yt-dlp": yt_dlp_generic,
+    "scrape-http": scrape_http,
+    "scrape-browser": scrape_browser,
+}
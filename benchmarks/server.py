@@ -0,0 +1,248 @@
+"""Local stand-in server: throttled progressive/HLS media and a fake login portal."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Tuple
+from urllib.parse import parse_qs, urlparse
+
+CHUNK = 16 * 1024
+USERNAME = "bench@example.com"
+PASSWORD = "bench-secret"
+
+LOGIN_PAGE = """<html><body>
+<form method="post" action="/login">
+  <input type="hidden" name="csrf" value="bench-token">
+  <input name="Email"><input name="Password" type="password">
+  <button type="submit">Sign in</button>
+</form></body></html>"""
+
+DASHBOARD = """<html><body>
+<table><tbody id="body-pendingSeminar">
+  <tr><td>1</td><td><div>Bench</div><div><a href="/seminar/1">Open</a></div></td></tr>
+</tbody></table></body></html>"""
+
+
+_PATTERN = bytes((index * 31 + 7) % 256 for index in range(4096))
+
+
+class _Body:
+    """Response body read by range on demand, so the server itself stays small in memory."""
+
+    def __init__(self, size: int, data: bytes | None = None, path: Path | None = None) -> None:
+        self.size = size
+        self.data = data
+        self.path = path
+
+    @classmethod
+    def static(cls, data: bytes) -> _Body:
+        return cls(len(data), data=data)
+
+    @classmethod
+    def file(cls, path: Path) -> _Body:
+        return cls(path.stat().st_size, path=path)
+
+    def read(self, start: int, end: int) -> bytes:
+        if self.data is not None:
+            return self.data[start:end]
+        if self.path is not None:
+            with self.path.open("rb") as handle:
+                handle.seek(start)
+                return handle.read(end - start)
+        # Synthetic media: a deterministic repeating pattern.
+        offset = start % len(_PATTERN)
+        repeats = (end - start) // len(_PATTERN) + 2
+        return (_PATTERN[offset:] + _PATTERN * repeats)[: end - start]
+
+
+def generate_media(directory: Path, seconds: int = 20) -> Path | None:
+    """Encode a real MP4 plus an HLS rendition with FFmpeg; ``None`` if FFmpeg is missing."""
+
+    if shutil.which("ffmpeg") is None:
+        return None
+    directory.mkdir(parents=True, exist_ok=True)
+    mp4 = directory / "video.mp4"
+    if not mp4.exists():
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error"]
+            + ["-f", "lavfi", "-i", f"testsrc=size=1280x720:rate=30:duration={seconds}"]
+            + ["-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}"]
+            + ["-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac", str(mp4)],
+            check=True,
+        )
+        hls = directory / "hls"
+        hls.mkdir(exist_ok=True)
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-i", str(mp4), "-c", "copy", "-f", "hls"]
+            + ["-hls_time", "2", "-hls_list_size", "0", str(hls / "index.m3u8")],
+            check=True,
+        )
+    return directory
+
+
+class StandInServer:
+    """Serve benchmark content on ``127.0.0.1`` from a background thread.
+
+    ``bandwidth`` caps bytes/s per connection and ``latency`` delays every
+    response, approximating a remote CDN. Without ``media_dir`` the MP4 and HLS
+    segments are synthetic bytes, good for transfer paths but not for FFmpeg.
+    """
+
+    def __init__(
+        self,
+        *,
+        bandwidth: float | None = None,
+        latency: float = 0.0,
+        video_size: int = 32 * 1024 * 1024,
+        segments: int = 32,
+        pages: int = 3,
+        media_dir: Path | None = None,
+    ) -> None:
+        self.bandwidth = bandwidth
+        self.latency = latency
+        self.pages = pages
+        self.files: Dict[str, _Body] = {}
+        if media_dir is not None:
+            self.files["/video.mp4"] = _Body.file(media_dir / "video.mp4")
+            for path in sorted((media_dir / "hls").iterdir()):
+                self.files[f"/hls/{path.name}"] = _Body.file(path)
+        else:
+            self.files["/video.mp4"] = _Body(video_size)
+            segment_size = max(video_size // segments, 1)
+            playlist = ["#EXTM3U", "#EXT-X-TARGETDURATION:2"]
+            for index in range(segments):
+                playlist += ["#EXTINF:2.0,", f"seg{index}.ts"]
+                self.files[f"/hls/seg{index}.ts"] = _Body(segment_size)
+            playlist.append("#EXT-X-ENDLIST")
+            self.files["/hls/index.m3u8"] = _Body.static(("\n".join(playlist) + "\n").encode())
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def start(self) -> StandInServer:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> StandInServer:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def seminar_page(self, number: int) -> str:
+        rows = "".join(
+            f'<tr><td>Part {number}.{index}</td><td><div><a href="{link}?part={number}.{index}">'
+            "<span>Watch</span></a></div></td></tr>"
+            for index, link in enumerate(("/video.mp4", "/hls/index.m3u8"))
+        )
+        following = (
+            f'<a class="next" href="/seminar/{number + 1}">Next</a>' if number < self.pages else ""
+        )
+        return (
+            '<html><body><ul id="myTab"><li><a href="#home">Home</a></li>'
+            '<li><a href="#courses">Courses</a></li></ul>'
+            f'<div id="grid-list-courseSchedule"><div><table><tbody>{rows}</tbody></table>'
+            f"</div></div>{following}</body></html>"
+        )
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                self._delay()
+                path = urlparse(self.path).path
+                if path in server.files:
+                    self._send_media(server.files[path])
+                    return
+                authed = "session=bench" in (self.headers.get("Cookie") or "")
+                if path == "/login":
+                    self._send(200, LOGIN_PAGE.encode())
+                elif not authed:
+                    self._send(302, headers=[("Location", "/login")])
+                elif path == "/dashboard":
+                    self._send(200, DASHBOARD.encode())
+                elif path.startswith("/seminar/") and path[9:].isdigit():
+                    self._send(200, server.seminar_page(int(path[9:])).encode())
+                else:
+                    self._send(404)
+
+            def do_POST(self) -> None:
+                self._delay()
+                length = int(self.headers.get("Content-Length") or 0)
+                form = parse_qs(self.rfile.read(length).decode())
+                if form.get("Email") == [USERNAME] and form.get("Password") == [PASSWORD]:
+                    headers = [("Location", "/dashboard"), ("Set-Cookie", "session=bench")]
+                    self._send(303, headers=headers)
+                else:
+                    self._send(200, LOGIN_PAGE.encode())
+
+            def _delay(self) -> None:
+                if server.latency:
+                    time.sleep(server.latency)
+
+            def _send(self, status: int, body: bytes = b"", headers=()) -> None:
+                self.send_response(status)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _send_media(self, body: _Body) -> None:
+                start, end = _range(self.headers.get("Range"), body.size)
+                self.send_response(206 if self.headers.get("Range") else 200)
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("Content-Length", str(end - start))
+                if self.headers.get("Range"):
+                    self.send_header("Content-Range", f"bytes {start}-{end - 1}/{body.size}")
+                self.end_headers()
+                if self.command == "HEAD":
+                    return
+                started = time.monotonic()
+                for offset in range(start, end, CHUNK):
+                    try:
+                        self.wfile.write(body.read(offset, min(offset + CHUNK, end)))
+                    except (BrokenPipeError, ConnectionResetError):
+                        return  # client stopped reading (e.g. a time-to-first-byte probe)
+                    if server.bandwidth:
+                        ahead = (offset + CHUNK - start) / server.bandwidth
+                        ahead -= time.monotonic() - started
+                        if ahead > 0:
+                            time.sleep(ahead)
+
+            do_HEAD = do_GET
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+
+def _range(header: str | None, size: int) -> Tuple[int, int]:
+    if not header:
+        return 0, size
+    first, _, last = header.removeprefix("bytes=").partition("-")
+    start = int(first) if first else size - int(last)
+    end = int(last) + 1 if first and last else size
+    return start, min(end, size)
@@ -0,0 +1,122 @@
+import asyncio
+import sys
+import threading
+import time
+
+from video_tools import aio, scraper, youtube
+
+
+def test_jobs_stream_progress_with_bounded_concurrency(monkeypatch, tmp_path):
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_download(url, *, output_dir, progress_hooks):
+        with lock:
+            running.append(url)
+            peak.append(len(running))
+        for done in (0, 512, 1024):
+            for hook in progress_hooks:
+                hook({"status": "downloading", "downloaded_bytes": done, "total_bytes": 1024})
+            time.sleep(0.01)
+        with lock:
+            running.remove(url)
+
+    monkeypatch.setattr(youtube, "download_channel", fake_download)
+
+    async def main():
+        async with aio.VideoTools(downloads=3) as tools:
+            jobs = [
+                tools.download_channel(f"https://youtube.com/@c{index}", output_dir=tmp_path)
+                for index in range(200)
+            ]
+            events = [event async for event in jobs[0]]
+            await asyncio.gather(*jobs)
+            return events
+
+    events = asyncio.run(main())
+    assert [event.status for event in events] == [
+        "queued",
+        "started",
+        "downloading",
+        "downloading",
+        "downloading",
+        "done",
+    ]
+    assert events[-2].downloaded_bytes == 1024
+    assert len(peak) == 200 and max(peak) == 3
+
+
+def test_cancel_stops_yt_dlp_and_removes_partial_files(monkeypatch, tmp_path):
+    partial = tmp_path / "video.f137.mp4.part"
+    stopped = threading.Event()
+
+    def fake_download(url, *, output_dir, progress_hooks):
+        partial.write_bytes(b"x")
+        try:
+            while True:
+                for hook in progress_hooks:
+                    hook({"status": "downloading", "tmpfilename": str(partial)})
+                time.sleep(0.01)
+        finally:
+            stopped.set()
+
+    monkeypatch.setattr(youtube, "download_channel", fake_download)
+
+    async def main():
+        async with aio.VideoTools() as tools:
+            job = tools.download_channel("https://youtube.com/@c", output_dir=tmp_path)
+            async for event in job:
+                if event.status == "downloading":
+                    job.cancel()
+                    break
+            try:
+                await job
+            except asyncio.CancelledError:
+                return True
+        return False
+
+    assert asyncio.run(main())
+    assert stopped.is_set() and not partial.exists()
+
+
+def test_cancel_kills_ffmpeg(monkeypatch, tmp_path):
+    output = tmp_path / "video.mp4"
+    script = f"open({str(output)!r}, 'w').write('partial'); import time; time.sleep(30)"
+    monkeypatch.setattr(scraper, "ffmpeg_command", lambda url, out: [sys.executable, "-c", script])
+
+    async def main():
+        async with aio.VideoTools() as tools:
+            job = tools.download_video("https://cdn.example/v.mp4", output, segment_workers=1)
+            while not output.exists():
+                await asyncio.sleep(0.02)
+            started = time.monotonic()
+            job.cancel()
+            try:
+                await job
+            except asyncio.CancelledError:
+                return time.monotonic() - started
+
+    assert asyncio.run(main()) < 5
+    assert not output.exists()
+
+
+def test_native_download_reports_finished(monkeypatch, tmp_path):
+    output = tmp_path / "video.mp4"
+
+    def fake_native(url, output_file, *, workers, session):
+        output_file.write_bytes(b"frames")
+        return True
+
+    monkeypatch.setattr(scraper, "download_native", fake_native)
+
+    async def main():
+        async with aio.VideoTools() as tools:
+            job = tools.download_video("https://cdn.example/v.mp4", output)
+            events = [event async for event in job]
+            await job
+            return events
+
+    events = asyncio.run(main())
+    assert [event.status for event in events][-2:] == ["finished", "done"]
+    assert events[-2].filename == str(output)
@@ -0,0 +1,37 @@
+from video_tools import archive, youtube
+
+
+def test_archive_membership_and_import(tmp_path):
+    legacy = tmp_path / "archive.txt"
+    legacy.write_text("youtube abc123\nyoutube def456\n\nyoutube abc123\n", encoding="utf-8")
+
+    with archive.DownloadArchive(tmp_path / "archive.sqlite3") as store:
+        assert store.import_text(legacy) == 2
+        assert "youtube abc123" in store
+        assert archive.make_key("Youtube", "zzz") not in store
+
+        store.add(archive.make_key("Youtube", "zzz"))
+        assert "youtube zzz" in store
+        assert len(store) == 3
+
+        store.export_text(tmp_path / "roundtrip.txt")
+
+    reopened = archive.DownloadArchive(tmp_path / "archive.sqlite3")
+    assert "youtube zzz" in reopened
+    assert (tmp_path / "roundtrip.txt").read_text(encoding="utf-8").count("\n") == 3
+    reopened.close()
+
+
+def test_build_options_wires_archive(tmp_path):
+    store = archive.DownloadArchive(tmp_path / "archive.sqlite3")
+    opts = youtube.build_yt_dlp_options(
+        output_dir=tmp_path,
+        video_format="best",
+        resume=True,
+        rate_limit=None,
+        cookies=None,
+        retries=1,
+        archive=store,
+    )
+    assert opts["download_archive"] is store
+    store.close()
@@ -0,0 +1,26 @@
+from benchmarks import runner, scenarios
+from benchmarks.server import StandInServer
+
+
+def test_stand_in_server_serves_ranges_and_portal(tmp_path):
+    with StandInServer(video_size=100_000, segments=4, pages=2) as server:
+        measured = scenarios.segment_throughput(server.base_url, tmp_path, {"segment_workers": 2})
+        assert measured["bytes"] == 100_000 and measured["segments"] == 4
+
+        scraped = scenarios.scrape_http(server.base_url, tmp_path, {})
+        assert scraped["pages"] == 2
+
+
+def test_compare_flags_regressions_by_direction():
+    base = {
+        "scenarios": {
+            "segments": {"median": {"seconds": 1.0, "bytes_per_second": 100.0, "segments": 4}}
+        }
+    }
+    head = {
+        "scenarios": {
+            "segments": {"median": {"seconds": 1.5, "bytes_per_second": 150.0, "segments": 8}}
+        }
+    }
+    rows = {metric: regressed for _, metric, *_, regressed in runner.compare(base, head)}
+    assert rows == {"seconds": True, "bytes_per_second": False}
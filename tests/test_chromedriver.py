@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from video_tools import chromedriver
+
+
+def _executable(path, text="#!/bin/sh\n"):
+    path.write_text(text)
+    path.chmod(0o755)
+    return path
+
+
+@pytest.fixture
+def chrome(tmp_path, monkeypatch):
+    binary = _executable(tmp_path / "chrome", "#!/bin/sh\necho 'Google Chrome 120.0.6099.109'\n")
+    monkeypatch.setenv(chromedriver.ENV_CHROME, str(binary))
+    monkeypatch.delenv(chromedriver.ENV_DRIVER, raising=False)
+    return binary
+
+
+def test_driver_is_resolved_once_per_chrome_build(tmp_path, chrome):
+    driver = _executable(tmp_path / "chromedriver")
+    installs = []
+
+    def install():
+        installs.append(1)
+        return str(driver)
+
+    resolver = chromedriver.DriverResolver(install, tmp_path / "cache.json")
+    first = resolver.resolve()
+    assert (first.source, first.chrome_version) == ("resolved", "120.0.6099.109")
+    second = chromedriver.DriverResolver(install, tmp_path / "cache.json").resolve()
+    assert (second.source, second.driver, len(installs)) == ("cache", driver, 1)
+
+    stat = chrome.stat()
+    os.utime(chrome, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # Chrome upgraded
+    assert resolver.resolve().source == "resolved" and len(installs) == 2
+    assert resolver.resolve(refresh=True).source == "resolved" and len(installs) == 3
+
+
+def test_offline_fallback_and_pinned_driver(tmp_path, chrome, monkeypatch):
+    driver = _executable(tmp_path / "chromedriver")
+    cache = tmp_path / "cache.json"
+    chromedriver.DriverResolver(lambda: str(driver), cache).resolve()
+
+    def offline():
+        raise ConnectionError("could not reach the version endpoint")
+
+    os.utime(chrome, ns=(0, 0))
+    stale = chromedriver.DriverResolver(offline, cache).resolve()
+    assert (stale.source, stale.driver) == ("stale-cache", driver)
+    with pytest.raises(RuntimeError, match="--chromedriver"):
+        chromedriver.DriverResolver(offline, tmp_path / "empty.json").resolve()
+
+    pinned = chromedriver.DriverResolver(offline, cache).resolve(driver)
+    assert (pinned.source, pinned.driver) == ("pinned", driver)
+    monkeypatch.setenv(chromedriver.ENV_DRIVER, str(tmp_path / "missing"))
+    with pytest.raises(RuntimeError, match="not executable"):
+        chromedriver.DriverResolver(offline, cache).resolve()
@@ -1,3 +1,4 @@
+import json
 from types import SimpleNamespace
 from pathlib import Path
 
@@ -14,19 +15,102 @@ def test_run_youtube(monkeypatch):
     monkeypatch.setattr(cli.youtube, "download_channel", fake_download)
 
     args = SimpleNamespace(
-        url="https://youtube.com/c/example",
+        url=["https://youtube.com/c/example"],
+        channel_list=None,
         output_dir=Path("out"),
         format="best",
         no_resume=False,
         rate_limit=None,
         cookies=None,
         retries=2,
+        workers=4,
+        per_host=2,
+        bandwidth=None,
+        progress_interval=5.0,
+        stats_file=None,
+        metrics_port=None,
+        dashboard=False,
+        metadata_cache=None,
+        metadata_max_age=3600.0,
+        refresh_metadata=False,
+        postprocess_workers=0,
+        pipeline_depth=2,
+        checksum=False,
+        content_store=None,
+        link_mode="hardlink",
+        adaptive=False,
+        request_rate=2.0,
+        bandwidth_schedule=None,
+        scheduler_state=None,
+        archive=None,
+        import_archive=None,
+        incremental=False,
+        full_rescan=False,
+        scratch_dir=None,
+        min_free="1G",
+        disk_check=True,
     )
 
     assert cli._run_youtube(args) == 0
     assert called["url"].startswith("https://youtube")
 
 
+def test_run_youtube_batch(monkeypatch, tmp_path):
+    channel_list = tmp_path / "channels.txt"
+    channel_list.write_text("# nightly\nhttps://youtube.com/c/b\n\n", encoding="utf-8")
+    called = {}
+
+    def fake_sync(urls, **kwargs):
+        called["urls"] = urls
+        called["kwargs"] = kwargs
+        return cli.youtube.SyncReport(
+            results=[cli.youtube.ChannelResult(url=url, ok=True) for url in urls]
+        )
+
+    monkeypatch.setattr(cli.youtube, "sync_channels", fake_sync)
+
+    args = SimpleNamespace(
+        url=["https://youtube.com/c/a"],
+        channel_list=channel_list,
+        output_dir=tmp_path,
+        format="best",
+        no_resume=False,
+        rate_limit=None,
+        cookies=None,
+        retries=2,
+        workers=8,
+        per_host=2,
+        bandwidth="20M",
+        progress_interval=5.0,
+        stats_file=None,
+        metrics_port=None,
+        dashboard=False,
+        metadata_cache=None,
+        metadata_max_age=3600.0,
+        refresh_metadata=False,
+        postprocess_workers=0,
+        pipeline_depth=2,
+        checksum=False,
+        content_store=None,
+        link_mode="hardlink",
+        adaptive=False,
+        request_rate=2.0,
+        bandwidth_schedule=None,
+        scheduler_state=None,
+        archive=None,
+        import_archive=None,
+        incremental=False,
+        full_rescan=False,
+        scratch_dir=None,
+        min_free="1G",
+        disk_check=True,
+    )
+
+    assert cli._run_youtube(args) == 0
+    assert called["urls"] == ["https://youtube.com/c/a", "https://youtube.com/c/b"]
+    assert called["kwargs"]["bandwidth"] == "20M"
+
+
 def test_run_scrape(monkeypatch, tmp_path):
     class DummyStore:
         def __init__(self):
@@ -60,6 +144,71 @@ def test_run_scrape(monkeypatch, tmp_path):
         output_file=Path("dummy.mp4"),
         headless=True,
         wait_timeout=5,
+        segment_workers=8,
+        reuse_session=False,
+        session_ttl=3600,
+        all=False,
+        next_page=None,
+        max_pages=None,
+        jsonl=None,
+        engine="browser",
+        poll_interval=0.1,
+        learn_timeouts=False,
+        block_resources=True,
+        chromedriver=None,
+        scratch_dir=None,
+    )
+
+    assert cli._run_scrape(args) == 0
+
+
+def test_run_scrape_all_streams_jsonl(monkeypatch, tmp_path):
+    class DummyStore:
+        def get(self, alias):
+            return ("stored", "password")
+
+    def fake_many(**kwargs):
+        assert kwargs["next_page_selector"] == "css:a.next"
+        for index in range(3):
+            yield cli.scraper.ScrapedVideo(
+                url=f"https://video.example/{index}.mp4", page=1, source="https://portal"
+            )
+
+    monkeypatch.setattr(cli.scraper, "CredentialStore", DummyStore)
+    monkeypatch.setattr(cli.scraper, "scrape_portal_many", fake_many)
+
+    args = SimpleNamespace(
+        url="https://portal.example",
+        username=None,
+        password=None,
+        username_field="Email",
+        password_field="Password",
+        navigation=[],
+        video_selector="css:video",
+        video_attribute="src",
+        credential_alias=None,
+        remember=False,
+        download=False,
+        output_file=None,
+        headless=True,
+        wait_timeout=5,
+        segment_workers=8,
+        reuse_session=False,
+        session_ttl=3600,
+        all=True,
+        next_page="css:a.next",
+        max_pages=None,
+        jsonl=tmp_path / "videos.jsonl",
+        engine="http",
+        poll_interval=0.1,
+        learn_timeouts=False,
+        block_resources=True,
+        chromedriver=None,
+        scratch_dir=None,
     )
 
     assert cli._run_scrape(args) == 0
+    lines = args.jsonl.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["url"] for line in lines] == [
+        f"https://video.example/{index}.mp4" for index in range(3)
+    ]
@@ -0,0 +1,80 @@
+import errno
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from video_tools import diskspace
+
+GIB = 1024**3
+
+
+def test_reservations_defer_until_space_is_released(tmp_path):
+    budget = diskspace.DiskBudget(
+        headroom=GIB, poll=0.05, usage=lambda path: SimpleNamespace(free=5 * GIB)
+    )
+    first = budget.reserve({tmp_path: 3 * GIB}, label="first")
+    assert budget.available(tmp_path) == GIB
+
+    admitted = []
+    waiter = threading.Thread(
+        target=lambda: admitted.append(budget.reserve({tmp_path: 2 * GIB}, label="second"))
+    )
+    waiter.start()
+    time.sleep(0.2)
+    assert not admitted  # deferred while "first" holds the space
+    first.release()
+    waiter.join(5)
+    assert admitted and budget.available(tmp_path) == 2 * GIB
+
+    admitted[0].release()
+    with pytest.raises(diskspace.InsufficientSpace, match="too-big"):
+        budget.reserve({tmp_path: 5 * GIB}, label="too-big")
+
+
+def test_attach_holds_reservation_until_post_processing(tmp_path):
+    budget = diskspace.DiskBudget(headroom=0, usage=lambda path: SimpleNamespace(free=10 * GIB))
+    handed_off = []
+
+    class FakeYDL:
+        def process_info(self, info):
+            # A post-processing pipeline hands the work to a thread and returns at once.
+            handed_off.append(lambda: self.post_process("video.mp4", dict(info)))
+            info["__write_download_archive"] = True
+
+        def post_process(self, filename, info, files_to_move=None):
+            return info
+
+    ydl = FakeYDL()
+    budget.attach(ydl, output_dir=tmp_path / "out", scratch_dir=tmp_path / "scratch")
+    info = {
+        "id": "abc",
+        "duration": 100,
+        "requested_formats": [{"filesize": GIB}, {"tbr": 128}],
+    }
+    assert diskspace.estimate_bytes(info) == GIB + 1_600_000
+    ydl.process_info(info)
+    # Streams plus merged copy on the scratch volume, the final file at the destination.
+    assert budget.available(tmp_path) == 10 * GIB - 3 * (GIB + 1_600_000)
+    handed_off[0]()
+    assert budget.available(tmp_path) == 10 * GIB
+
+
+def test_move_file_copies_across_filesystems(tmp_path, monkeypatch):
+    source = tmp_path / "scratch" / "video.mp4"
+    source.parent.mkdir()
+    source.write_bytes(b"frames" * 1000)
+    target = tmp_path / "library" / "video.mp4"
+    rename = os.replace
+
+    def cross_device(src, dst):
+        if os.fspath(src) == os.fspath(source):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        rename(src, dst)
+
+    monkeypatch.setattr(diskspace.os, "replace", cross_device)
+    diskspace.move_file(source, target)
+    assert target.read_bytes() == b"frames" * 1000
+    assert not source.exists() and os.listdir(target.parent) == ["video.mp4"]
@@ -0,0 +1,73 @@
+import json
+import time
+
+import pytest
+
+from video_tools import farm
+
+
+def echo_runner(job, context):
+    if job.url.endswith("/broken"):
+        raise RuntimeError("login form not found")
+    return f"{job.url}/video.mp4?worker={context.index}"
+
+
+def hang_once_runner(job, context):
+    marker = context.profile.parent / f"hung-{job.id}"
+    if job.url.endswith("/hang") and not marker.exists():
+        marker.touch()
+        time.sleep(60)
+    return echo_runner(job, context)
+
+
+def test_manifest_parsing_and_worker_sizing(tmp_path, monkeypatch):
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(
+        "# nightly portals\n"
+        + json.dumps({"url": "https://a.example", "video_selector": "css:video"})
+        + "\n\n"
+        + json.dumps({"id": "b", "url": "https://b.example", "video_selector": "css:a"})
+        + "\n"
+    )
+    jobs = farm.load_manifest(manifest)
+    assert [(job.id, job.video_attribute) for job in jobs] == [("2", "href"), ("b", "href")]
+
+    manifest.write_text(json.dumps({"url": "u", "video_selector": "v", "pasword": "x"}) + "\n")
+    with pytest.raises(ValueError, match="pasword"):
+        farm.load_manifest(manifest)
+
+    monkeypatch.setattr(farm.os, "cpu_count", lambda: 16)
+    monkeypatch.setattr(farm, "_available_memory_mb", lambda: 3000)
+    assert farm.auto_workers(1024) == 2
+    monkeypatch.setattr(farm, "_available_memory_mb", lambda: 100)
+    assert farm.auto_workers(1024) == 1
+
+
+def test_farm_streams_results_and_restarts_hung_workers():
+    jobs = [
+        farm.FarmJob(url=f"https://portal.example/{name}", video_selector="css:video", id=name)
+        for name in ("one", "hang", "broken", "two")
+    ]
+    results = {
+        result.job_id: result
+        for result in farm.run_farm(
+            jobs, workers=2, job_timeout=3.0, retries=1, runner=hang_once_runner
+        )
+    }
+
+    assert set(results) == {"one", "hang", "broken", "two"}
+    assert results["one"].video_url.startswith("https://portal.example/one/video.mp4")
+    assert results["broken"].error == "RuntimeError: login form not found"
+    assert results["hang"].ok and results["hang"].attempts == 2  # killed, then retried
+
+
+def test_closing_the_farm_kills_busy_workers_at_once():
+    jobs = [
+        farm.FarmJob(url=f"https://portal.example/{name}", video_selector="css:video", id=name)
+        for name in ("one", "hang")
+    ]
+    results = farm.run_farm(jobs, workers=2, job_timeout=60.0, runner=hang_once_runner)
+    assert next(results).job_id == "one"
+    started = time.monotonic()
+    results.close()
+    assert time.monotonic() - started < 5
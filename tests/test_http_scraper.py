@@ -0,0 +1,143 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from video_tools import http_scraper, scraper
+
+LOGIN_PAGE = """<html><body>
+<form method="post" action="/login">
+  <input type="hidden" name="csrf" value="token-123">
+  <input name="Email"><input name="Password" type="password">
+  <input type="checkbox" name="remember">
+  <button type="submit">Sign in</button>
+</form></body></html>"""
+
+DASHBOARD = """<html><body>
+<table><tbody id="body-pendingSeminar">
+  <tr><td>1</td><td><div>Title</div><div><a href="/seminar/42">Open</a><a href="/x">X</a></div>
+</tbody></table></body></html>"""
+
+SEMINAR = """<html><body>
+<ul id="myTab"><li><a href="#home">Home</a></li><li><a href="#courses">Courses</a></li></ul>
+<div id="grid-list-courseSchedule"><div><table>
+  <tr><td>Intro</td><td><div><a href="/media/42.m3u8"><span>Watch</span></a></div></td></tr>
+  <tr><td>Part 2</td><td><div><a href="media/43.m3u8"><span>Watch</span></a></div></td></tr>
+</table></div></div>
+<a class="next" href="/seminar/42?page=2">Next</a>
+</body></html>"""
+
+SEMINAR_PAGE_2 = """<html><body>
+<div id="grid-list-courseSchedule"><div><table>
+  <tr><td>Part 3</td><td><div><a href="/media/44.m3u8"><span>Watch</span></a></div></td></tr>
+  <tr><td>Intro again</td><td><div><a href="/media/42.m3u8"><span>Watch</span></a></div></td></tr>
+</table></div></div></body></html>"""
+
+
+class PortalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, body=b"", headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        authed = "session=ok" in (self.headers.get("Cookie") or "")
+        if self.path == "/login":
+            self._send(200, LOGIN_PAGE.encode())
+        elif not authed:
+            self._send(302, headers=[("Location", "/login")])
+        elif self.path == "/dashboard":
+            self._send(200, DASHBOARD.encode())
+        elif self.path == "/seminar/42":
+            self._send(200, SEMINAR.encode())
+        elif self.path == "/seminar/42?page=2":
+            self._send(200, SEMINAR_PAGE_2.encode())
+        else:
+            self._send(404)
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        form = parse_qs(self.rfile.read(length).decode())
+        if (
+            form.get("csrf") == ["token-123"]
+            and form.get("Email") == ["alice@example.com"]
+            and form.get("Password") == ["secret"]
+            and "remember" not in form
+        ):
+            self._send(303, headers=[("Location", "/dashboard"), ("Set-Cookie", "session=ok")])
+        else:
+            self._send(200, LOGIN_PAGE.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def portal():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PortalHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+LEGACY = dict(
+    username="alice@example.com",
+    password="secret",
+    username_field="Email",
+    password_field="Password",
+    navigation_steps=[
+        "xpath://*[@id='body-pendingSeminar']/tr[1]/td[2]/div[2]/a[1]",
+        "xpath://*[@id='myTab']/li[2]/a",
+    ],
+    video_attribute="href",
+    headless=True,
+    engine="http",
+)
+
+
+def test_http_engine_runs_legacy_workflow(portal, tmp_path):
+    video_url = scraper.scrape_portal(
+        url=f"{portal}/login",
+        video_selector=(
+            "xpath://*[@id='grid-list-courseSchedule']/div[1]/table/tbody/tr/td[2]/div/a[1]/span/.."
+        ),
+        download=False,
+        output_file=tmp_path / "video.mp4",
+        **LEGACY,
+    )
+    assert video_url == f"{portal}/media/42.m3u8"
+
+
+def test_http_engine_batch_follows_pagination(portal):
+    videos = list(
+        scraper.scrape_portal_many(
+            url=f"{portal}/login",
+            video_selector="css:#grid-list-courseSchedule td > div a",
+            next_page_selector="css:a.next",
+            **LEGACY,
+        )
+    )
+    assert [(video.url.removeprefix(portal), video.page) for video in videos] == [
+        ("/media/42.m3u8", 1),
+        ("/seminar/media/43.m3u8", 1),
+        ("/media/44.m3u8", 2),
+    ]
+
+
+def test_selectors_against_parsed_html():
+    root = http_scraper.parse_html(SEMINAR)
+    assert [node.attrs["href"] for node in http_scraper.select(root, "css:#myTab li a")] == [
+        "#home",
+        "#courses",
+    ]
+    assert http_scraper.select(root, "xpath://a[contains(@href, 'page=2')]")[0].text == "Next"
+    assert http_scraper.select(root, "xpath://li[2]/a[text()='Courses']")
+    assert not http_scraper.select(root, "css:table > tr")
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+import textwrap
+
+from video_tools import import_profile
+
+HEAVY = ("yt_dlp", "selenium", "keyring", "webdriver_manager")
+
+
+def test_cli_startup_does_not_import_backends():
+    # Record every top-level import attempt, including ones that would fail.
+    script = textwrap.dedent(f"""
+        import sys
+
+        attempted = set()
+
+        class Recorder:
+            def find_spec(self, name, path=None, target=None):
+                attempted.add(name.split(".")[0])
+                return None
+
+        sys.meta_path.insert(0, Recorder())
+        import video_tools
+        from video_tools import __main__ as cli
+
+        cli.build_parser().parse_args(["scrape", "--url", "https://portal.example"])
+        print(sorted(attempted & set({HEAVY!r})))
+        """)
+    completed = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert completed.stdout.strip() == "[]"
+
+
+def test_parse_importtime_output():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     _json\n"
+        "import time:      2500 |       2620 |   json\n"
+        "import time:       800 |       3420 | video_tools.archive\n"
+    )
+    modules = import_profile.parse_importtime(stderr)
+    assert modules["json"] == (2.5, 2.62)
+    assert modules["video_tools.archive"] == (0.8, 3.42)
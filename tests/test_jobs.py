@@ -0,0 +1,186 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from video_tools import __main__ as cli
+from video_tools import jobs
+
+
+def test_claim_retry_backoff_and_exhaustion(tmp_path):
+    queue = jobs.JobQueue(tmp_path / "jobs.sqlite3")
+    job_id = queue.enqueue(["youtube", "--url", "https://example.com/c/a"], max_attempts=2)
+    assert queue.enqueue(["youtube", "--url", "https://example.com/c/a"]) == job_id
+
+    job = queue.claim("w1")
+    assert job.id == job_id and job.state == jobs.RUNNING and job.attempts == 1
+    assert queue.claim("w2") is None
+
+    assert queue.fail(job_id, "boom", backoff=60) == jobs.PENDING
+    assert queue.get(job_id).next_run_at > time.time() + 30
+    assert queue.claim("w1") is None  # still backing off
+
+    queue._conn.execute("UPDATE jobs SET next_run_at = 0")
+    assert queue.claim("w1").attempts == 2
+    assert queue.fail(job_id, "boom again") == jobs.FAILED
+    assert queue.counts()[jobs.FAILED] == 1
+    assert queue.requeue_failed() == 1
+    queue.close()
+
+
+def test_expired_lease_is_reclaimed_with_checkpoint(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    crashed = jobs.JobQueue(path, lease=0.05)
+    job_id = crashed.enqueue(["scrape", "--url", "https://portal.example"])
+    crashed.claim("dead-worker")
+    crashed.heartbeat(job_id, {"last_output": "halfway"})
+    crashed.close()
+
+    time.sleep(0.1)
+    survivor = jobs.JobQueue(path)
+    job = survivor.claim("live-worker")
+    assert job.id == job_id
+    assert job.worker == "live-worker"
+    assert job.attempts == 2
+    assert job.checkpoint["last_output"] == "halfway"
+    survivor.close()
+
+
+def test_reclaimed_job_kills_the_previous_child_first(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "job_command", lambda argv: [sys.executable, "-c", "pass"])
+    orphan = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(30)"], start_new_session=True
+    )
+    path = tmp_path / "jobs.sqlite3"
+    crashed = jobs.JobQueue(path, lease=0.05)
+    job_id = crashed.enqueue(["youtube", "--url", "https://example.com/c/a"])
+    crashed.claim("dead-worker")
+    crashed.heartbeat(job_id, {"pid": orphan.pid, "host": socket.gethostname()})
+    crashed.close()
+
+    time.sleep(0.1)
+    survivor = jobs.JobQueue(path)
+    job = survivor.claim("live-worker")
+    try:
+        assert jobs.run_job(survivor, job, heartbeat=0.05) == 0
+        assert orphan.wait(5) == -signal.SIGKILL
+    finally:
+        orphan.kill()
+        survivor.close()
+
+
+def test_child_of_a_crashed_retry_is_killed_after_an_earlier_exit(tmp_path, monkeypatch):
+    commands = [["import sys; sys.exit(1)"], ["import time; time.sleep(30)"], ["pass"]]
+    monkeypatch.setattr(jobs, "job_command", lambda argv: [sys.executable, "-c", *commands.pop(0)])
+    queue = jobs.JobQueue(tmp_path / "jobs.sqlite3", lease=0.2)
+    job_id = queue.enqueue(["youtube", "--url", "https://example.com/c/a"])
+    assert jobs.run_job(queue, queue.claim("w1"), heartbeat=0.05) == 1
+    queue.fail(job_id, "exit code 1", backoff=0)
+
+    # The second attempt's worker stops renewing its lease, as if it was killed.
+    crashed = []
+    worker = threading.Thread(
+        target=lambda: crashed.append(jobs.run_job(queue, queue.claim("w2"), heartbeat=60))
+    )
+    worker.start()
+    deadline = time.monotonic() + 5
+    while queue.get(job_id).checkpoint.get("returncode") is not None:
+        assert time.monotonic() < deadline, "second attempt never started its child"
+        time.sleep(0.02)
+    time.sleep(0.3)
+
+    job = queue.claim("w3")
+    assert job is not None and job.attempts == 3
+    assert jobs.run_job(queue, job, heartbeat=0.05) == 0
+    worker.join(5)
+    assert crashed == [-signal.SIGKILL]
+    queue.close()
+
+
+def _running(pid):
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii") as handle:
+            return handle.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc")
+def test_stopping_a_job_stops_the_childs_own_children(tmp_path, monkeypatch):
+    script = (
+        "import subprocess, sys, time; "
+        "p = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); "
+        "print(p.pid, flush=True); time.sleep(30)"
+    )
+    monkeypatch.setattr(jobs, "job_command", lambda argv: [sys.executable, "-c", script])
+    queue = jobs.JobQueue(tmp_path / "jobs.sqlite3")
+    job_id = queue.enqueue(["youtube", "--url", "https://example.com/c/a"])
+    stop = threading.Event()
+    errors = []
+
+    def run():
+        try:
+            jobs.run_job(queue, queue.claim("w1"), heartbeat=0.05, stop=stop)
+        except InterruptedError as exc:
+            errors.append(exc)
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    deadline = time.monotonic() + 5
+    while not queue.get(job_id).checkpoint.get("last_output"):
+        assert time.monotonic() < deadline, "child never reported its grandchild"
+        time.sleep(0.02)
+    grandchild = int(queue.get(job_id).checkpoint["last_output"])
+    stop.set()
+    worker.join(15)
+    assert errors
+    deadline = time.monotonic() + 2
+    while _running(grandchild) and time.monotonic() < deadline:
+        time.sleep(0.02)  # SIGKILL is delivered asynchronously
+    assert not _running(grandchild)
+    queue.close()
+
+
+def test_worker_runs_jobs_and_records_failures(tmp_path, monkeypatch):
+    scripts = {"ok": "print('fine')", "bad": "import sys; print('nope'); sys.exit(3)"}
+    monkeypatch.setattr(jobs, "job_command", lambda argv: [sys.executable, "-c", scripts[argv[0]]])
+    queue = jobs.JobQueue(tmp_path / "jobs.sqlite3")
+    good = queue.enqueue(["ok"])
+    bad = queue.enqueue(["bad"], max_attempts=1)
+
+    jobs.run_worker(queue, concurrency=2, exit_when_idle=True, heartbeat=0.05)
+
+    assert queue.get(good).state == jobs.DONE
+    failed = queue.get(bad)
+    assert failed.state == jobs.FAILED
+    assert failed.last_error == "exit code 3"
+    assert failed.checkpoint["last_output"] == "nope"
+    queue.close()
+
+
+def test_enqueue_cli_validates_and_pins_archive(tmp_path, capsys):
+    queue_path = tmp_path / "jobs.sqlite3"
+    args = SimpleNamespace(
+        queue=queue_path, max_attempts=3, job=["--", "youtube", "--url", "https://x.test/c/a"]
+    )
+    assert cli._run_enqueue(args) == 0
+    job_id = int(capsys.readouterr().out.strip())
+
+    secret = SimpleNamespace(
+        queue=queue_path,
+        max_attempts=3,
+        job=["scrape", "--url", "https://portal.example", "--password", "hunter2"],
+    )
+    assert cli._run_enqueue(secret) == 1
+    assert cli._run_enqueue(SimpleNamespace(queue=queue_path, max_attempts=3, job=["ls"])) == 1
+
+    queue = jobs.JobQueue(queue_path)
+    assert queue.get(job_id).argv[-2] == "--archive"
+    assert queue.counts()[jobs.PENDING] == 1
+    queue.close()
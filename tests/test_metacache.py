@@ -0,0 +1,104 @@
+import os
+import time
+from types import SimpleNamespace
+
+from video_tools import metacache, youtube
+
+
+def test_max_age_ttl_and_lru_eviction(tmp_path):
+    cache = metacache.MetadataCache(tmp_path / "meta.sqlite3", max_bytes=800)
+    cache.put("a", {"title": "a", "blob": os.urandom(300).hex()})
+    cache.put("b", {"title": "b", "blob": os.urandom(300).hex()})
+    assert cache.get("a")["title"] == "a"  # touch "a" so "b" is least recently used
+    assert cache.get("a", max_age=0) is None
+
+    cache.put("c", {"title": "c", "blob": os.urandom(300).hex()})
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.stats().stored_bytes <= 800
+
+    cache.ttl = 0.01
+    time.sleep(0.02)
+    assert cache.prune() == 2
+    cache.close()
+
+
+class FakeYoutubeDL:
+    calls = []
+
+    def __init__(self, opts):
+        self.opts = opts
+        self.post_processors = []
+        self._download_retcode = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+    def extract_info(self, url, download=True, process=True, ie_key=None):
+        FakeYoutubeDL.calls.append(("extract", url))
+        return {
+            "_type": "playlist",
+            "id": "chan",
+            "title": "Channel",
+            "webpage_url": url,
+            "entries": iter(
+                [
+                    {"_type": "url", "id": "v1", "url": "https://yt.test/watch?v=v1"},
+                    {"_type": "url", "id": "v2", "url": "https://yt.test/watch?v=v2"},
+                ]
+            ),
+        }
+
+    def process_ie_result(self, info, download=True):
+        FakeYoutubeDL.calls.append(("process", download))
+        info = dict(info, entries=list(info["entries"]))
+        if download:
+            for entry in info["entries"]:
+                if "formats" in entry:
+                    FakeYoutubeDL.calls.append(("cached", entry["id"]))
+                    continue
+                full = {
+                    "id": entry["id"],
+                    "webpage_url": entry["url"],
+                    "formats": [{"format_id": "18"}],
+                    "playlist_index": 1,
+                    "__files_to_move": {},
+                }
+                for pp in self.post_processors:
+                    pp.run(full)
+        return info
+
+    def add_post_processor(self, pp, when):
+        pp.set_downloader(self)
+        if when == "pre_process":
+            self.post_processors.append(pp)
+
+    @staticmethod
+    def sanitize_info(info, remove_private_keys=False):
+        return {k: v for k, v in info.items() if not (remove_private_keys and k.startswith("__"))}
+
+
+def test_listing_and_video_info_are_reused(tmp_path, monkeypatch):
+    monkeypatch.setattr(youtube, "yt_dlp", SimpleNamespace(YoutubeDL=FakeYoutubeDL))
+    FakeYoutubeDL.calls = []
+    cache = metacache.MetadataCache(tmp_path / "meta.sqlite3")
+    url = "https://yt.test/@chan"
+
+    listing = youtube.extract_listing(url, cache=cache)
+    assert [entry["id"] for entry in listing["entries"]] == ["v1", "v2"]
+    assert youtube.extract_listing(url, cache=cache) == listing
+    assert FakeYoutubeDL.calls.count(("extract", url)) == 1
+
+    youtube.download_channel(url, output_dir=tmp_path, cache=cache)
+    assert FakeYoutubeDL.calls.count(("extract", url)) == 1
+    info = cache.get(metacache.info_key("https://yt.test/watch?v=v1"))
+    assert info["formats"] and "playlist_index" not in info and "__files_to_move" not in info
+
+    FakeYoutubeDL.calls = []
+    youtube.download_channel(url, output_dir=tmp_path, cache=cache, refresh_metadata=True)
+    assert ("extract", url) in FakeYoutubeDL.calls
+    assert ("cached", "v1") in FakeYoutubeDL.calls and ("cached", "v2") in FakeYoutubeDL.calls
+    cache.close()
@@ -0,0 +1,88 @@
+import json
+import logging
+import urllib.request
+
+from video_tools import metrics as metrics_module
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_progress_hooks_aggregate_and_throttle_logging(tmp_path, caplog):
+    clock = FakeClock()
+    stats = tmp_path / "stats.jsonl"
+    metrics = metrics_module.DownloadMetrics(interval=5.0, stats_file=stats, clock=clock)
+
+    with caplog.at_level(logging.INFO):
+        for fragment in range(1, 101):
+            clock.now += 0.125
+            metrics(
+                {
+                    "status": "downloading",
+                    "filename": "a.mp4",
+                    "downloaded_bytes": fragment * 1000,
+                    "total_bytes": 200_000,
+                    "fragment_index": fragment,
+                }
+            )
+        metrics({"status": "finished", "filename": "a.mp4", "total_bytes": 100_000})
+
+    snapshot = metrics.snapshot()
+    assert snapshot["downloaded_bytes"] == 100_000
+    assert snapshot["files_finished"] == 1 and snapshot["active"] == 0
+    assert snapshot["fragments"] == 99
+    assert abs(snapshot["fragment_latency_p50"] - 0.125) < 1e-6
+    assert abs(snapshot["bytes_per_second"] - 8_000) < 500
+    # 12.5 seconds of callbacks produce two summaries, not one line per callback.
+    assert len([r for r in caplog.records if r.getMessage().startswith("Progress:")]) == 2
+
+    metrics.close()
+    records = [json.loads(line) for line in stats.read_text(encoding="utf-8").splitlines()]
+    assert len(records) == 3
+    assert records[-1]["downloaded_bytes"] == 100_000
+
+
+def test_logger_counts_retries_and_eta():
+    clock = FakeClock()
+    metrics = metrics_module.DownloadMetrics(interval=60, clock=clock)
+    logger = metrics.logger()
+    logger.warning("[download] Got error: timed out. Retrying fragment 3 (1/10)...")
+    logger.warning("Falling back to generic extractor")
+    assert metrics.retries == 1
+
+    metrics({"status": "downloading", "filename": "b.mp4", "downloaded_bytes": 0})
+    clock.now += 10
+    metrics(
+        {
+            "status": "downloading",
+            "filename": "b.mp4",
+            "downloaded_bytes": 5_000,
+            "total_bytes_estimate": 10_000,
+        }
+    )
+    snapshot = metrics.snapshot()
+    assert snapshot["bytes_per_second"] == 500
+    assert snapshot["eta"] == 10
+
+
+def test_prometheus_endpoint():
+    metrics = metrics_module.DownloadMetrics(interval=60)
+    metrics.set_queue_depth(3)
+    metrics.dequeued()
+    metrics({"status": "finished", "filename": "c.mp4", "total_bytes": 42})
+    host, port = metrics.serve(0)
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+    finally:
+        metrics.close()
+
+    assert "# TYPE video_tools_downloaded_bytes_total counter" in body
+    assert "video_tools_downloaded_bytes_total 42" in body
+    assert "video_tools_queue_depth 2" in body
+    assert "video_tools_fragment_latency_seconds_count 0" in body
@@ -0,0 +1,68 @@
+import hashlib
+import threading
+
+from video_tools import archive, pipeline
+
+
+class FakeYoutubeDL:
+    def __init__(self, store, gate):
+        self.archive = store
+        self.gate = gate
+        self.merged = []
+
+    def post_process(self, filename, info, files_to_move=None):
+        self.gate.wait(5)
+        if info["id"] == "bad":
+            raise RuntimeError("ffmpeg exited with code 1")
+        self.merged.append(info["id"])
+        return dict(info, filepath=filename)
+
+    def _make_archive_id(self, info):
+        return f"youtube {info['id']}"
+
+    def process_info(self, filename, info):
+        # What yt-dlp does per video: post-process, then record the archive entry.
+        self.post_process(filename, info)
+        self.archive.add(self._make_archive_id(info))
+
+
+def test_downloads_overlap_with_bounded_backpressure(tmp_path):
+    store = archive.DownloadArchive(tmp_path / "archive.sqlite3")
+    gate = threading.Event()
+    ydl = FakeYoutubeDL(store, gate)
+    stages = pipeline.PostProcessPipeline(workers=1, depth=1)
+    stages.attach(ydl)
+
+    ydl.process_info("a.mp4", {"id": "a"})  # picked up by the worker, blocked on the gate
+    ydl.process_info("b.mp4", {"id": "b"})  # fills the queue
+    assert "youtube a" in ydl.archive and "youtube a" not in store
+
+    blocked = threading.Thread(target=ydl.process_info, args=("bad.mp4", {"id": "bad"}))
+    blocked.start()
+    blocked.join(0.2)
+    assert blocked.is_alive()  # backpressure: the third download waits for a free slot
+
+    gate.set()
+    blocked.join(5)
+    stages.join()
+    stages.close()
+
+    assert ydl.merged == ["a", "b"]
+    assert "youtube a" in store and "youtube b" in store
+    assert "youtube bad" not in store
+    assert len(stages.failures) == 1 and stages.processed == 2
+    store.close()
+
+
+def test_inline_checksum_stage(tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"\x00" * 4096)
+    gate = threading.Event()
+    gate.set()
+    ydl = FakeYoutubeDL(set(), gate)
+    with pipeline.PostProcessPipeline(workers=0, checksum=True) as stages:
+        stages.attach(ydl)
+        ydl.post_process(str(video), {"id": "clip"})
+
+    digest = hashlib.sha256(video.read_bytes()).hexdigest()
+    assert (tmp_path / "clip.mp4.sha256").read_text() == f"{digest}  clip.mp4\n"
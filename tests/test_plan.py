@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+import pytest
+
+from video_tools import __main__ as cli
+from video_tools import plan
+from video_tools.archive import DownloadArchive
+from video_tools.metacache import MetadataCache, listing_key
+from video_tools.waits import StepTimings
+
+JOBFILE = """
+[settings]
+workers = 2
+assumed_rate = "1M"
+
+[defaults.youtube]
+output_dir = "media"
+
+[[youtube]]
+url = "https://www.youtube.com/@big"
+
+[[youtube]]
+name = "small"
+url = "https://www.youtube.com/@small"
+
+[[youtube]]
+url = "https://www.youtube.com/@members"
+cookies = "members.txt"
+
+[[scrape]]
+url = "https://portal.example/course/1"
+video_selector = "css:video source"
+
+[[scrape]]
+url = "https://portal.example/course/2"
+video_selector = "css:video source"
+"""
+
+
+def _listing(ids, size):
+    return {
+        "entries": [
+            {"id": video_id, "ie_key": "Youtube", "filesize_approx": size} for video_id in ids
+        ]
+    }
+
+
+def test_plan_groups_and_orders_by_estimated_cost(tmp_path):
+    jobfile = tmp_path / "jobs.toml"
+    jobfile.write_text(JOBFILE)
+    settings, jobs = plan.load_jobfile(jobfile)
+    assert [job.name for job in jobs][1] == "small"
+    assert jobs[0].options["output_dir"] == "media"
+
+    cache = MetadataCache(tmp_path / "meta.sqlite3")
+    cache.put(listing_key("https://www.youtube.com/@big"), _listing(["a", "b", "c"], 50 * 2**20))
+    cache.put(listing_key("https://www.youtube.com/@small"), _listing(["d", "e"], 2**20))
+    archive = DownloadArchive(tmp_path / "archive.sqlite3")
+    archive.add("youtube e")
+    timings = StepTimings()
+    timings.record("portal.example", "login", 4.0)
+
+    result = plan.build_plan(settings, jobs, cache=cache, archive=archive, timings=timings)
+    groups = [(group.kind, group.host, group.credential) for group in result.groups]
+    # The uncached members channel is assumed large; the two public ones share a group.
+    assert groups == [
+        ("youtube", "youtube.com", "members.txt"),
+        ("youtube", "youtube.com", ""),
+        ("scrape", "portal.example", "portal.example"),
+    ]
+    public = result.groups[1].jobs
+    assert [job.name for job in public] == ["small", "https://www.youtube.com/@big"]
+    assert public[0].bytes == 2**20 and public[1].bytes == 150 * 2**20
+    assert result.groups[2].seconds == 8.0
+    assert result.makespan() == max(result.groups[0].seconds, result.groups[1].seconds + 8.0)
+    cache.close()
+    archive.close()
+
+
+def test_unknown_keys_are_rejected_and_dry_run_prints_plan(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    jobfile = tmp_path / "jobs.toml"
+    jobfile.write_text(
+        '[[scrape]]\nurl = "https://p.example"\nvideo_selector = "x"\npassword = "x"\n'
+    )
+    with pytest.raises(ValueError, match="password"):
+        plan.load_jobfile(jobfile)
+    for setting, message in (('workers = "four"', "workers"), ('assumed_rate = "fast"', "rate")):
+        jobfile.write_text(f"[settings]\n{setting}\n")
+        with pytest.raises(ValueError, match=message):
+            plan.load_jobfile(jobfile)
+    assert cli._run_plan(SimpleNamespace(jobfile=jobfile, dry_run=True, workers=None)) == 1
+
+    jobfile.write_text(JOBFILE)
+    assert cli._run_plan(SimpleNamespace(jobfile=jobfile, dry_run=True, workers=None)) == 0
+    out = capsys.readouterr().out
+    assert out.startswith("Plan: 5 job(s) in 3 group(s) on 2 worker(s)")
+    assert "(not listed yet)" in out and "portal.example [portal.example]" in out
+
+
+def test_download_jobs_get_distinct_default_output_files(tmp_path):
+    jobfile = tmp_path / "jobs.toml"
+    entry = '[[scrape]]\nurl = "{url}"\nvideo_selector = "css:video"\ndownload = true\n'
+    jobfile.write_text(
+        entry.format(url="https://portal.example/course/1")
+        + entry.format(url="https://portal.example/course/2")
+    )
+    _, jobs = plan.load_jobfile(jobfile)
+    assert [plan._output_file(job).name for job in jobs] == [
+        "video_https_portal.example_course_1.mp4",
+        "video_https_portal.example_course_2.mp4",
+    ]
+
+    jobfile.write_text(
+        jobfile.read_text() + 'output_file = "video_https_portal.example_course_1.mp4"\n'
+    )
+    with pytest.raises(ValueError, match="both download to"):
+        plan.load_jobfile(jobfile)
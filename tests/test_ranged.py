@@ -0,0 +1,105 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from video_tools import ranged, scraper
+from video_tools.scheduler import Scheduler
+
+BODY = bytes(range(256)) * 4000  # ~1 MB
+
+
+class MediaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    ranges = []
+    throttled = 0
+    files = {"/talk.mp4": "video/mp4", "/talk.webm": "video/webm", "/plain.mp4": "video/mp4"}
+
+    def do_GET(self):
+        content_type = self.files.get(self.path)
+        if content_type is None:
+            self.send_error(404)
+            return
+        range_header = self.headers.get("Range")
+        if range_header and MediaHandler.throttled:
+            MediaHandler.throttled -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body, status = BODY, 200
+        if range_header and self.path != "/plain.mp4":
+            self.ranges.append(range_header)
+            start, _, end = range_header.removeprefix("bytes=").partition("-")
+            end = int(end) if end else len(BODY) - 1
+            body, status = BODY[int(start) : end + 1], 206
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(BODY)}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    MediaHandler.ranges = []
+    MediaHandler.throttled = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), MediaHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_parallel_ranges_and_resume(server, tmp_path):
+    output = tmp_path / "talk.mp4"
+    ranged.download_ranged(server + "/talk.mp4", output, connections=4, chunk_size=100_000)
+    assert output.read_bytes() == BODY
+    assert len(MediaHandler.ranges) == 1 + 11  # probe + one request per 100 kB chunk
+    assert not list(tmp_path.glob("*.part*"))
+
+    # Interrupted run: chunk 0 complete, chunk 1 half written, the rest missing.
+    resumed = tmp_path / "resumed.mp4"
+    part = tmp_path / "resumed.mp4.part"
+    part.write_bytes(BODY[:150_000] + bytes(len(BODY) - 150_000))
+    info = ranged.probe(server + "/talk.mp4", ranged.Session())
+    identity = {"url": info.url, "size": len(BODY), "validator": '"v1"', "chunk": 100_000}
+    state = ranged._ResumeState(tmp_path / "resumed.mp4.part.json", identity)
+    state.update(0, 100_000)
+    state.update(1, 50_000)
+
+    MediaHandler.ranges = []
+    ranged.download_ranged(server + "/talk.mp4", resumed, connections=4, chunk_size=100_000)
+    assert resumed.read_bytes() == BODY
+    assert "bytes=0-99999" not in MediaHandler.ranges
+    assert "bytes=150000-199999" in MediaHandler.ranges
+
+
+def test_remux_fallback_and_servers_without_ranges(server, tmp_path):
+    with pytest.raises(ranged.NeedsRemux):
+        ranged.download_ranged(server + "/talk.webm", tmp_path / "talk.mp4")
+    assert ranged.source_family("https://cdn/x.mp4?sig=1", "application/octet-stream") == "mp4"
+    assert ranged.source_family("https://cdn/x.mp4", "application/vnd.apple.mpegurl") is None
+
+    output = tmp_path / "plain.mp4"
+    ranged.download_ranged(server + "/plain.mp4", output, connections=4)
+    assert output.read_bytes() == BODY
+
+
+def test_scheduler_gates_scraped_downloads(server, tmp_path):
+    scheduler = Scheduler(per_host=4, base_delay=0.01, max_delay=0.01)
+    MediaHandler.throttled = 1
+    output = tmp_path / "talk.mp4"
+    scraper.download_with_ffmpeg(
+        server + "/talk.mp4", output, segment_workers=4, scheduler=scheduler
+    )
+    assert output.read_bytes() == BODY
+    assert scheduler.concurrency(server) == 2  # halved by the 429, then one success
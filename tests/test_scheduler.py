@@ -0,0 +1,81 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from video_tools import scheduler as scheduler_module
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_paces_requests_per_host():
+    clock = FakeClock()
+    scheduler = scheduler_module.Scheduler(
+        request_rate=2.0, burst=2, clock=clock, sleep=clock.sleep
+    )
+    url = "https://www.youtube.com/@a"
+    assert scheduler.acquire(url) == 0 and scheduler.acquire(url) == 0
+    assert scheduler.acquire(url) == pytest.approx(0.5)
+    assert scheduler.acquire("https://other.example/v") == 0  # separate bucket
+
+
+def test_aimd_backoff_and_persisted_state(tmp_path):
+    clock = FakeClock()
+    state = tmp_path / "scheduler.json"
+    url = "https://youtube.com/@a"
+    first = scheduler_module.Scheduler(per_host=8, state_path=state, clock=clock)
+    assert first.concurrency(url) == 8
+
+    opts = {"progress_hooks": [], "logger": None}
+    first.configure(opts, url)
+    opts["logger"].warning("HTTP Error 429: Too Many Requests. Retrying (1/3)...")
+    opts["logger"].warning("HTTP Error 429: Too Many Requests. Retrying (2/3)...")
+    assert first.concurrency(url) == 4  # one halving per backoff period, not per retry
+    assert first._hosts["youtube.com"].state.blocked_until > clock.now
+    assert 0 < opts["retry_sleep_functions"]["http"](n=3) <= 1.5 * 2.0 * 2**3
+
+    clock.now = first._hosts["youtube.com"].state.blocked_until + 1
+    for _ in range(4):
+        first.record_success(url, 10_000_000, 10.0)
+    assert first.concurrency(url) == 4 and first._hosts["youtube.com"].state.limit > 4.5
+    first.record_throttle(url)
+    first.close()
+
+    resumed = scheduler_module.Scheduler(per_host=8, state_path=state, clock=clock)
+    assert resumed.concurrency(url) == 2  # does not restart at full aggression
+    clock.now += 2 * scheduler_module.RECOVERY_INTERVAL
+    recovered = scheduler_module.Scheduler(per_host=8, state_path=state, clock=clock)
+    assert recovered.concurrency(url) == 4
+
+
+def test_incompatible_saved_host_state_is_dropped(tmp_path):
+    state = tmp_path / "scheduler.json"
+    clock = FakeClock()
+    saved = {"limit": 1, "updated_at": clock.now}
+    state.write_text(
+        json.dumps({"old.example": {**saved, "retired_field": 3}, "new.example": saved}),
+        encoding="utf-8",
+    )
+    scheduler = scheduler_module.Scheduler(per_host=4, state_path=state, clock=clock)
+    assert scheduler.concurrency("https://old.example/v") == 4
+    assert scheduler.concurrency("https://new.example/v") == 1
+
+
+def test_bandwidth_schedule_windows():
+    schedule = scheduler_module.BandwidthSchedule.parse("22:00-06:00=unlimited, 06:00-22:00=5M")
+    assert schedule.current(datetime(2024, 1, 1, 23, 30)) is None
+    assert schedule.current(datetime(2024, 1, 1, 12, 0)) == 5 * 1024**2
+
+    partial = scheduler_module.BandwidthSchedule.parse("09:00-17:00=1M")
+    assert partial.current(datetime(2024, 1, 1, 18, 0)) is None
+    with pytest.raises(ValueError):
+        scheduler_module.BandwidthSchedule.parse("9-17=1M")
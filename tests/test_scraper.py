@@ -1,5 +1,8 @@
+import time
 from types import SimpleNamespace
 
+import pytest
+
 from video_tools import scraper
 
 
@@ -26,3 +29,137 @@ def test_credential_store_roundtrip(tmp_path, monkeypatch):
     username, password = store.get("example")
     assert username == "user@example.com"
     assert password == "secret"
+
+
+def test_credential_store_caches_metadata_and_secrets(tmp_path, monkeypatch):
+    calls = []
+    secrets = {"a@example.com": "pw-a", "b@example.com": "pw-b"}
+
+    def get_password(service, username):
+        calls.append(username)
+        return secrets.get(username)
+
+    monkeypatch.setattr(scraper, "keyring", SimpleNamespace(get_password=get_password))
+    path = tmp_path / "creds.json"
+    store = scraper.CredentialStore(path=path, secret_ttl=60)
+    store.save_many({"a": "a@example.com", "b": "b@example.com", "b2": "b@example.com"})
+
+    found = store.get_many(["a", "b", "b2", "missing"])
+    assert found == {
+        "a": ("a@example.com", "pw-a"),
+        "b": ("b@example.com", "pw-b"),
+        "b2": ("b@example.com", "pw-b"),
+        "missing": None,
+    }
+    assert store.get("a") == ("a@example.com", "pw-a")
+    assert sorted(calls) == ["a@example.com", "b@example.com"]
+
+    other = scraper.CredentialStore(path=path)
+    other.save_metadata("c", "c@example.com")  # another writer; mtime/size change is noticed
+    assert store.get("c") is None and "c" in store.load()
+
+    store.clear_secrets()
+    store.get("a")
+    assert calls.count("a@example.com") == 2
+
+
+def test_credential_store_concurrent_writers_keep_every_alias(tmp_path):
+    import threading
+
+    path = tmp_path / "creds.json"
+
+    def writer(index):
+        store = scraper.CredentialStore(path=path)
+        for item in range(10):
+            store.save_metadata(f"w{index}-{item}", f"user{index}")
+
+    threads = [threading.Thread(target=writer, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(scraper.CredentialStore(path=path).load()) == 40
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_scrape_portal_many_dedupes_across_pages(monkeypatch):
+    from contextlib import contextmanager
+
+    pages = [["a.mp4", "b.mp4"], ["b.mp4", "c.mp4"], ["d.mp4"]]
+    driver = SimpleNamespace(current_url="https://portal.example/catalogue", page=0)
+
+    @contextmanager
+    def fake_session(**kwargs):
+        yield driver
+
+    def fake_next_page(drv, selector, wait_timeout, waits=None, results=None):
+        drv.page += 1
+        return drv.page < len(pages)
+
+    monkeypatch.setattr(scraper, "_portal_session", fake_session)
+    monkeypatch.setattr(scraper, "extract_video_urls", lambda drv, **kw: pages[drv.page])
+    monkeypatch.setattr(scraper, "next_page", fake_next_page)
+
+    videos = list(
+        scraper.scrape_portal_many(
+            url="https://portal.example",
+            username="alice",
+            password="secret",
+            username_field="Email",
+            password_field="Password",
+            navigation_steps=[],
+            video_selector="css:a.video",
+            video_attribute="href",
+            headless=True,
+            next_page_selector="css:a.next",
+            max_pages=2,
+        )
+    )
+
+    assert [(video.url, video.page) for video in videos] == [
+        ("a.mp4", 1),
+        ("b.mp4", 1),
+        ("c.mp4", 2),
+    ]
+
+
+def test_in_place_pagination_does_not_wait_for_a_new_body():
+    pytest.importorskip("selenium")
+    from selenium.common.exceptions import StaleElementReferenceException
+
+    class Element:
+        def __init__(self):
+            self.stale = False
+
+        def is_enabled(self):
+            if self.stale:
+                raise StaleElementReferenceException()
+            return True
+
+        def is_displayed(self):
+            return True
+
+        def get_attribute(self, name):
+            return None
+
+    class Page:
+        current_url = "https://portal.example/catalogue"
+
+        def __init__(self):
+            self.body, self.result, self.control = Element(), Element(), Element()
+            self.control.click = lambda: setattr(self.result, "stale", True)  # XHR re-render
+
+        def find_element(self, by, query):
+            return self.body
+
+        def find_elements(self, by, query):
+            return [self.control] if query == "a.next" else [self.result]
+
+        def execute_script(self, script):
+            return 10_000  # quiet for 10 s
+
+    waits = scraper.WaitPolicy(timeout=15)
+    started = time.monotonic()
+    assert scraper.next_page(Page(), "css:a.next", 15, waits=waits, results="css:a.video")
+    assert time.monotonic() - started < 2
@@ -0,0 +1,136 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from video_tools import segments
+
+SEGMENTS = {f"/hls/seg{index}.ts": bytes([index]) * 1000 for index in range(12)}
+MEDIA = (
+    "#EXTM3U\n#EXT-X-TARGETDURATION:4\n"
+    + "".join(f"#EXTINF:4.0,\nseg{index}.ts\n" for index in range(12))
+    + "#EXT-X-ENDLIST\n"
+)
+MASTER = (
+    "#EXTM3U\n"
+    "#EXT-X-STREAM-INF:BANDWIDTH=400000,RESOLUTION=640x360\nlow/index.m3u8\n"
+    "#EXT-X-STREAM-INF:BANDWIDTH=1200000,RESOLUTION=1280x720\nindex.m3u8\n"
+)
+
+
+class PortalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    files = {"/hls/master.m3u8": MASTER.encode(), "/hls/index.m3u8": MEDIA.encode(), **SEGMENTS}
+
+    def do_GET(self):
+        body = self.files.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        status = 200
+        range_header = self.headers.get("Range")
+        if range_header:
+            start, _, end = range_header.removeprefix("bytes=").partition("-")
+            body = body[int(start) : int(end) + 1 if end else None]
+            status = 206
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PortalHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_parse_master_picks_highest_bandwidth():
+    playlist, renditions = segments.parse_m3u8(MASTER, "http://host/hls/master.m3u8")
+    assert playlist is None
+    assert renditions == ["http://host/hls/index.m3u8"]
+
+    with pytest.raises(segments.UnsupportedManifest):
+        segments.parse_m3u8('#EXTM3U\n#EXT-X-KEY:METHOD=AES-128,URI="k"\nseg.ts\n', "http://h/")
+
+
+def test_parse_mpd_segment_template():
+    mpd = """<?xml version="1.0"?>
+    <MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static" mediaPresentationDuration="PT10S">
+      <Period>
+        <AdaptationSet contentType="video">
+          <SegmentTemplate media="v_$RepresentationID$_$Number%03d$.m4s"
+                           initialization="v_$RepresentationID$_init.mp4"
+                           duration="4" timescale="1" startNumber="1"/>
+          <Representation id="lo" bandwidth="100"/>
+          <Representation id="hi" bandwidth="900"/>
+        </AdaptationSet>
+        <AdaptationSet mimeType="audio/mp4">
+          <Representation id="a" bandwidth="64">
+            <SegmentTemplate media="a_$Time$.m4s" initialization="a_init.mp4">
+              <SegmentTimeline><S t="0" d="5" r="1"/></SegmentTimeline>
+            </SegmentTemplate>
+          </Representation>
+        </AdaptationSet>
+      </Period>
+    </MPD>"""
+    video, audio = segments.parse_mpd(mpd, "http://cdn/stream/manifest.mpd")
+    assert video.init.url == "http://cdn/stream/v_hi_init.mp4"
+    assert [segment.url.rsplit("/", 1)[1] for segment in video.segments] == [
+        "v_hi_001.m4s",
+        "v_hi_002.m4s",
+        "v_hi_003.m4s",
+    ]
+    assert [segment.url.rsplit("/", 1)[1] for segment in audio.segments] == ["a_0.m4s", "a_5.m4s"]
+
+
+def test_parse_mpd_repeats_to_the_next_entry_or_period_end():
+    mpd = """<?xml version="1.0"?>
+    <MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static"{duration}>
+      <Period>
+        <AdaptationSet contentType="video">
+          <Representation id="v" bandwidth="900">
+            <SegmentTemplate media="v_$Time$.m4s" timescale="1">
+              <SegmentTimeline><S t="0" d="2" r="-1"/><S t="6" d="1" r="-1"/></SegmentTimeline>
+            </SegmentTemplate>
+          </Representation>
+        </AdaptationSet>
+      </Period>
+    </MPD>"""
+    (video,) = segments.parse_mpd(
+        mpd.format(duration=' mediaPresentationDuration="PT10S"'), "http://cdn/manifest.mpd"
+    )
+    assert [segment.url.rsplit("/", 1)[1] for segment in video.segments] == [
+        f"v_{time}.m4s" for time in (0, 2, 4, 6, 7, 8, 9)
+    ]
+    with pytest.raises(segments.UnsupportedManifest, match="r=.-1"):
+        segments.parse_mpd(mpd.format(duration=""), "http://cdn/manifest.mpd")
+
+
+def test_download_segmented_against_local_server(server, tmp_path, monkeypatch):
+    remuxed = {}
+
+    def fake_remux(inputs, output_file):
+        remuxed["inputs"] = [path.read_bytes() for path in inputs]
+        output_file.write_bytes(remuxed["inputs"][0])
+
+    monkeypatch.setattr(segments, "remux", fake_remux)
+
+    output = tmp_path / "webinar.mp4"
+    # Simulate an interrupted run: one finished segment and one partial segment.
+    work_dir = tmp_path / "webinar.mp4.segments" / "stream0"
+    work_dir.mkdir(parents=True)
+    (work_dir / "000000.seg").write_bytes(SEGMENTS["/hls/seg0.ts"])
+    (work_dir / "000001.seg.part").write_bytes(SEGMENTS["/hls/seg1.ts"][:300])
+
+    segments.download_segmented(f"{server}/hls/master.m3u8", output, workers=4)
+
+    assert output.read_bytes() == b"".join(SEGMENTS.values())
+    assert not (tmp_path / "webinar.mp4.segments").exists()
@@ -0,0 +1,96 @@
+from video_tools import scraper, sessions
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+        self.alive = True
+        self.visits = []
+        self.cookies = []
+        self.current_url = "https://portal.example/login"
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("chrome not reachable")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+    def get(self, url):
+        self.visits.append(url)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+
+def test_driver_pool_reuses_and_evicts_sessions():
+    created = []
+
+    def factory():
+        created.append(FakeDriver())
+        return created[-1]
+
+    with sessions.DriverPool(factory, size=1) as pool:
+        with pool.session("portal") as first:
+            first.authenticated = True
+        with pool.session("portal") as second:
+            assert second is first
+            second.driver.alive = False
+        with pool.session("portal") as third:
+            assert third is not first
+        assert created[0].quit_called
+        assert len(created) == 2
+    assert created[1].quit_called
+
+
+def test_cookie_jar_store_ttl(tmp_path):
+    store = sessions.CookieJarStore(directory=tmp_path, ttl=60)
+    store.save("portal.example", [{"name": "session", "value": "abc"}])
+    assert store.load("portal.example") == [{"name": "session", "value": "abc"}]
+
+    expired = sessions.CookieJarStore(directory=tmp_path, ttl=-1)
+    assert expired.load("portal.example") is None
+
+    store.clear("portal.example")
+    assert store.load("portal.example") is None
+
+
+def test_open_authenticated_skips_login_with_saved_cookies(tmp_path, monkeypatch):
+    logins = []
+
+    def login(driver, **kwargs):
+        logins.append(kwargs)
+        driver.pending = [{"name": "session", "value": "abc"}]  # set by the form's response
+
+    def login_required(driver, field):
+        if getattr(driver, "pending", None):
+            driver.cookies, driver.pending = driver.cookies + driver.pending, None
+            return True  # the login page is still shown while the response loads
+        return not driver.cookies
+
+    monkeypatch.setattr(scraper, "login", login)
+    monkeypatch.setattr(scraper, "login_required", login_required)
+
+    store = sessions.CookieJarStore(directory=tmp_path)
+    options = dict(
+        url="https://portal.example/login",
+        username="alice",
+        password="secret",
+        username_field="Email",
+        password_field="Password",
+        wait_timeout=5,
+        cookies=store,
+    )
+
+    cold = sessions.BrowserSession(driver=FakeDriver(), alias="portal.example")
+    scraper.open_authenticated(cold, **options)
+    assert len(logins) == 1 and cold.authenticated
+
+    warm = sessions.BrowserSession(driver=FakeDriver(), alias="portal.example")
+    scraper.open_authenticated(warm, **options)
+    assert len(logins) == 1 and warm.authenticated
+    assert warm.driver.cookies == [{"name": "session", "value": "abc"}]
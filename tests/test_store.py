@@ -0,0 +1,51 @@
+import hashlib
+import os
+
+from video_tools import store as store_module
+
+
+def test_hash_file_matches_hashlib_for_mmap_and_chunked_reads(tmp_path, monkeypatch):
+    payload = os.urandom(300_000)
+    path = tmp_path / "video.mp4"
+    path.write_bytes(payload)
+    expected = hashlib.sha256(payload).hexdigest()
+
+    assert store_module.hash_file(path, chunk_size=4096) == expected
+    monkeypatch.setattr(store_module, "MMAP_THRESHOLD", 1)
+    assert store_module.hash_file(path, chunk_size=4096) == expected
+
+
+def test_ingest_links_duplicates_to_one_object(tmp_path):
+    cas = store_module.ContentStore(tmp_path / "store")
+    payload = os.urandom(10_000)
+    first = tmp_path / "chan-a" / "talk.mp4"
+    mirror = tmp_path / "chan-b" / "talk (mirror).mp4"
+    for path in (first, mirror):
+        path.parent.mkdir()
+        path.write_bytes(payload)
+
+    digest, saved = cas.ingest(first)
+    assert saved == 0 and cas.object_path(digest).samefile(first)
+    assert cas.ingest(mirror) == (digest, len(payload))
+    assert mirror.samefile(first) and mirror.read_bytes() == payload
+    assert cas.ingest(mirror) == (digest, 0)
+
+
+def test_dedupe_tree_reclaims_space(tmp_path):
+    tree = tmp_path / "downloads"
+    payload = os.urandom(5_000)
+    paths = [tree / "a" / "x.mp4", tree / "b" / "y.mp4", tree / "c" / "z.mp4"]
+    for path in paths:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(payload)
+    (tree / "a" / "other.mp4").write_bytes(os.urandom(5_000))
+    (tree / "a" / "unique.mp4").write_bytes(os.urandom(123))
+
+    dry = store_module.dedupe_tree([tree], dry_run=True)
+    assert (dry.files, dry.hashed, dry.duplicates) == (5, 4, 2)
+    assert not paths[0].samefile(paths[1])
+
+    report = store_module.dedupe_tree([tree], workers=2)
+    assert report.reclaimed_bytes == 2 * len(payload)
+    assert paths[0].samefile(paths[1]) and paths[0].samefile(paths[2])
+    assert store_module.dedupe_tree([tree]).duplicates == 0
@@ -0,0 +1,57 @@
+import io
+import json
+import threading
+
+import pytest
+
+from video_tools import trace
+
+
+def test_spans_are_noops_while_disabled():
+    assert not trace.enabled()
+    with trace.span("login", host="portal.example") as span:
+        span["bytes"] = 10
+    assert trace.span("a") is trace.span("b")  # one shared object, nothing allocated
+
+
+def test_nested_spans_summary_and_chrome_export(tmp_path):
+    tracer = trace.enable()
+    try:
+        with trace.span("scrape_portal", host="portal.example"):
+            with trace.span("login"):
+                pass
+            for step in range(2):
+                with trace.span("navigate", step=step):
+                    pass
+
+        def postprocess():
+            with trace.span("postprocess"):
+                pass
+
+        worker = threading.Thread(target=postprocess)
+        worker.start()
+        worker.join()
+        with pytest.raises(ValueError):
+            with trace.span("download.ffmpeg") as span:
+                span["bytes"] = 2048
+                raise ValueError("ffmpeg exited 1")
+    finally:
+        assert trace.disable() is tracer
+
+    stats = {row.name: row for row in tracer.summary()}
+    assert stats["navigate"].count == 2
+    outer = stats["scrape_portal"]
+    children = stats["login"].total + stats["navigate"].total
+    assert outer.self_total == pytest.approx(outer.total - children)
+
+    output = io.StringIO()
+    tracer.print_summary(output)
+    assert output.getvalue().splitlines()[0].split()[:3] == ["phase", "count", "total"]
+
+    path = tmp_path / "trace.json"
+    tracer.write_chrome(path)
+    events = json.loads(path.read_text())["traceEvents"]
+    assert {event["ph"] for event in events} == {"X"}
+    assert len({event["tid"] for event in events}) == 2
+    failed = next(event for event in events if event["name"] == "download.ffmpeg")
+    assert failed["args"] == {"bytes": 2048, "error": "ValueError"}
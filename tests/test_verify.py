@@ -0,0 +1,97 @@
+import os
+
+from video_tools import archive, metacache, verify
+
+
+def fake_probe(path):
+    data = path.read_bytes()
+    if data.startswith(b"junk"):
+        return {"errors": "moov atom not found", "returncode": 1}
+    return {
+        "format": {"duration": str(len(data) / 100)},
+        "streams": [{"codec_type": "video"}, {"codec_type": "audio"}],
+        "errors": "",
+        "returncode": 0,
+    }
+
+
+def test_verify_tree_is_incremental_and_feeds_redownload(tmp_path, monkeypatch):
+    monkeypatch.setattr(verify, "probe", fake_probe)
+    probed = []
+    real_check = verify.check_media
+    monkeypatch.setattr(
+        verify,
+        "check_media",
+        lambda path, expected=None: probed.append(path.name) or real_check(path, expected),
+    )
+    tree = tmp_path / "downloads"
+    (tree / "chan").mkdir(parents=True)
+    good = tree / "chan" / "good.mp4"
+    good.write_bytes(b"\x00" * 6000)
+    short = tree / "chan" / "short.mp4"
+    short.write_bytes(b"\x00" * 3000)
+    (tree / "chan" / "broken.mkv").write_bytes(b"junk")
+    (tree / "chan" / "next.mp4.part").write_bytes(b"\x00" * 10)
+    (tree / "chan" / "notes.txt").write_text("ignored")
+
+    cache = metacache.MetadataCache(tmp_path / "meta.sqlite3")
+    cache.put(
+        metacache.file_key(short),
+        {"url": "https://yt.test/watch?v=s", "archive_key": "youtube s", "duration": 60},
+    )
+    report = verify.verify_tree(tree, cache=cache, workers=3)
+    statuses = {check.path.name: check.status for check in report.checked}
+    assert statuses == {
+        "good.mp4": verify.OK,
+        "short.mp4": verify.TRUNCATED,
+        "broken.mkv": verify.CORRUPT,
+        "next.mp4.part": verify.PARTIAL,
+    }
+
+    redownload = tmp_path / "redownload.txt"
+    assert verify.write_redownload_list(report, redownload) == 1
+    assert "https://yt.test/watch?v=s" in redownload.read_text().splitlines()
+    store = archive.DownloadArchive(tmp_path / "archive.sqlite3")
+    store.add_many(["youtube s", "youtube g"])
+    assert store.discard([check.archive_key for check in report.bad if check.archive_key]) == 1
+    assert len(store) == 1
+
+    probed.clear()
+    again = verify.verify_tree(tree, cache=cache)
+    assert again.skipped == 1 and "good.mp4" not in probed
+
+    good.write_bytes(b"junk" + b"\x00" * 5996)
+    os.utime(good, ns=(1, 1))
+    assert "good.mp4" in {check.path.name for check in verify.verify_tree(tree).bad}
+    cache.close()
+    store.close()
+
+
+def test_full_recheck_flags_silent_content_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(verify, "probe", fake_probe)
+    video = tmp_path / "clip.webm"
+    video.write_bytes(b"\x01" * 500)
+    first = verify.verify_tree(tmp_path)
+    assert first.checked[0].ok and first.checked[0].sha256
+
+    stat = video.stat()
+    video.write_bytes(b"\x02" * 500)  # bit rot: same size, mtime restored
+    os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert verify.verify_tree(tmp_path).skipped == 1
+    assert verify.verify_tree(tmp_path, full=True).checked[0].status == verify.CHANGED
+
+
+def test_expected_metadata_outlives_the_cache_entry(tmp_path, monkeypatch):
+    monkeypatch.setattr(verify, "probe", fake_probe)
+    short = tmp_path / "short.mp4"
+    short.write_bytes(b"\x00" * 3000)
+    cache = metacache.MetadataCache(tmp_path / "meta.sqlite3")
+    cache.put(metacache.file_key(short), {"url": "https://yt.test/watch?v=s", "duration": 60})
+    assert verify.verify_tree(tmp_path, cache=cache).checked[0].status == verify.TRUNCATED
+    cache.close()
+
+    expired = metacache.MetadataCache(tmp_path / "meta.sqlite3", ttl=0)
+    check = verify.verify_tree(tmp_path, cache=expired, full=True).checked[0]
+    assert check.status == verify.TRUNCATED
+    assert check.url == "https://yt.test/watch?v=s"
+    expired.close()
@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from video_tools import waits
+
+
+def test_step_timeouts_are_learned_per_host_and_persisted(tmp_path):
+    path = tmp_path / "timings.json"
+    timings = waits.StepTimings(path)
+    policy = waits.WaitPolicy(timeout=15.0, timings=timings)
+    url = "https://www.portal.example/catalogue"
+
+    for seconds in (0.4, 0.5, 0.6):
+        timings.record("portal.example", "extract", seconds)
+    assert policy.timeout_for(url, "extract") == waits.MIN_TIMEOUT
+    assert policy.timeout_for(url, "login") == 15.0  # no samples yet
+    assert policy.timeout_for("https://slow.example", "extract") == 15.0
+
+    for seconds in (20.0, 30.0, 40.0):
+        timings.record("slow.example", "extract", seconds)
+    assert policy.timeout_for("https://slow.example", "extract") == 60.0  # capped at 4x
+
+    timings.save()
+    resumed = waits.WaitPolicy(timeout=15.0, timings=waits.StepTimings(path))
+    assert resumed.timeout_for(url, "extract") == waits.MIN_TIMEOUT
+
+
+class FakeDriver:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def set_script_timeout(self, seconds):
+        self.calls.append(("script_timeout", seconds))
+
+    def execute_async_script(self, script, *args):
+        if self.fail:
+            raise RuntimeError("javascript error: Content Security Policy")
+        self.calls.append(("observe", args))
+        return True
+
+    def execute_cdp_cmd(self, command, params):
+        if self.fail:
+            raise RuntimeError("not a Chromium driver")
+        self.calls.append((command, params))
+
+
+def test_observer_wait_and_resource_blocking_degrade_gracefully():
+    policy = waits.WaitPolicy()
+    driver = FakeDriver()
+    policy._appear(driver, ("name", "Email"), 2.0)
+    policy._appear(driver, ("link text", "Next"), 2.0)  # not observable; polling only
+    assert driver.calls == [("script_timeout", 3.0), ("observe", ("css", '[name="Email"]', 2000))]
+
+    assert waits.block_resources(driver)
+    assert ("Network.setBlockedURLs", {"urls": waits.BLOCKED_URL_PATTERNS}) in driver.calls
+
+    broken = FakeDriver(fail=True)
+    policy._appear(broken, ("xpath", "//video"), 2.0)
+    assert not waits.block_resources(broken)
+
+
+def test_element_wait_records_time_spent_in_the_observer():
+    pytest.importorskip("selenium")
+
+    class SlowPage:
+        current_url = "https://portal.example/watch"
+
+        def set_script_timeout(self, seconds):
+            pass
+
+        def execute_async_script(self, script, *args):
+            time.sleep(0.3)  # the video element appears late
+
+        def find_element(self, by, value):
+            return "video-element"
+
+    timings = waits.StepTimings()
+    policy = waits.WaitPolicy(timeout=15.0, timings=timings)
+    assert policy.element(SlowPage(), ("css selector", "video"), "extract") == "video-element"
+    assert timings.expected_seconds(SlowPage.current_url) >= 0.3
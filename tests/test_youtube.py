@@ -1,4 +1,6 @@
-from video_tools import youtube
+import pytest
+
+from video_tools import archive, youtube
 
 
 def test_build_options(tmp_path):
@@ -16,6 +18,71 @@ def test_build_options(tmp_path):
 
     assert opts["format"] == "best"
     assert opts["continuedl"] is False
-    assert opts["ratelimit"] == "2M"
+    assert opts["ratelimit"] == 2 * 1024 * 1024
     assert opts["cookiefile"].endswith("cookies.txt")
     assert "%(uploader)s" in opts["outtmpl"]
+
+
+def test_parse_rate():
+    assert youtube.parse_rate("500K") == 500 * 1024
+    assert youtube.parse_rate("1.5MiB") == 1.5 * 1024 * 1024
+    assert youtube.parse_rate(1000) == 1000.0
+    with pytest.raises(ValueError):
+        youtube.parse_rate("fast")
+
+
+def test_bandwidth_budget_splits_between_active_workers():
+    budget = youtube.BandwidthBudget(total=10_000)
+    assert budget.share(0) == 10_000
+    assert budget.share(1) == 5_000
+    budget.release(0)
+    assert budget.share(1) == 10_000
+
+
+def test_sync_channels_isolates_failures(tmp_path, monkeypatch):
+    def fake_run(url, opts):
+        if url.endswith("/bad"):
+            raise RuntimeError("boom")
+        for hook in opts["progress_hooks"]:
+            hook({"status": "downloading", "downloaded_bytes": 10})
+            hook({"status": "finished", "total_bytes": 100, "filename": "x.mp4"})
+        assert opts["ratelimit"] <= 1024 * 1024
+
+    monkeypatch.setattr(youtube, "_run_yt_dlp", fake_run)
+
+    report = youtube.sync_channels(
+        ["https://youtube.com/c/good", "https://youtube.com/c/bad", "https://youtube.com/c/good"],
+        output_dir=tmp_path,
+        workers=2,
+        bandwidth="1M",
+    )
+
+    assert [result.url for result in report.results] == [
+        "https://youtube.com/c/good",
+        "https://youtube.com/c/bad",
+    ]
+    assert report.results[0].ok and report.results[0].downloaded_bytes == 100
+    assert report.failed[0].error == "boom"
+
+
+def test_incremental_filter_stops_at_high_water_mark(tmp_path):
+    store = archive.DownloadArchive(tmp_path / "archive.sqlite3")
+    url = "https://youtube.com/@example/videos"
+
+    first = youtube.IncrementalFilter(store, url)
+    assert first.full_scan
+    assert first({"id": "new2", "upload_date": "20240103"}, incomplete=True) is None
+    assert first({"id": "new1", "upload_date": "20240102"}, incomplete=True) is None
+    first.commit()
+
+    second = youtube.IncrementalFilter(store, url)
+    assert not second.full_scan
+    assert second({"_type": "url", "id": "UCxyz", "ie_key": "YoutubeTab"}) is None
+    assert second({"id": "new3", "upload_date": "20240104"}, incomplete=True) is None
+    assert second({"id": "new2"}, incomplete=True) is not None
+    assert second({"id": "old", "upload_date": "20231231"}) is not None
+
+    rescan = youtube.IncrementalFilter(store, url, full_rescan=True)
+    assert rescan({"id": "new2"}, incomplete=True) is None
+    assert store.channel_state(url).last_full_elapsed is not None
+    store.close()
@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
-from . import scraper, youtube
+import importlib
+from typing import Any
 
-try:  # pragma: no cover
-    from ._version import version as __version__
-except ImportError:  # pragma: no cover
-    __version__ = "0.0.0"
+__all__ = ["aio", "scraper", "youtube", "__version__"]
 
-__all__ = ["scraper", "youtube", "__version__"]
+
+def __getattr__(name: str) -> Any:
+    # Submodules and the version load on first access so ``import video_tools`` stays cheap.
+    if name in ("aio", "scraper", "youtube"):
+        return importlib.import_module(f".{name}", __name__)
+    if name == "__version__":
+        try:  # pragma: no cover
+            from ._version import version
+        except ImportError:  # pragma: no cover
+            version = "0.0.0"
+        globals()["__version__"] = version
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
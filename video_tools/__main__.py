@@ -3,24 +3,68 @@
 from __future__ import annotations
 
 import argparse
+import importlib
+import json
 import logging
 import subprocess
 import sys
 import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from . import scraper, youtube
+from . import jobs
+from .archive import DownloadArchive, default_archive_path
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .metacache import MetadataCache
+    from .metrics import DownloadMetrics
+    from .scheduler import Scheduler
+    from .sessions import CookieJarStore
+    from .waits import WaitPolicy
+
+JOB_COMMANDS = ("youtube", "scrape")
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Unified CLI for video downloads.")
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging.")
     parser.add_argument("-l", "--logfile", type=Path, help="Optional logfile.")
+    parser.add_argument(
+        "--import-profile",
+        action="store_true",
+        help="Report import time of the CLI and each backend, then exit.",
+    )
+    parser.add_argument(
+        "--import-budget",
+        type=float,
+        metavar="MS",
+        help="With --import-profile: exit non-zero if the CLI import takes longer.",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Time each phase (driver start, login, extraction, transfer, merge) and print a "
+        "summary table to stderr.",
+    )
+    parser.add_argument(
+        "--trace-file",
+        type=Path,
+        metavar="PATH",
+        help="Also write the spans as Chrome trace-event JSON (chrome://tracing, Perfetto).",
+    )
 
-    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers = parser.add_subparsers(dest="command")
 
     youtube_parser = subparsers.add_parser("youtube", help="Download via yt-dlp.")
-    youtube_parser.add_argument("--url", required=True, help="Channel, playlist, or video URL.")
+    youtube_parser.add_argument(
+        "--url",
+        action="append",
+        default=[],
+        help="Channel, playlist, or video URL (repeatable for batch syncs).",
+    )
+    youtube_parser.add_argument(
+        "--channel-list", type=Path, help="File with one channel URL per line (batch sync)."
+    )
     youtube_parser.add_argument(
         "--output-dir", type=Path, default=Path("downloads"), help="Output directory."
     )
@@ -35,6 +79,136 @@ def build_parser() -> argparse.ArgumentParser:
         "--cookies", type=Path, help="Path to cookies.txt for authenticated downloads."
     )
     youtube_parser.add_argument("--retries", type=int, default=3, help="Number of yt-dlp retries.")
+    youtube_parser.add_argument(
+        "--archive",
+        type=Path,
+        help="SQLite download archive; videos recorded there are skipped before extraction.",
+    )
+    youtube_parser.add_argument(
+        "--import-archive",
+        type=Path,
+        help="Merge a yt-dlp --download-archive text file into --archive before syncing.",
+    )
+    youtube_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch uploads newer than the last sync (state kept in the archive).",
+    )
+    youtube_parser.add_argument(
+        "--full-rescan",
+        action="store_true",
+        help="With --incremental: walk the full channel once and refresh the high-water mark.",
+    )
+    youtube_parser.add_argument(
+        "--workers", type=int, default=4, help="Channels synced concurrently in batch mode."
+    )
+    youtube_parser.add_argument(
+        "--per-host", type=int, default=2, help="Concurrent channel syncs allowed per host."
+    )
+    youtube_parser.add_argument(
+        "--bandwidth", help="Global bandwidth budget split across active workers (e.g., 20M)."
+    )
+    youtube_parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between progress summaries in the log and --stats-file.",
+    )
+    youtube_parser.add_argument(
+        "--stats-file", type=Path, help="Append progress snapshots to this JSON Lines file."
+    )
+    youtube_parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics during the download.",
+    )
+    youtube_parser.add_argument(
+        "--dashboard",
+        action="store_true",
+        help="Show a live one-line status on stderr instead of progress log lines.",
+    )
+    youtube_parser.add_argument(
+        "--metadata-cache",
+        type=Path,
+        nargs="?",
+        const=Path.home() / ".video_tools" / "metadata.sqlite3",
+        help="Reuse cached listings and video info (default: ~/.video_tools/metadata.sqlite3).",
+    )
+    youtube_parser.add_argument(
+        "--metadata-max-age",
+        type=float,
+        default=3600.0,
+        help="Seconds cached metadata stays usable for downloads (stream URLs expire).",
+    )
+    youtube_parser.add_argument(
+        "--refresh-metadata",
+        action="store_true",
+        help="With --metadata-cache: re-extract listings and overwrite the cached copy.",
+    )
+    youtube_parser.add_argument(
+        "--postprocess-workers",
+        type=int,
+        default=0,
+        help="Merge/remux finished videos in N background threads while the next downloads.",
+    )
+    youtube_parser.add_argument(
+        "--pipeline-depth",
+        type=int,
+        default=2,
+        help="Downloaded videos allowed to wait for post-processing before downloads pause.",
+    )
+    youtube_parser.add_argument(
+        "--checksum", action="store_true", help="Write a <file>.sha256 next to each video."
+    )
+    youtube_parser.add_argument(
+        "--content-store",
+        type=Path,
+        help="Deduplicate finished files into this content-addressed store (same filesystem).",
+    )
+    youtube_parser.add_argument(
+        "--link-mode",
+        choices=("hardlink", "reflink"),
+        default="hardlink",
+        help="How --content-store links files back into the output tree.",
+    )
+    youtube_parser.add_argument(
+        "--scratch-dir",
+        type=Path,
+        help="Keep partial downloads and merge temp files on this (fast) volume; finished "
+        "files are moved to the output directory.",
+    )
+    youtube_parser.add_argument(
+        "--min-free",
+        default="1G",
+        help="Free space to keep on each volume (e.g. 1G); videos wait until their estimated "
+        "size fits.",
+    )
+    youtube_parser.add_argument(
+        "--disk-check",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Reserve each video's estimated size before downloading it.",
+    )
+    youtube_parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Pace requests per host and halve concurrency/back off on HTTP 429 (state persists).",
+    )
+    youtube_parser.add_argument(
+        "--request-rate",
+        type=float,
+        default=2.0,
+        help="With --adaptive: requests per second allowed per host (token bucket).",
+    )
+    youtube_parser.add_argument(
+        "--bandwidth-schedule",
+        help='Time-of-day bandwidth caps, e.g. "01:00-07:00=unlimited,07:00-01:00=5M".',
+    )
+    youtube_parser.add_argument(
+        "--scheduler-state",
+        type=Path,
+        help="Adaptive scheduler state file (default: ~/.video_tools/scheduler.json).",
+    )
 
     scrape_parser = subparsers.add_parser(
         "scrape", help="Automate an authenticated browser session and extract video URLs."
@@ -67,6 +241,26 @@ def build_parser() -> argparse.ArgumentParser:
         default="href",
         help="Attribute to read from the video element (default: href).",
     )
+    scrape_parser.add_argument(
+        "--engine",
+        choices=("browser", "http"),
+        default="browser",
+        help="Use headless Chrome, or plain HTTP for portals that render server-side.",
+    )
+    scrape_parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Collect every element matching --video-selector and stream them as JSON Lines.",
+    )
+    scrape_parser.add_argument(
+        "--next-page", help="Selector for the pagination control to follow with --all."
+    )
+    scrape_parser.add_argument("--max-pages", type=int, help="Stop --all after this many pages.")
+    scrape_parser.add_argument(
+        "--jsonl",
+        type=Path,
+        help="Write --all results to this file instead of stdout.",
+    )
     scrape_parser.add_argument(
         "--credential-alias",
         help="Name used to store/retrieve credentials (defaults to hostname).",
@@ -74,12 +268,35 @@ def build_parser() -> argparse.ArgumentParser:
     scrape_parser.add_argument(
         "--remember", action="store_true", help="Persist provided credentials for future runs."
     )
+    scrape_parser.add_argument(
+        "--reuse-session",
+        action="store_true",
+        help="Save browser cookies after login and reuse them to skip the login form.",
+    )
+    scrape_parser.add_argument(
+        "--session-ttl",
+        type=int,
+        default=3600,
+        help="Seconds saved session cookies stay valid (used with --reuse-session).",
+    )
     scrape_parser.add_argument(
         "--download", action="store_true", help="Automatically download via ffmpeg."
     )
     scrape_parser.add_argument(
         "--output-file", type=Path, help="Video output filename (used with --download)."
     )
+    scrape_parser.add_argument(
+        "--segment-workers",
+        type=int,
+        default=8,
+        help="Parallel connections: HLS/DASH segments or byte ranges of progressive files "
+        "(1 hands the URL to FFmpeg).",
+    )
+    scrape_parser.add_argument(
+        "--scratch-dir",
+        type=Path,
+        help="Download to this (fast) volume first, then move the file to --output-file.",
+    )
     scrape_parser.add_argument(
         "--headless",
         action=argparse.BooleanOptionalAction,
@@ -89,6 +306,224 @@ def build_parser() -> argparse.ArgumentParser:
     scrape_parser.add_argument(
         "--wait-timeout", type=int, default=15, help="Seconds to wait for page elements."
     )
+    scrape_parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=0.1,
+        help="Seconds between checks when a page condition cannot be observed directly.",
+    )
+    scrape_parser.add_argument(
+        "--learn-timeouts",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Derive per-step timeouts from recorded latencies of this portal host.",
+    )
+    scrape_parser.add_argument(
+        "--block-resources",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Skip images, fonts and media while navigating (browser engine).",
+    )
+    scrape_parser.add_argument(
+        "--chromedriver",
+        type=Path,
+        help="Use this ChromeDriver binary instead of resolving one (or set "
+        "VIDEO_TOOLS_CHROMEDRIVER).",
+    )
+
+    farm_parser = subparsers.add_parser(
+        "scrape-farm", help="Run a manifest of scrape jobs across isolated browser processes."
+    )
+    farm_parser.add_argument(
+        "manifest",
+        type=Path,
+        help="JSON Lines file; each line holds scrape options (url, video_selector, ...).",
+    )
+    farm_parser.add_argument(
+        "--workers", type=int, help="Worker processes (default: fit to CPU count and free RAM)."
+    )
+    farm_parser.add_argument(
+        "--memory-mb",
+        type=int,
+        default=1024,
+        help="Memory budget per worker's Chrome; browsers over it are killed and restarted.",
+    )
+    farm_parser.add_argument(
+        "--job-timeout",
+        type=float,
+        default=300.0,
+        help="Seconds before a hung job's worker and browser are killed.",
+    )
+    farm_parser.add_argument(
+        "--retries", type=int, default=1, help="Retries for a job whose worker was killed."
+    )
+    farm_parser.add_argument(
+        "--jsonl", type=Path, help="Append results to this file instead of stdout."
+    )
+    farm_parser.add_argument(
+        "--headless",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Run Chrome headless.",
+    )
+    farm_parser.add_argument(
+        "--block-resources",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Skip images, fonts and media while navigating.",
+    )
+    farm_parser.add_argument("--chromedriver", type=Path, help="Pinned ChromeDriver binary.")
+    farm_parser.add_argument(
+        "--wait-timeout", type=int, default=15, help="Seconds to wait for page elements."
+    )
+    farm_parser.add_argument(
+        "--segment-workers", type=int, default=8, help="Parallel segment downloads per job."
+    )
+
+    run_parser = subparsers.add_parser(
+        "run", help="Plan and run a TOML job file of YouTube sources and scrape portals."
+    )
+    run_parser.add_argument(
+        "jobfile", type=Path, help="TOML file with [[youtube]]/[[scrape]] jobs."
+    )
+    run_parser.add_argument(
+        "--dry-run", action="store_true", help="Print the plan with estimates and exit."
+    )
+    run_parser.add_argument(
+        "--workers", type=int, help="Groups run in parallel (default: [settings] workers or 4)."
+    )
+
+    doctor_parser = subparsers.add_parser(
+        "doctor", help="Resolve and cache ChromeDriver ahead of time and report the setup."
+    )
+    doctor_parser.add_argument(
+        "--chromedriver", type=Path, help="Check this pinned ChromeDriver binary instead."
+    )
+    doctor_parser.add_argument(
+        "--refresh", action="store_true", help="Re-resolve the driver even if Chrome is unchanged."
+    )
+    doctor_parser.add_argument(
+        "--launch", action="store_true", help="Also start and quit headless Chrome once."
+    )
+
+    cache_options = argparse.ArgumentParser(add_help=False)
+    cache_options.add_argument("url", help="Channel, playlist, or video URL.")
+    cache_options.add_argument(
+        "--cache", type=Path, help="Metadata cache (default: ~/.video_tools/metadata.sqlite3)."
+    )
+    cache_options.add_argument(
+        "--max-age",
+        type=float,
+        default=24 * 3600.0,
+        help="Seconds a cached copy is trusted before extracting again.",
+    )
+    cache_options.add_argument(
+        "--refresh", action="store_true", help="Ignore the cached copy and extract again."
+    )
+    cache_options.add_argument("--cookies", type=Path, help="Path to cookies.txt.")
+
+    list_parser = subparsers.add_parser(
+        "list", parents=[cache_options], help="List the videos of a channel or playlist."
+    )
+    list_parser.add_argument(
+        "--json", action="store_true", help="Print the cached listing as JSON instead of a table."
+    )
+    info_parser = subparsers.add_parser(
+        "info", parents=[cache_options], help="Print a video's metadata as JSON."
+    )
+    info_parser.add_argument(
+        "--formats", action="store_true", help="Print the available formats as a table instead."
+    )
+
+    dedupe_parser = subparsers.add_parser(
+        "dedupe", help="Reclaim space by linking identical files in an existing tree."
+    )
+    dedupe_parser.add_argument("paths", nargs="+", type=Path, help="Directories to scan.")
+    dedupe_parser.add_argument(
+        "--store", type=Path, help="Also ingest files into this content-addressed store."
+    )
+    dedupe_parser.add_argument(
+        "--link-mode", choices=("hardlink", "reflink"), default="hardlink", help="Link type."
+    )
+    dedupe_parser.add_argument("--workers", type=int, default=4, help="Files hashed in parallel.")
+    dedupe_parser.add_argument(
+        "--min-size", type=int, default=1024 * 1024, help="Ignore files smaller than this (bytes)."
+    )
+    dedupe_parser.add_argument(
+        "--dry-run", action="store_true", help="Report duplicates without linking anything."
+    )
+
+    verify_parser = subparsers.add_parser(
+        "verify", help="Check downloaded files for truncation or corruption (needs ffprobe)."
+    )
+    verify_parser.add_argument("output_dir", type=Path, help="Download tree to check.")
+    verify_parser.add_argument(
+        "--manifest", type=Path, help="Checksum manifest (default: OUTPUT_DIR/.verify.sqlite3)."
+    )
+    verify_parser.add_argument("--workers", type=int, default=4, help="Files checked in parallel.")
+    verify_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-check files whose size and mtime are unchanged since they last passed.",
+    )
+    verify_parser.add_argument(
+        "--no-checksum", action="store_true", help="Skip SHA-256 hashing (ffprobe checks only)."
+    )
+    verify_parser.add_argument(
+        "--metadata-cache",
+        type=Path,
+        nargs="?",
+        const=Path.home() / ".video_tools" / "metadata.sqlite3",
+        help="Compare against expected sizes/durations recorded by youtube --metadata-cache.",
+    )
+    verify_parser.add_argument(
+        "--redownload", type=Path, help="Write source URLs of bad files here (--channel-list)."
+    )
+    verify_parser.add_argument(
+        "--archive", type=Path, help="Remove bad files from this download archive."
+    )
+
+    queue_options = argparse.ArgumentParser(add_help=False)
+    queue_options.add_argument(
+        "--queue", type=Path, help="Job queue database (default: ~/.video_tools/jobs.sqlite3)."
+    )
+
+    enqueue_parser = subparsers.add_parser(
+        "enqueue",
+        parents=[queue_options],
+        help="Queue a youtube/scrape command for background workers.",
+    )
+    enqueue_parser.add_argument(
+        "--max-attempts", type=int, default=5, help="Attempts before a job is marked failed."
+    )
+    enqueue_parser.add_argument(
+        "job", nargs=argparse.REMAINDER, help="The command to queue, e.g. youtube --url URL."
+    )
+
+    worker_parser = subparsers.add_parser(
+        "worker", parents=[queue_options], help="Run queued jobs until interrupted."
+    )
+    worker_parser.add_argument(
+        "--concurrency", type=int, default=2, help="Jobs run at the same time."
+    )
+    worker_parser.add_argument(
+        "--once", action="store_true", help="Exit once no job is ready instead of polling."
+    )
+    worker_parser.add_argument(
+        "--poll-interval", type=float, default=5.0, help="Seconds between queue polls when idle."
+    )
+    worker_parser.add_argument(
+        "--backoff", type=float, default=30.0, help="Base retry delay in seconds (doubles per try)."
+    )
+
+    status_parser = subparsers.add_parser(
+        "status", parents=[queue_options], help="Show queued, running, and failed jobs."
+    )
+    status_parser.add_argument("--state", choices=jobs.STATES, help="Only list jobs in this state.")
+    status_parser.add_argument("--limit", type=int, default=20, help="Jobs listed (newest first).")
+    status_parser.add_argument(
+        "--retry-failed", action="store_true", help="Move failed jobs back to pending."
+    )
 
     return parser
 
@@ -97,12 +532,56 @@ def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
 
+    if args.import_profile:
+        from .import_profile import run_import_profile
+
+        return run_import_profile(args.import_budget)
+    if args.command is None:
+        parser.error("a command is required")
+
     setup_logging(args.verbose, args.logfile)
 
+    if not (args.trace or args.trace_file):
+        return _dispatch(parser, args)
+
+    from . import trace
+
+    tracer = trace.enable()
+    try:
+        return _dispatch(parser, args)
+    finally:
+        trace.disable()
+        tracer.print_summary(sys.stderr)
+        if args.trace_file:
+            tracer.write_chrome(args.trace_file)
+            logging.info("Wrote trace to %s", args.trace_file)
+
+
+def _dispatch(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
     if args.command == "youtube":
         return _run_youtube(args)
     if args.command == "scrape":
         return _run_scrape(args)
+    if args.command == "list":
+        return _run_list(args)
+    if args.command == "info":
+        return _run_info(args)
+    if args.command == "dedupe":
+        return _run_dedupe(args)
+    if args.command == "verify":
+        return _run_verify(args)
+    if args.command == "doctor":
+        return _run_doctor(args)
+    if args.command == "run":
+        return _run_plan(args)
+    if args.command == "scrape-farm":
+        return _run_scrape_farm(args)
+    if args.command == "enqueue":
+        return _run_enqueue(args)
+    if args.command == "worker":
+        return _run_worker(args)
+    if args.command == "status":
+        return _run_status(args)
     parser.error("Unknown command")
     return 1
 
@@ -117,16 +596,140 @@ def setup_logging(verbose: bool, logfile: Path | None) -> None:
     )
 
 
+def __getattr__(name: str) -> Any:
+    # Backends are imported by the subcommand that needs them, not at startup.
+    if name in ("scraper", "youtube"):
+        return importlib.import_module(f".{name}", __package__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def _run_youtube(args: argparse.Namespace) -> int:
+    from . import youtube
+    from .metrics import DownloadMetrics
+
+    urls = list(args.url)
+    if args.channel_list:
+        urls.extend(youtube.read_channel_list(args.channel_list))
+    if not urls:
+        logging.error("Provide at least one --url or a --channel-list file.")
+        return 1
+    if args.import_archive and not args.archive:
+        logging.error("--import-archive requires --archive.")
+        return 1
+    try:
+        scheduler = _youtube_scheduler(args)
+    except ValueError as exc:
+        logging.error("%s", exc)
+        return 1
+
+    archive_path = args.archive or (default_archive_path() if args.incremental else None)
+    archive = DownloadArchive(archive_path) if archive_path else None
+    metrics = DownloadMetrics(
+        interval=args.progress_interval, stats_file=args.stats_file, dashboard=args.dashboard
+    )
+    cache = None
+    if args.metadata_cache:
+        from .metacache import MetadataCache
+
+        cache = MetadataCache(args.metadata_cache)
+    try:
+        if args.metrics_port is not None:
+            metrics.serve(args.metrics_port)
+        if archive is not None and args.import_archive:
+            archive.import_text(args.import_archive)
+        return _download_youtube(args, urls, archive, metrics, cache, scheduler)
+    finally:
+        if scheduler is not None:
+            scheduler.close()
+        metrics.close()
+        if cache is not None:
+            cache.close()
+        if archive is not None:
+            archive.close()
+
+
+def _youtube_scheduler(args: argparse.Namespace) -> Scheduler | None:
+    if not (args.adaptive or args.bandwidth_schedule):
+        return None
+    from .scheduler import BandwidthSchedule, Scheduler, default_state_path
+
+    schedule = BandwidthSchedule.parse(args.bandwidth_schedule) if args.bandwidth_schedule else None
+    if not args.adaptive:
+        # A bandwidth schedule alone neither paces requests nor persists state.
+        return Scheduler(per_host=args.per_host, request_rate=0.0, schedule=schedule)
+    return Scheduler(
+        per_host=args.per_host,
+        request_rate=args.request_rate,
+        schedule=schedule,
+        state_path=args.scheduler_state or default_state_path(),
+    )
+
+
+def _download_youtube(
+    args: argparse.Namespace,
+    urls: list[str],
+    archive: DownloadArchive | None,
+    metrics: DownloadMetrics,
+    cache: MetadataCache | None = None,
+    scheduler: Scheduler | None = None,
+) -> int:
+    from . import youtube
+
+    options = {
+        "cache": cache,
+        "metadata_max_age": args.metadata_max_age,
+        "refresh_metadata": args.refresh_metadata,
+        "postprocess_workers": args.postprocess_workers,
+        "pipeline_depth": args.pipeline_depth,
+        "checksum": args.checksum,
+        "scheduler": scheduler,
+        "scratch_dir": args.scratch_dir,
+    }
+    if args.disk_check:
+        from .diskspace import DiskBudget
+        from .scheduler import parse_rate
+
+        options["disk"] = DiskBudget(headroom=int(parse_rate(args.min_free)))
+    if args.content_store:
+        from .store import ContentStore
+
+        options["store"] = ContentStore(args.content_store, link_mode=args.link_mode)
+
+    if len(urls) > 1 or args.bandwidth:
+        report = youtube.sync_channels(
+            urls,
+            output_dir=args.output_dir,
+            workers=args.workers,
+            per_host=args.per_host,
+            bandwidth=args.bandwidth,
+            video_format=args.format,
+            resume=not args.no_resume,
+            rate_limit=args.rate_limit,
+            cookies=args.cookies,
+            retries=args.retries,
+            archive=archive,
+            incremental=args.incremental,
+            full_rescan=args.full_rescan,
+            metrics=metrics,
+            **options,
+        )
+        youtube.log_sync_report(report)
+        return 1 if report.failed else 0
+
     try:
         youtube.download_channel(
-            args.url,
+            urls[0],
             output_dir=args.output_dir,
             video_format=args.format,
             resume=not args.no_resume,
             rate_limit=args.rate_limit,
             cookies=args.cookies,
             retries=args.retries,
+            archive=archive,
+            incremental=args.incremental,
+            full_rescan=args.full_rescan,
+            metrics=metrics,
+            **options,
         )
     except Exception as exc:  # pragma: no cover - network dependent
         logging.critical("yt-dlp failed: %s", exc)
@@ -134,7 +737,86 @@ def _run_youtube(args: argparse.Namespace) -> int:
     return 0
 
 
+def _run_list(args: argparse.Namespace) -> int:
+    from . import youtube
+    from .metacache import MetadataCache, listing_key
+
+    with MetadataCache(args.cache) as cache:
+        age = cache.age(listing_key(args.url))
+        hit = not args.refresh and age is not None and age <= args.max_age
+        try:
+            listing = youtube.extract_listing(
+                args.url,
+                cache=cache,
+                cookies=args.cookies,
+                max_age=args.max_age,
+                refresh=args.refresh,
+            )
+        except Exception as exc:  # pragma: no cover - network dependent
+            logging.critical("Listing %s failed: %s", args.url, exc)
+            return 1
+
+    if args.json:
+        print(json.dumps(listing, indent=2))
+        return 0
+    entries = youtube.listing_entries(listing)
+    for entry in entries:
+        duration = entry.get("duration")
+        print(
+            "\t".join(
+                [
+                    str(entry.get("id") or ""),
+                    f"{duration:.0f}s" if isinstance(duration, (int, float)) else "-",
+                    str(entry.get("title") or entry.get("url") or ""),
+                ]
+            )
+        )
+    source = f"cached {age:.0f}s ago" if hit else "extracted"
+    logging.info("%d video(s) in %s (%s)", len(entries), listing.get("title") or args.url, source)
+    return 0
+
+
+def _run_info(args: argparse.Namespace) -> int:
+    from . import youtube
+    from .metacache import MetadataCache
+    from .metrics import format_bytes
+
+    with MetadataCache(args.cache) as cache:
+        try:
+            info = youtube.extract_video_info(
+                args.url,
+                cache=cache,
+                cookies=args.cookies,
+                max_age=args.max_age,
+                refresh=args.refresh,
+            )
+        except Exception as exc:  # pragma: no cover - network dependent
+            logging.critical("Extracting %s failed: %s", args.url, exc)
+            return 1
+
+    if not args.formats:
+        print(json.dumps(info, indent=2))
+        return 0
+    for fmt in info.get("formats") or []:
+        size = fmt.get("filesize") or fmt.get("filesize_approx")
+        print(
+            "\t".join(
+                [
+                    str(fmt.get("format_id")),
+                    str(fmt.get("ext")),
+                    str(fmt.get("resolution") or fmt.get("format_note") or ""),
+                    str(fmt.get("vcodec") or ""),
+                    str(fmt.get("acodec") or ""),
+                    format_bytes(size) if size else "-",
+                ]
+            )
+        )
+    return 0
+
+
 def _run_scrape(args: argparse.Namespace) -> int:
+    from . import scraper
+
     alias = args.credential_alias or scraper.hostname_alias(args.url)
     store = scraper.CredentialStore()
 
@@ -155,6 +837,34 @@ def _run_scrape(args: argparse.Namespace) -> int:
     if args.remember and args.username and args.password:
         store.store(alias, args.username, args.password)
 
+    cookies = scraper.CookieJarStore(ttl=args.session_ttl) if args.reuse_session else None
+    waits = _scrape_waits(args)
+    try:
+        if args.all:
+            return _scrape_all(args, alias, username, password, cookies, waits)
+        return _scrape_one(args, alias, username, password, cookies, waits)
+    finally:
+        if waits.timings is not None:
+            waits.timings.save()
+
+
+def _scrape_waits(args: argparse.Namespace) -> WaitPolicy:
+    from .waits import StepTimings, WaitPolicy, default_timings_path
+
+    timings = StepTimings(default_timings_path()) if args.learn_timeouts else None
+    return WaitPolicy(timeout=args.wait_timeout, poll=args.poll_interval, timings=timings)
+
+
+def _scrape_one(
+    args: argparse.Namespace,
+    alias: str,
+    username: str,
+    password: str,
+    cookies: CookieJarStore | None,
+    waits: WaitPolicy,
+) -> int:
+    from . import scraper
+
     output_file = args.output_file or Path(f"video_{int(time.time())}.mp4")
 
     try:
@@ -171,6 +881,14 @@ def _run_scrape(args: argparse.Namespace) -> int:
             output_file=output_file,
             headless=args.headless,
             wait_timeout=args.wait_timeout,
+            segment_workers=args.segment_workers,
+            credential_alias=alias,
+            cookies=cookies,
+            scratch_dir=args.scratch_dir,
+            engine=args.engine,
+            waits=waits,
+            block_resources=args.block_resources,
+            driver_path=args.chromedriver,
         )
         logging.info("Video URL: %s", video_url)
         print(video_url)
@@ -183,5 +901,305 @@ def _run_scrape(args: argparse.Namespace) -> int:
     return 0
 
 
+def _scrape_all(
+    args: argparse.Namespace,
+    alias: str,
+    username: str,
+    password: str,
+    cookies: CookieJarStore | None,
+    waits: WaitPolicy,
+) -> int:
+    from . import scraper
+
+    if args.download:
+        logging.error("--download cannot be combined with --all; download from the JSON Lines.")
+        return 1
+
+    output = args.jsonl.open("a", encoding="utf-8") if args.jsonl else sys.stdout
+    count = 0
+    try:
+        for video in scraper.scrape_portal_many(
+            url=args.url,
+            username=username,
+            password=password,
+            username_field=args.username_field,
+            password_field=args.password_field,
+            navigation_steps=args.navigation,
+            video_selector=args.video_selector,
+            video_attribute=args.video_attribute,
+            headless=args.headless,
+            wait_timeout=args.wait_timeout,
+            next_page_selector=args.next_page,
+            max_pages=args.max_pages,
+            credential_alias=alias,
+            cookies=cookies,
+            engine=args.engine,
+            waits=waits,
+            block_resources=args.block_resources,
+            driver_path=args.chromedriver,
+        ):
+            output.write(json.dumps({"url": video.url, "page": video.page, "source": video.source}))
+            output.write("\n")
+            output.flush()
+            count += 1
+    except Exception as exc:  # pragma: no cover - depends on remote portal
+        logging.critical("Scrape failed after %d URL(s): %s", count, exc)
+        return 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+def _run_dedupe(args: argparse.Namespace) -> int:
+    from .metrics import format_bytes
+    from .store import ContentStore, dedupe_tree
+
+    missing = [path for path in args.paths if not path.is_dir()]
+    if missing:
+        logging.error("Not a directory: %s", ", ".join(map(str, missing)))
+        return 1
+    store = ContentStore(args.store, link_mode=args.link_mode) if args.store else None
+    report = dedupe_tree(
+        args.paths,
+        store=store,
+        workers=args.workers,
+        min_size=args.min_size,
+        dry_run=args.dry_run,
+        link_mode=args.link_mode,
+    )
+    logging.info(
+        "%d file(s) scanned, %d hashed, %d duplicate(s); %s %s",
+        report.files,
+        report.hashed,
+        report.duplicates,
+        format_bytes(report.reclaimed_bytes),
+        "reclaimable" if args.dry_run else "reclaimed",
+    )
+    return 0
+
+
+def _run_verify(args: argparse.Namespace) -> int:
+    from .metacache import MetadataCache
+    from .verify import MANIFEST_NAME, Manifest, verify_tree, write_redownload_list
+
+    if not args.output_dir.is_dir():
+        logging.error("Not a directory: %s", args.output_dir)
+        return 1
+    manifest = Manifest(args.manifest or args.output_dir / MANIFEST_NAME)
+    cache = MetadataCache(args.metadata_cache) if args.metadata_cache else None
+    try:
+        report = verify_tree(
+            args.output_dir,
+            manifest=manifest,
+            cache=cache,
+            workers=args.workers,
+            full=args.full,
+            checksum=not args.no_checksum,
+        )
+    except RuntimeError as exc:
+        logging.error("%s", exc)
+        return 1
+    finally:
+        manifest.close()
+        if cache is not None:
+            cache.close()
+
+    bad = report.bad
+    logging.info(
+        "Verified %d file(s), skipped %d unchanged, %d bad",
+        len(report.checked),
+        report.skipped,
+        len(bad),
+    )
+    if args.redownload:
+        count = write_redownload_list(report, args.redownload)
+        logging.info("Wrote %d URL(s) to re-download to %s", count, args.redownload)
+    keys = [check.archive_key for check in bad if check.archive_key]
+    if args.archive and keys:
+        with DownloadArchive(args.archive) as archive:
+            logging.info("Removed %d bad video(s) from the archive", archive.discard(keys))
+    return 1 if bad else 0
+
+
+def _run_enqueue(args: argparse.Namespace) -> int:
+    argv = [arg for arg in args.job if arg != "--"]
+    if not argv or argv[0] not in JOB_COMMANDS:
+        logging.error("Queue a youtube or scrape command, e.g. enqueue youtube --url URL.")
+        return 1
+    if any(arg == "--password" or arg.startswith("--password=") for arg in argv):
+        # The queue is a plain SQLite file; credentials belong in the keyring.
+        logging.error("Store the password with scrape --remember first; jobs must not carry it.")
+        return 1
+    try:
+        build_parser().parse_args(argv)
+    except SystemExit:
+        return 1
+    if argv[0] == "youtube" and "--archive" not in argv:
+        # Finished videos are recorded, so a retried job resumes instead of starting over.
+        argv += ["--archive", str(default_archive_path())]
+
+    queue = jobs.JobQueue(args.queue)
+    try:
+        job_id = queue.enqueue(argv, max_attempts=args.max_attempts)
+    finally:
+        queue.close()
+    logging.info("Queued job %d: %s", job_id, " ".join(argv))
+    print(job_id)
+    return 0
+
+
+def _run_worker(args: argparse.Namespace) -> int:
+    queue = jobs.JobQueue(args.queue)
+    try:
+        jobs.run_worker(
+            queue,
+            concurrency=args.concurrency,
+            poll_interval=args.poll_interval,
+            exit_when_idle=args.once,
+            backoff=args.backoff,
+        )
+    finally:
+        queue.close()
+    return 0
+
+
+def _run_scrape_farm(args: argparse.Namespace) -> int:
+    from . import farm, scraper
+
+    try:
+        jobs = farm.load_manifest(args.manifest)
+    except (OSError, ValueError) as exc:
+        logging.error("Cannot read manifest: %s", exc)
+        return 1
+    # Workers never touch the credential store; look every alias up once, here.
+    missing = [job for job in jobs if not (job.username and job.password)]
+    aliases = {job.id: job.credential_alias or scraper.hostname_alias(job.url) for job in missing}
+    stored = scraper.CredentialStore().get_many(set(aliases.values())) if missing else {}
+    for job in missing:
+        credentials = stored.get(aliases[job.id])
+        if credentials is None:
+            logging.error("No credentials for job %s; store them with scrape --remember.", job.id)
+            return 1
+        job.username, job.password = credentials
+
+    options = farm.FarmOptions(
+        headless=args.headless,
+        block_resources=args.block_resources,
+        driver_path=str(args.chromedriver) if args.chromedriver else None,
+        wait_timeout=args.wait_timeout,
+        segment_workers=args.segment_workers,
+        memory_mb=args.memory_mb,
+    )
+    output = args.jsonl.open("a", encoding="utf-8") if args.jsonl else sys.stdout
+    failed = 0
+    try:
+        for result in farm.run_farm(
+            jobs,
+            workers=args.workers,
+            options=options,
+            job_timeout=args.job_timeout,
+            retries=args.retries,
+        ):
+            if not result.ok:
+                failed += 1
+                logging.warning("Job %s failed: %s", result.job_id, result.error)
+            output.write(json.dumps(result.to_json()) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    logging.info("Scrape farm finished: %d ok, %d failed", len(jobs) - failed, failed)
+    return 1 if failed else 0
+
+
+def _run_plan(args: argparse.Namespace) -> int:
+    from . import plan
+    from .metacache import MetadataCache, default_cache_path
+    from .metrics import DownloadMetrics
+    from .waits import StepTimings, default_timings_path
+
+    try:
+        settings, job_list = plan.load_jobfile(args.jobfile)
+    except (OSError, ValueError) as exc:
+        logging.error("Cannot read job file: %s", exc)
+        return 1
+    archive_path = settings.get("archive")
+    archive = DownloadArchive(Path(archive_path).expanduser()) if archive_path else None
+    cache_path = settings.get("metadata_cache")
+    if cache_path is True:
+        cache_path = default_cache_path()
+    cache = MetadataCache(Path(cache_path).expanduser()) if cache_path else None
+    try:
+        job_plan = plan.build_plan(
+            settings,
+            job_list,
+            workers=args.workers,
+            cache=cache,
+            archive=archive,
+            timings=StepTimings(default_timings_path()),
+        )
+        print(job_plan.format())
+        if args.dry_run:
+            return 0
+        metrics = DownloadMetrics()
+        try:
+            results = plan.run_plan(job_plan, archive=archive, cache=cache, metrics=metrics)
+        finally:
+            metrics.close()
+    finally:
+        if cache is not None:
+            cache.close()
+        if archive is not None:
+            archive.close()
+    failed = [result for result in results if not result.ok]
+    logging.info("Job file finished: %d ok, %d failed", len(results) - len(failed), len(failed))
+    return 1 if failed else 0
+
+
+def _run_doctor(args: argparse.Namespace) -> int:
+    from . import chromedriver, scraper
+
+    started = time.perf_counter()
+    try:
+        info = scraper.resolve_chromedriver(args.chromedriver, refresh=args.refresh)
+    except RuntimeError as exc:
+        logging.error("%s", exc)
+        return 1
+    rows = chromedriver.describe(info)
+    rows.append(("Resolved in", f"{time.perf_counter() - started:.3f} s"))
+    if args.launch:
+        started = time.perf_counter()
+        try:
+            driver = scraper.create_driver(headless=True, driver_path=info.driver)
+        except Exception as exc:  # pragma: no cover - depends on the local Chrome install
+            logging.error("Chrome failed to start: %s", exc)
+            return 1
+        driver.quit()
+        rows.append(("Chrome launch", f"{time.perf_counter() - started:.3f} s"))
+    width = max(len(label) for label, _ in rows)
+    for label, value in rows:
+        print(f"{label + ':':<{width + 1}}  {value}")
+    return 0
+
+
+def _run_status(args: argparse.Namespace) -> int:
+    queue = jobs.JobQueue(args.queue)
+    try:
+        if args.retry_failed:
+            logging.info("Requeued %d failed job(s)", queue.requeue_failed())
+        counts = queue.counts()
+        print("  ".join(f"{state}={count}" for state, count in counts.items()))
+        for job in queue.jobs(args.state, limit=args.limit):
+            detail = job.last_error or job.checkpoint.get("last_output", "")
+            print(
+                f"{job.id:>5}  {job.state:<8} {job.attempts}/{job.max_attempts}  "
+                f"{' '.join(job.argv)}" + (f"  [{detail}]" if detail else "")
+            )
+    finally:
+        queue.close()
+    return 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
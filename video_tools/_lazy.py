@@ -0,0 +1,17 @@
+"""Deferred imports for the heavy optional backends (yt-dlp, Selenium, keyring)."""
+
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+
+
+def load(name: str, package: str) -> ModuleType:
+    """Import ``name`` on first use, raising a friendly error if it is not installed."""
+
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        raise RuntimeError(
+            f"{package} is not installed. Install video-tools with its default dependencies."
+        ) from None
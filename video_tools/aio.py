@@ -0,0 +1,348 @@
+"""Asyncio API: queued channel downloads and portal scrapes with progress and cancellation."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import logging
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Set
+
+# Progress events kept per job for a slow (or absent) reader; older ones are dropped.
+PROGRESS_BACKLOG = 256
+
+
+class _Stopped(Exception):
+    """Raised inside a worker thread to unwind a job that was cancelled."""
+
+
+@dataclass
+class Progress:
+    """A job event; transfer fields are set for ``downloading`` and ``finished``.
+
+    ``status`` is one of ``queued``, ``started``, ``downloading``, ``finished``
+    (one file), ``done``, ``error`` or ``cancelled``.
+    """
+
+    status: str
+    filename: str | None = None
+    downloaded_bytes: int | None = None
+    total_bytes: int | None = None
+    speed: float | None = None
+    eta: float | None = None
+    message: str | None = None
+
+
+class Job:
+    """A queued download or scrape: await it, iterate its progress, or cancel it."""
+
+    def __init__(self, kind: str, name: str) -> None:
+        self.kind = kind
+        self.name = name
+        self.stop = threading.Event()
+        self._loop = asyncio.get_running_loop()
+        self._events: asyncio.Queue[Progress | None] = asyncio.Queue(PROGRESS_BACKLOG)
+        self._task: asyncio.Task | None = None
+        self._thread: int | None = None
+
+    def __await__(self):
+        return self._task.__await__()
+
+    def __aiter__(self) -> AsyncIterator[Progress]:
+        return self._progress()
+
+    async def _progress(self) -> AsyncIterator[Progress]:
+        while True:
+            event = await self._events.get()
+            if event is None:
+                return
+            yield event
+
+    def cancel(self) -> bool:
+        """Request cancellation; await the job to know when its cleanup has finished."""
+
+        return self._task.cancel()
+
+    def done(self) -> bool:
+        return self._task.done()
+
+    def emit(self, event: Progress | None) -> None:
+        """Queue a progress event; safe to call from worker threads."""
+
+        with contextlib.suppress(RuntimeError):  # loop already closed
+            self._loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: Progress | None) -> None:
+        if self._events.full():
+            self._events.get_nowait()
+        self._events.put_nowait(event)
+
+    def _start(self, body: Awaitable[Any]) -> None:
+        async def run() -> Any:
+            try:
+                result = await body
+            except asyncio.CancelledError:
+                self.emit(Progress("cancelled"))
+                raise
+            except Exception as exc:
+                self.emit(Progress("error", message=f"{type(exc).__name__}: {exc}"))
+                raise
+            else:
+                self.emit(Progress("done"))
+                return result
+            finally:
+                self.emit(None)
+
+        self.emit(Progress("queued"))
+        self._task = asyncio.ensure_future(run())
+
+
+class _YtDlpProgress:
+    """Progress hook forwarding yt-dlp events to a job and stopping it on cancellation."""
+
+    def __init__(self, job: Job) -> None:
+        self.job = job
+        self.partial: Set[str] = set()
+
+    def __call__(self, status: Dict[str, Any]) -> None:
+        state = status.get("status")
+        partial = status.get("tmpfilename")
+        if state == "downloading" and partial:
+            self.partial.add(partial)
+        elif state == "finished" and partial:
+            self.partial.discard(partial)
+        if self.job.stop.is_set():
+            raise _Stopped(f"{self.job.name} was cancelled")
+        if state in ("downloading", "finished"):
+            self.job.emit(
+                Progress(
+                    state,
+                    filename=status.get("filename"),
+                    downloaded_bytes=status.get("downloaded_bytes"),
+                    total_bytes=status.get("total_bytes") or status.get("total_bytes_estimate"),
+                    speed=status.get("speed"),
+                    eta=status.get("eta"),
+                )
+            )
+
+    def cleanup(self) -> None:
+        for name in self.partial:
+            for path in (Path(name), Path(f"{name}.ytdl")):
+                path.unlink(missing_ok=True)
+
+
+def _remove_partial(output_file: Path) -> None:
+    for suffix in ("", ".part", ".part.json"):
+        output_file.with_name(output_file.name + suffix).unlink(missing_ok=True)
+    shutil.rmtree(output_file.with_name(output_file.name + ".segments"), ignore_errors=True)
+
+
+class VideoTools:
+    """Asyncio front end for channel downloads and portal scrapes.
+
+    :meth:`download_channel` and :meth:`scrape_portal` take the keyword
+    arguments of their blocking counterparts and return a :class:`Job`. Any
+    number of jobs may be queued; at most ``downloads`` transfers and
+    ``browsers`` scrapes run at once, each on a thread of its own executor.
+    Browsers are pooled and kept warm between scrapes. Cancelling a job stops
+    yt-dlp at its next progress tick, quits the job's browser, interrupts
+    native segment/range fetches, or kills FFmpeg, then deletes its partial
+    files before the cancellation completes::
+
+        async with VideoTools(downloads=4) as tools:
+            job = tools.download_channel(url, output_dir=Path("downloads"))
+            async for event in job:
+                print(event.status, event.downloaded_bytes)
+            await job
+    """
+
+    def __init__(
+        self,
+        *,
+        downloads: int = 4,
+        browsers: int = 2,
+        headless: bool = True,
+        block_resources: bool = True,
+        driver_path: Path | str | None = None,
+    ) -> None:
+        self._download_slots = asyncio.Semaphore(downloads)
+        self._browser_slots = asyncio.Semaphore(browsers)
+        self._downloads = ThreadPoolExecutor(downloads, thread_name_prefix="video-tools-download")
+        self._browsers = ThreadPoolExecutor(browsers, thread_name_prefix="video-tools-browser")
+        self._browser_options = dict(
+            headless=headless,
+            size=browsers,
+            block_resources=block_resources,
+            driver_path=driver_path,
+        )
+        self._pool: Any = None
+        self._pool_lock = threading.Lock()
+        self._jobs: Set[Job] = set()
+
+    async def __aenter__(self) -> VideoTools:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Cancel unfinished jobs, wait for their cleanup and release threads and browsers."""
+
+        jobs = list(self._jobs)
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*(job._task for job in jobs), return_exceptions=True)
+        self._downloads.shutdown()
+        self._browsers.shutdown()
+        if self._pool is not None:
+            self._pool.close()
+
+    def _submit(self, job: Job, body: Awaitable[Any]) -> Job:
+        job._start(body)
+        self._jobs.add(job)
+        job._task.add_done_callback(lambda _: self._jobs.discard(job))
+        return job
+
+    async def _in_thread(
+        self,
+        job: Job,
+        executor: ThreadPoolExecutor,
+        function: Callable[[], Any],
+        abort: Callable[[], None] = lambda: None,
+    ) -> Any:
+        def run() -> Any:
+            job._thread = threading.get_ident()
+            return function()
+
+        future = asyncio.get_running_loop().run_in_executor(executor, run)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            job.stop.set()
+            abort()
+            # The slot stays taken until the thread has really stopped.
+            with contextlib.suppress(Exception):
+                await future
+            raise
+
+    def download_channel(self, url: str, **options: Any) -> Job:
+        """Queue :func:`~video_tools.youtube.download_channel` (same keyword arguments)."""
+
+        from . import youtube
+
+        job = Job("youtube", url)
+        hook = _YtDlpProgress(job)
+        download = functools.partial(
+            youtube.download_channel,
+            url,
+            progress_hooks=[*options.pop("progress_hooks", ()), hook],
+            **options,
+        )
+
+        async def body() -> None:
+            async with self._download_slots:
+                job.emit(Progress("started"))
+                try:
+                    await self._in_thread(job, self._downloads, download)
+                except asyncio.CancelledError:
+                    hook.cleanup()
+                    raise
+
+        return self._submit(job, body())
+
+    def scrape_portal(self, **options: Any) -> Job:
+        """Queue :func:`~video_tools.scraper.scrape_portal`; the job's result is the video URL.
+
+        Takes the same keyword arguments. With ``download=True`` the browser is
+        handed back before the file is fetched, so downloads do not hold one.
+        """
+
+        from . import scraper
+
+        download = options.pop("download", False)
+        output_file = Path(options.pop("output_file", None) or "video.mp4")
+        segment_workers = options.pop("segment_workers", 8)
+        job = Job("scrape", options["url"])
+
+        options.setdefault("headless", self._browser_options["headless"])
+
+        def scrape() -> str:
+            if options.get("engine", "browser") == "browser":
+                options["pool"] = self._browser_pool()
+            return scraper.scrape_portal(download=False, output_file=output_file, **options)
+
+        def abort() -> None:
+            if self._pool is not None and job._thread is not None:
+                self._pool.kill(job._thread)
+
+        async def body() -> str:
+            async with self._browser_slots:
+                job.emit(Progress("started"))
+                video_url = await self._in_thread(job, self._browsers, scrape, abort)
+            if download:
+                await self._download_video(job, video_url, output_file, segment_workers)
+            return video_url
+
+        return self._submit(job, body())
+
+    def download_video(self, video_url: str, output_file: Path, *, segment_workers: int = 8) -> Job:
+        """Queue a download of a scraped URL, as ``scrape --download`` fetches it."""
+
+        job = Job("download", video_url)
+        return self._submit(job, self._download_video(job, video_url, output_file, segment_workers))
+
+    async def _download_video(
+        self, job: Job, video_url: str, output_file: Path, segment_workers: int
+    ) -> None:
+        from . import scraper
+        from .net import Session
+
+        async with self._download_slots:
+            job.emit(Progress("downloading", filename=str(output_file)))
+            try:
+                fetched = False
+                if segment_workers > 1:
+                    with Session() as session:
+                        native = functools.partial(
+                            scraper.download_native,
+                            video_url,
+                            output_file,
+                            workers=segment_workers,
+                            session=session,
+                        )
+                        fetched = await self._in_thread(
+                            job, self._downloads, native, session.cancel
+                        )
+                if not fetched:
+                    await self._ffmpeg(scraper.ffmpeg_command(video_url, output_file))
+            except asyncio.CancelledError:
+                _remove_partial(output_file)  # errors keep them, so a retry can resume
+                raise
+        job.emit(Progress("finished", filename=str(output_file)))
+
+    @staticmethod
+    async def _ffmpeg(command: list) -> None:
+        logging.info("Running FFmpeg command: %s", " ".join(command))
+        process = await asyncio.create_subprocess_exec(*command, stdin=subprocess.DEVNULL)
+        try:
+            returncode = await process.wait()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, command)
+
+    def _browser_pool(self) -> Any:
+        from . import scraper
+
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = scraper.driver_pool(**self._browser_options)
+            return self._pool
@@ -0,0 +1,179 @@
+"""SQLite-backed download archive usable as yt-dlp's ``download_archive``."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+
+def default_archive_path() -> Path:
+    return Path.home() / ".video_tools" / "archive.sqlite3"
+
+
+def make_key(extractor: str, video_id: str) -> str:
+    """Return the ``"<extractor> <id>"`` key yt-dlp uses for archive entries."""
+
+    return f"{extractor.lower()} {video_id}"
+
+
+@dataclass
+class HighWaterMark:
+    """Newest upload seen by the last successful sync of a channel."""
+
+    video_id: str
+    upload_date: str | None = None
+
+
+@dataclass
+class ChannelSync:
+    url: str
+    mark: HighWaterMark | None
+    synced_at: float | None
+    last_elapsed: float | None
+    last_full_elapsed: float | None
+
+
+class DownloadArchive:
+    """Indexed archive of downloaded videos keyed by extractor + video id.
+
+    yt-dlp accepts any object with ``__contains__`` and ``add`` as
+    ``download_archive``, and consults it before extracting playlist entries,
+    so known videos are skipped without re-probing. Lookups hit the primary
+    key index instead of a preloaded text file, which keeps them fast at
+    millions of entries and avoids loading the whole archive per run.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or default_archive_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS videos ("
+            " key TEXT PRIMARY KEY,"
+            " added_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS channels ("
+            " url TEXT PRIMARY KEY,"
+            " video_id TEXT,"
+            " upload_date TEXT,"
+            " synced_at REAL,"
+            " last_elapsed REAL,"
+            " last_full_elapsed REAL"
+            ")"
+        )
+        self._conn.commit()
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM videos WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def __bool__(self) -> bool:
+        # yt-dlp skips lookups when the archive is falsy; never count rows for that.
+        return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+
+    def add(self, key: str) -> None:
+        self.add_many([key])
+
+    def add_many(self, keys: Iterable[str]) -> int:
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO videos (key, added_at) VALUES (?, ?)",
+                ((key, now) for key in keys),
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def discard(self, keys: Iterable[str]) -> int:
+        """Forget ``keys`` so the next sync downloads them again; returns entries removed."""
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany("DELETE FROM videos WHERE key = ?", ((key,) for key in keys))
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def import_text(self, path: Path) -> int:
+        """Merge a yt-dlp ``--download-archive`` text file; returns new entries."""
+
+        with path.open(encoding="utf-8") as handle:
+            added = self.add_many(line.strip() for line in handle if line.strip())
+        logging.info("Imported %d archive entries from %s", added, path)
+        return added
+
+    def export_text(self, path: Path) -> None:
+        with self._lock:
+            rows = self._conn.execute("SELECT key FROM videos ORDER BY added_at").fetchall()
+        path.write_text("".join(f"{key}\n" for (key,) in rows), encoding="utf-8")
+
+    def channel_state(self, url: str) -> ChannelSync | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT video_id, upload_date, synced_at, last_elapsed, last_full_elapsed"
+                " FROM channels WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        video_id, upload_date, synced_at, last_elapsed, last_full_elapsed = row
+        mark = HighWaterMark(video_id, upload_date) if video_id else None
+        return ChannelSync(url, mark, synced_at, last_elapsed, last_full_elapsed)
+
+    def record_sync(
+        self, url: str, mark: HighWaterMark | None, *, elapsed: float, full_scan: bool
+    ) -> None:
+        """Store the new high-water mark and timing for ``url``.
+
+        A ``None`` mark (nothing new was seen) keeps the previous one.
+        """
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO channels"
+                " (url, video_id, upload_date, synced_at, last_elapsed, last_full_elapsed)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(url) DO UPDATE SET"
+                " video_id = COALESCE(excluded.video_id, video_id),"
+                " upload_date = CASE WHEN excluded.video_id IS NULL THEN upload_date"
+                " ELSE excluded.upload_date END,"
+                " synced_at = excluded.synced_at,"
+                " last_elapsed = excluded.last_elapsed,"
+                " last_full_elapsed = COALESCE(excluded.last_full_elapsed, last_full_elapsed)",
+                (
+                    url,
+                    mark.video_id if mark else None,
+                    mark.upload_date if mark else None,
+                    time.time(),
+                    elapsed,
+                    elapsed if full_scan else None,
+                ),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> DownloadArchive:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
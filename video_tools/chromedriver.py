@@ -0,0 +1,152 @@
+"""ChromeDriver resolution cached against the installed Chrome build, with pinning."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+# Pin a local driver binary without passing --chromedriver on every run.
+ENV_DRIVER = "VIDEO_TOOLS_CHROMEDRIVER"
+# Chrome binary to key the cache on when it is not on PATH.
+ENV_CHROME = "VIDEO_TOOLS_CHROME"
+CHROME_NAMES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+CHROME_PATHS = (
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    "/Applications/Chromium.app/Contents/MacOS/Chromium",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+)
+_VERSION = re.compile(r"(\d+\.\d+\.\d+(?:\.\d+)?)")
+
+# One resolution at a time per process; pools launch several drivers concurrently.
+_resolve_lock = threading.Lock()
+
+
+def default_cache_path() -> Path:
+    return Path.home() / ".video_tools" / "chromedriver.json"
+
+
+@dataclass
+class DriverInfo:
+    driver: Path
+    chrome: Path | None
+    chrome_version: str | None
+    source: str  # "pinned", "cache", "resolved" or "stale-cache"
+
+
+def find_chrome() -> Path | None:
+    configured = os.environ.get(ENV_CHROME)
+    if configured:
+        return Path(configured)
+    for name in CHROME_NAMES:
+        found = shutil.which(name)
+        if found:
+            return Path(found)
+    return next((Path(path) for path in CHROME_PATHS if os.path.exists(path)), None)
+
+
+def chrome_version(binary: Path) -> str | None:
+    try:
+        result = subprocess.run(
+            [str(binary), "--version"], capture_output=True, text=True, timeout=15, check=False
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        logging.debug("Could not run %s --version: %s", binary, exc)
+        return None
+    match = _VERSION.search(result.stdout)
+    return match.group(1) if match else None
+
+
+def _signature(binary: Path | None) -> List[Any] | None:
+    # Upgrades replace the real binary behind wrapper symlinks, changing its mtime/size.
+    if binary is None:
+        return None
+    try:
+        real = os.path.realpath(binary)
+        stat = os.stat(real)
+    except OSError:
+        return None
+    return [real, stat.st_mtime_ns, stat.st_size]
+
+
+def _executable(path: Path) -> bool:
+    return path.is_file() and os.access(path, os.X_OK)
+
+
+class DriverResolver:
+    """Return a ChromeDriver path, calling ``install`` only when Chrome changed.
+
+    ``install`` is the slow resolver (webdriver-manager's version check and
+    download). Its result is stored in ``cache_path`` together with the Chrome
+    binary's identity, so later launches only stat two files. When ``install``
+    fails (offline), a previously resolved driver is reused with a warning.
+    """
+
+    def __init__(self, install: Callable[[], str], cache_path: Path | None = None) -> None:
+        self.install = install
+        self.cache_path = cache_path or default_cache_path()
+
+    def resolve(self, pinned: Path | str | None = None, *, refresh: bool = False) -> DriverInfo:
+        pinned = pinned or os.environ.get(ENV_DRIVER)
+        if pinned:
+            path = Path(pinned).expanduser()
+            if not _executable(path):
+                raise RuntimeError(f"Pinned ChromeDriver {path} is missing or not executable.")
+            return DriverInfo(path, None, None, "pinned")
+
+        with _resolve_lock:
+            chrome = find_chrome()
+            signature = _signature(chrome)
+            cached = self._load()
+            cached_driver = Path(cached["driver"]) if cached.get("driver") else None
+            usable = cached_driver is not None and _executable(cached_driver)
+            if not refresh and usable and signature and cached.get("chrome") == signature:
+                return DriverInfo(cached_driver, chrome, cached.get("chrome_version"), "cache")
+
+            version = chrome_version(chrome) if chrome else None
+            try:
+                driver = Path(self.install())
+            except Exception as exc:
+                if usable:
+                    logging.warning(
+                        "ChromeDriver check failed (%s); reusing %s resolved for Chrome %s",
+                        exc,
+                        cached_driver,
+                        cached.get("chrome_version") or "unknown",
+                    )
+                    return DriverInfo(cached_driver, chrome, version, "stale-cache")
+                raise RuntimeError(
+                    f"Could not resolve ChromeDriver: {exc}. Pin a local binary with "
+                    f"--chromedriver or {ENV_DRIVER}."
+                ) from exc
+            self._save({"chrome": signature, "chrome_version": version, "driver": str(driver)})
+            return DriverInfo(driver, chrome, version, "resolved")
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data: Dict[str, Any]) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+        temp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(temp, self.cache_path)
+
+
+def describe(info: DriverInfo) -> List[Tuple[str, str]]:
+    """Rows for ``doctor`` output."""
+
+    chrome = str(info.chrome) if info.chrome else "not found"
+    if info.chrome_version:
+        chrome += f" ({info.chrome_version})"
+    return [("Chrome", chrome), ("ChromeDriver", f"{info.driver} ({info.source})")]
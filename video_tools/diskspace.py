@@ -0,0 +1,226 @@
+"""Disk-space admission for downloads, and moving finished files off a scratch volume."""
+
+from __future__ import annotations
+
+import errno
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+from .metrics import format_bytes
+
+# Free space kept on every volume on top of the reservations.
+HEADROOM = 1024**3
+# A merged download holds the video and audio streams and the merged file at once.
+MERGE_FACTOR = 2.0
+# Bytes/s assumed for formats reporting neither a size nor a bitrate (~4 Mbit/s).
+FALLBACK_BITRATE = 500_000
+POLL_INTERVAL = 5.0
+# linux/fs.h: clone a file's extents (reflink) on btrfs, XFS, bcachefs...
+FICLONE = 0x40049409
+
+# Key on yt-dlp info dicts; the ``__`` prefix keeps it out of info JSON and the cache.
+_RESERVATION = "__video_tools_reservation"
+
+
+class InsufficientSpace(RuntimeError):
+    """A download does not fit on its volume even with nothing else in flight."""
+
+
+def estimate_bytes(info: Dict[str, Any]) -> int:
+    """Expected final size of a yt-dlp download from its selected format(s)."""
+
+    formats = info.get("requested_formats") or [info]
+    duration = info.get("duration") or 0
+    total = 0.0
+    for fmt in formats:
+        size = fmt.get("filesize") or fmt.get("filesize_approx")
+        if not size:
+            rate = fmt["tbr"] * 125 if fmt.get("tbr") else FALLBACK_BITRATE / len(formats)
+            size = rate * duration
+        total += size
+    return int(total)
+
+
+def _existing(path: Path) -> Path:
+    path = Path(path).absolute()
+    while not path.exists() and path.parent != path:
+        path = path.parent
+    return path
+
+
+class Reservation:
+    def __init__(self, budget: DiskBudget, needs: Dict[int, int], label: str) -> None:
+        self.budget = budget
+        self.needs = needs
+        self.label = label
+        self.released = False
+
+    def release(self) -> None:
+        """Give the bytes back; safe to call more than once."""
+
+        self.budget._release(self)
+
+
+class DiskBudget:
+    """Reserve estimated bytes per volume before a download starts.
+
+    Reservations are subtracted from the free space the filesystem reports, so
+    concurrent downloads cannot overcommit a volume between them. A download
+    that does not fit waits for others on the same volume to finish. If none
+    are in flight, waiting cannot help and :class:`InsufficientSpace` is raised.
+    """
+
+    def __init__(
+        self,
+        *,
+        headroom: int = HEADROOM,
+        poll: float = POLL_INTERVAL,
+        usage: Callable[[Path], Any] = shutil.disk_usage,
+    ) -> None:
+        self.headroom = headroom
+        self.poll = poll
+        self._usage = usage
+        self._reserved: Dict[int, int] = {}
+        self._cond = threading.Condition()
+
+    def available(self, path: Path) -> int:
+        """Bytes still free for new downloads on ``path``'s volume."""
+
+        path = _existing(path)
+        with self._cond:
+            return self._available(path, path.stat().st_dev)
+
+    def _available(self, path: Path, device: int) -> int:
+        return self._usage(path).free - self._reserved.get(device, 0) - self.headroom
+
+    def reserve(self, needs: Dict[Path, float], *, label: str = "download") -> Reservation:
+        """Reserve ``needs`` (bytes per directory) at once, waiting while they do not fit."""
+
+        volumes: Dict[int, Tuple[Path, int]] = {}
+        for path, size in needs.items():
+            path = _existing(path)
+            device = path.stat().st_dev
+            volumes[device] = (path, volumes.get(device, (path, 0))[1] + int(size))
+        deferred = False
+        with self._cond:
+            while True:
+                short = [
+                    (device, path, size - self._available(path, device))
+                    for device, (path, size) in volumes.items()
+                    if size > self._available(path, device)
+                ]
+                if not short:
+                    break
+                device, path, missing = short[0]
+                if not any(self._reserved.get(device) for device, _, _ in short):
+                    raise InsufficientSpace(
+                        f"{label} needs {format_bytes(missing)} more than is free on {path} "
+                        f"(keeping {format_bytes(self.headroom)} free)"
+                    )
+                if not deferred:
+                    logging.warning(
+                        "Deferring %s until %s more is free on %s",
+                        label,
+                        format_bytes(missing),
+                        path,
+                    )
+                    deferred = True
+                self._cond.wait(self.poll)
+            for device, (_, size) in volumes.items():
+                self._reserved[device] = self._reserved.get(device, 0) + size
+        return Reservation(self, {device: size for device, (_, size) in volumes.items()}, label)
+
+    def _release(self, reservation: Reservation) -> None:
+        with self._cond:
+            if reservation.released:
+                return
+            reservation.released = True
+            for device, size in reservation.needs.items():
+                left = self._reserved.get(device, 0) - size
+                if left > 0:
+                    self._reserved[device] = left
+                else:
+                    self._reserved.pop(device, None)
+            self._cond.notify_all()
+
+    def attach(self, ydl: Any, *, output_dir: Path, scratch_dir: Path | None = None) -> None:
+        """Admit each video ``ydl`` downloads against this budget first.
+
+        Temporary files (streams and the merged copy) are charged to
+        ``scratch_dir`` when given, the final file to ``output_dir``. The bytes
+        stay reserved until post-processing has moved the file into place, also
+        when a :class:`~video_tools.pipeline.PostProcessPipeline` does that
+        later, so attach before the pipeline.
+        """
+
+        process_info, post_process = ydl.process_info, ydl.post_process
+
+        def admitted_process_info(info: Dict[str, Any]) -> Any:
+            size = estimate_bytes(info)
+            work = size * MERGE_FACTOR if info.get("requested_formats") else size
+            if scratch_dir is None:
+                needs = {output_dir: work}
+            else:
+                needs = {scratch_dir: work, output_dir: size}
+            reservation = self.reserve(needs, label=str(info.get("id") or "download"))
+            info[_RESERVATION] = reservation
+            try:
+                return process_info(info)
+            finally:
+                # Once handed to post-processing, the reservation is released there.
+                if info.get("__write_download_archive") is not True:
+                    reservation.release()
+
+        def releasing_post_process(filename: str, info: Dict[str, Any], files_to_move=None):
+            try:
+                return post_process(filename, info, files_to_move)
+            finally:
+                reservation = info.pop(_RESERVATION, None)
+                if reservation is not None:
+                    reservation.release()
+
+        ydl.process_info, ydl.post_process = admitted_process_info, releasing_post_process
+
+
+def move_file(source: Path, target: Path) -> None:
+    """Move ``source`` to ``target``, renaming when both are on one filesystem.
+
+    Otherwise the file is cloned (copy-on-write, e.g. between btrfs subvolumes)
+    or copied next to ``target`` and renamed into place, so ``target`` never
+    appears half-written.
+    """
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(source, target)
+        return
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+    temp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        if not _clone(source, temp):
+            shutil.copyfile(source, temp)
+        shutil.copystat(source, temp)
+        os.replace(temp, target)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    source.unlink()
+
+
+def _clone(source: Path, target: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - Windows
+        return False
+    with source.open("rb") as src, target.open("wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            return False
+    return True
@@ -0,0 +1,402 @@
+"""Scrape farm: run a manifest of portal jobs across isolated browser worker processes."""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import shutil
+import signal
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+# Budget per worker: one Chrome with a few tabs' worth of renderer memory.
+MEMORY_PER_WORKER_MB = 1024
+WATCHDOG_INTERVAL = 2.0
+
+
+@dataclass
+class FarmJob:
+    """One manifest line; keys mirror the ``scrape`` options."""
+
+    url: str
+    video_selector: str
+    id: str = ""
+    username: str | None = None
+    password: str | None = field(default=None, repr=False)
+    username_field: str = "Email"
+    password_field: str = "Password"
+    navigation: List[str] = field(default_factory=list)
+    video_attribute: str = "href"
+    credential_alias: str | None = None
+    engine: str = "browser"
+    download: bool = False
+    output_file: str | None = None
+
+
+@dataclass
+class FarmResult:
+    job_id: str
+    url: str
+    video_url: str | None = None
+    error: str | None = None
+    attempts: int = 1
+    worker: int = -1
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_json(self) -> Dict[str, Any]:
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass
+class FarmOptions:
+    headless: bool = True
+    block_resources: bool = True
+    driver_path: str | None = None
+    wait_timeout: int = 15
+    segment_workers: int = 8
+    memory_mb: int = MEMORY_PER_WORKER_MB
+
+
+def load_manifest(path: Path) -> List[FarmJob]:
+    """Read JSON Lines jobs; blank lines and ``#`` comments are skipped."""
+
+    known = {item.name for item in fields(FarmJob)}
+    jobs: List[FarmJob] = []
+    for number, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            raw = json.loads(line)
+        except ValueError as exc:
+            raise ValueError(f"{path}:{number}: invalid JSON ({exc})") from None
+        unknown = set(raw) - known
+        if unknown:
+            raise ValueError(f"{path}:{number}: unknown key(s) {', '.join(sorted(unknown))}")
+        try:
+            job = FarmJob(**raw)
+        except TypeError as exc:
+            raise ValueError(f"{path}:{number}: {exc}") from None
+        job.id = job.id or str(number)
+        jobs.append(job)
+    return jobs
+
+
+def _available_memory_mb() -> int | None:
+    try:
+        with open("/proc/meminfo", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_AVPHYS_PAGES") // 1024**2
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def auto_workers(memory_mb: int = MEMORY_PER_WORKER_MB) -> int:
+    """Workers that fit both the CPU count and the currently available RAM."""
+
+    cpus = os.cpu_count() or 1
+    available = _available_memory_mb()
+    by_memory = available // memory_mb if available is not None else cpus
+    return max(1, min(cpus, by_memory))
+
+
+def _children(pid: int) -> List[int]:
+    """All descendants of ``pid`` (Linux /proc; empty elsewhere)."""
+
+    parents: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return []
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="ascii", errors="replace") as handle:
+                stat = handle.read()
+        except OSError:
+            continue
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        parents.setdefault(ppid, []).append(int(entry))
+    found: List[int] = []
+    pending = [pid]
+    while pending:
+        for child in parents.get(pending.pop(), ()):
+            found.append(child)
+            pending.append(child)
+    return found
+
+
+def _rss_mb(pids: List[int]) -> float:
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/statm", encoding="ascii") as handle:
+                total += int(handle.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return total * os.sysconf("SC_PAGE_SIZE") / 1024**2
+
+
+def _memory_watchdog(budget_mb: int, stop: threading.Event) -> None:
+    # Kills the browser processes (not this worker) once they outgrow the budget; the
+    # running job then fails and the next job starts a fresh browser.
+    while not stop.wait(WATCHDOG_INTERVAL):
+        children = _children(os.getpid())
+        used = _rss_mb(children)
+        if used > budget_mb:
+            logging.warning("Browser uses %.0f MiB (budget %d MiB); killing it", used, budget_mb)
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except OSError:
+                    pass
+
+
+class WorkerContext:
+    """Per-process state handed to the job runner: one warm browser per worker."""
+
+    def __init__(self, index: int, profile: Path, options: FarmOptions) -> None:
+        self.index = index
+        self.profile = profile
+        self.options = options
+        self._pool: Any = None
+        self._alias: str | None = None
+
+    def pool(self, alias: str) -> Any:
+        """A one-browser pool for ``alias``; switching portals restarts the browser."""
+
+        from . import scraper
+
+        if self._pool is not None and self._alias != alias:
+            self._pool.close()
+            self._pool = None
+        if self._pool is None:
+            options = self.options
+            arguments = [
+                f"--user-data-dir={self.profile}",
+                f"--disk-cache-dir={self.profile / 'cache'}",
+                f"--js-flags=--max-old-space-size={max(options.memory_mb // 2, 128)}",
+            ]
+            self._pool = scraper.DriverPool(
+                lambda: scraper.create_driver(
+                    headless=options.headless,
+                    block_resources=options.block_resources,
+                    driver_path=options.driver_path,
+                    arguments=arguments,
+                ),
+                size=1,
+            )
+            self._alias = alias
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+
+
+def scrape_job(job: FarmJob, context: WorkerContext) -> str:
+    """Default runner: :func:`~video_tools.scraper.scrape_portal` in the worker's browser."""
+
+    from . import scraper
+
+    alias = job.credential_alias or scraper.hostname_alias(job.url)
+    output = Path(job.output_file) if job.output_file else Path(f"video_{job.id}.mp4")
+    return scraper.scrape_portal(
+        url=job.url,
+        username=job.username,
+        password=job.password,
+        username_field=job.username_field,
+        password_field=job.password_field,
+        navigation_steps=job.navigation,
+        video_selector=job.video_selector,
+        video_attribute=job.video_attribute,
+        download=job.download,
+        output_file=output,
+        headless=context.options.headless,
+        wait_timeout=context.options.wait_timeout,
+        segment_workers=context.options.segment_workers,
+        credential_alias=alias,
+        pool=context.pool(alias) if job.engine == "browser" else None,
+        engine=job.engine,
+        block_resources=context.options.block_resources,
+        driver_path=context.options.driver_path,
+    )
+
+
+def _worker(
+    index: int,
+    inbox: Any,
+    results: Any,
+    profile: str,
+    options: FarmOptions,
+    runner: Callable[[FarmJob, WorkerContext], str],
+) -> None:
+    if hasattr(os, "setsid"):
+        os.setsid()  # own process group, so the parent can kill Chrome with us
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s [worker {index}] %(message)s")
+    context = WorkerContext(index, Path(profile), options)
+    stop = threading.Event()
+    threading.Thread(target=_memory_watchdog, args=(options.memory_mb, stop), daemon=True).start()
+    try:
+        while True:
+            job = inbox.get()
+            if job is None:
+                return
+            try:
+                results.put((index, job.id, runner(job, context), None))
+            except Exception as exc:
+                results.put((index, job.id, None, f"{type(exc).__name__}: {exc}"))
+    finally:
+        stop.set()
+        context.close()
+
+
+@dataclass
+class _Slot:
+    index: int
+    process: Any
+    inbox: Any
+    profile: Path
+    job: FarmJob | None = None
+    started: float = 0.0
+
+
+def _kill(slot: _Slot) -> None:
+    process = slot.process
+    if process.is_alive():
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:  # pragma: no cover - Windows
+                process.kill()
+        except OSError:
+            process.kill()
+    process.join(5)
+
+
+def run_farm(
+    jobs: List[FarmJob],
+    *,
+    workers: int | None = None,
+    options: FarmOptions | None = None,
+    job_timeout: float = 300.0,
+    retries: int = 1,
+    runner: Callable[[FarmJob, WorkerContext], str] = scrape_job,
+) -> Iterator[FarmResult]:
+    """Run ``jobs`` across worker processes and yield results as they complete.
+
+    Each worker owns one Chrome with its own profile directory and a memory
+    budget of ``options.memory_mb``. A job that runs longer than
+    ``job_timeout`` seconds gets its worker (and its browser) killed and replaced.
+    The job is then retried up to ``retries`` times. ``workers`` defaults to
+    :func:`auto_workers`.
+    """
+
+    options = options or FarmOptions()
+    workers = max(1, min(workers or auto_workers(options.memory_mb), len(jobs) or 1))
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    root = Path(tempfile.mkdtemp(prefix="video-tools-farm-"))
+    pending = list(jobs)
+    attempts: Dict[str, int] = {}
+    slots: List[_Slot] = []
+    remaining = len(jobs)
+
+    def spawn(index: int) -> _Slot:
+        profile = root / f"worker-{index}-{int(time.monotonic() * 1000)}"
+        profile.mkdir()
+        inbox = ctx.Queue()
+        process = ctx.Process(
+            target=_worker,
+            args=(index, inbox, results, str(profile), options, runner),
+            daemon=True,
+        )
+        process.start()
+        return _Slot(index, process, inbox, profile)
+
+    def fail(slot: _Slot, reason: str) -> FarmResult | None:
+        job = slot.job
+        slot.job = None
+        _kill(slot)
+        shutil.rmtree(slot.profile, ignore_errors=True)
+        slots[slot.index] = spawn(slot.index)
+        if attempts[job.id] <= retries:
+            logging.warning("Job %s %s; retrying", job.id, reason)
+            pending.insert(0, job)
+            return None
+        return FarmResult(
+            job.id, job.url, error=reason, attempts=attempts[job.id], worker=slot.index
+        )
+
+    try:
+        slots.extend(spawn(index) for index in range(workers))
+        logging.info("Scrape farm: %d job(s) on %d worker(s)", len(jobs), workers)
+        while remaining:
+            for slot in slots:
+                if slot.job is None and pending:
+                    slot.job = pending.pop(0)
+                    slot.started = time.monotonic()
+                    attempts[slot.job.id] = attempts.get(slot.job.id, 0) + 1
+                    slot.inbox.put(slot.job)
+            try:
+                index, job_id, video_url, error = results.get(timeout=0.5)
+            except queue.Empty:
+                pass
+            else:
+                slot = slots[index]
+                if slot.job is not None and slot.job.id == job_id:
+                    job, slot.job = slot.job, None
+                    remaining -= 1
+                    yield FarmResult(
+                        job.id,
+                        job.url,
+                        video_url=video_url,
+                        error=error,
+                        attempts=attempts[job.id],
+                        worker=index,
+                        seconds=round(time.monotonic() - slot.started, 3),
+                    )
+            now = time.monotonic()
+            for slot in list(slots):
+                if slot.job is None:
+                    if not slot.process.is_alive():
+                        slots[slot.index] = spawn(slot.index)
+                    continue
+                if now - slot.started > job_timeout:
+                    result = fail(slot, f"timed out after {job_timeout:.0f}s")
+                elif not slot.process.is_alive():
+                    result = fail(slot, f"worker exited with code {slot.process.exitcode}")
+                else:
+                    continue
+                if result is not None:
+                    remaining -= 1
+                    yield result
+    finally:
+        idle = []
+        for slot in slots:
+            if slot.job is None and slot.process.is_alive():
+                slot.inbox.put(None)
+                idle.append(slot)
+            else:
+                _kill(slot)  # a busy worker would not read the sentinel until its job ends
+        for slot in idle:
+            slot.process.join(10)
+            _kill(slot)
+        shutil.rmtree(root, ignore_errors=True)
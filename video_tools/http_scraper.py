@@ -0,0 +1,386 @@
+"""Browser-free scraping engine for portals that render server-side.
+
+Mirrors the Selenium flow (open, log in, click navigation selectors, read an
+attribute) with :class:`net.Session` and a small ``html.parser`` DOM that
+understands the CSS/XPath subset used by ``selector_to_by`` selectors.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from html.parser import HTMLParser
+from http.cookiejar import CookieJar
+from typing import Callable, Dict, Iterator, List, Tuple
+from urllib.parse import urldefrag, urlencode, urljoin
+
+from .net import Session
+from .scraper import selector_to_by
+
+_VOID = frozenset("area base br col embed hr img input link meta param source track wbr".split())
+# Opening one of these implicitly closes the listed open elements (HTML optional end tags).
+_IMPLIED_END = {
+    "li": {"li"},
+    "tr": {"tr", "td", "th"},
+    "td": {"td", "th"},
+    "th": {"td", "th"},
+    "option": {"option"},
+    "p": {"p"},
+    "dt": {"dt", "dd"},
+    "dd": {"dt", "dd"},
+}
+# Properties Selenium's get_attribute() reports as absolute URLs.
+_URL_ATTRIBUTES = frozenset({"href", "src", "action", "poster"})
+
+
+class ElementNotFound(RuntimeError):
+    pass
+
+
+class Node:
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Node | None = None) -> None:
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children: List[Node] = []
+        self.text_parts: List[str] = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self.text_parts) + "".join(child.text for child in self.children)
+
+    def iter(self) -> Iterator[Node]:
+        yield self
+        for child in self.children:
+            yield from child.iter()
+
+    def ancestor(self, tag: str) -> Node | None:
+        node = self.parent
+        while node is not None and node.tag != tag:
+            node = node.parent
+        return node
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging aid
+        return f"<{self.tag} {self.attrs}>"
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {})
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, str | None]]) -> None:
+        while self.stack[-1].tag in _IMPLIED_END.get(tag, ()):
+            self.stack.pop()
+        parent = self.stack[-1]
+        if tag == "tr" and parent.tag == "table":
+            # Browsers wrap bare table rows in <tbody>; XPath selectors rely on it.
+            parent = Node("tbody", {}, parent)
+            parent.parent.children.append(parent)
+            self.stack.append(parent)
+        node = Node(tag, {name: value or "" for name, value in attrs}, parent)
+        parent.children.append(node)
+        if tag not in _VOID:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID and self.stack[-1].tag == tag:
+            self.stack.pop()
+
+    def handle_endtag(self, tag: str) -> None:
+        for index in range(len(self.stack) - 1, 0, -1):
+            if self.stack[index].tag == tag:
+                del self.stack[index:]
+                return
+
+    def handle_data(self, data: str) -> None:
+        self.stack[-1].text_parts.append(data)
+
+
+def parse_html(markup: str) -> Node:
+    builder = _TreeBuilder()
+    builder.feed(markup)
+    builder.close()
+    return builder.root
+
+
+# --- CSS -------------------------------------------------------------------------------------
+
+_CSS_COMPOUND = re.compile(
+    r"(?P<tag>\*|[a-zA-Z][\w-]*)?(?P<rest>(?:#[\w-]+|\.[\w-]+|\[[^\]]+\])*)$"
+)
+_CSS_PART = re.compile(
+    r"#([\w-]+)|\.([\w-]+)|\[\s*([\w-]+)\s*(?:([~^$*]?=)\s*(['\"]?)(.*?)\5)?\s*\]"
+)
+
+
+def _css_matcher(compound: str) -> Callable[[Node], bool]:
+    match = _CSS_COMPOUND.match(compound)
+    if not match or not compound:
+        raise ValueError(f"Unsupported CSS selector: {compound!r}")
+    tag = match.group("tag")
+    checks: List[Callable[[Node], bool]] = []
+    if tag and tag != "*":
+        tag = tag.lower()
+        checks.append(lambda node: node.tag == tag)
+    for id_, class_, name, op, _, value in _CSS_PART.findall(match.group("rest")):
+        if id_:
+            checks.append(lambda node, id_=id_: node.attrs.get("id") == id_)
+        elif class_:
+            checks.append(lambda node, c=class_: c in node.attrs.get("class", "").split())
+        else:
+            checks.append(_attribute_check(name.lower(), op, value))
+    return lambda node: node.tag != "#document" and all(check(node) for check in checks)
+
+
+def _attribute_check(name: str, op: str, value: str) -> Callable[[Node], bool]:
+    def check(node: Node) -> bool:
+        actual = node.attrs.get(name)
+        if actual is None:
+            return False
+        if not op:
+            return True
+        if op == "=":
+            return actual == value
+        if op == "~=":
+            return value in actual.split()
+        if op == "^=":
+            return actual.startswith(value)
+        if op == "$=":
+            return actual.endswith(value)
+        return value in actual
+
+    return check
+
+
+def select_css(root: Node, selector: str) -> List[Node]:
+    results: List[Node] = []
+    for group in selector.split(","):
+        tokens = re.findall(r">|[^\s>]+", group.strip())
+        steps: List[Tuple[str, Callable[[Node], bool]]] = []
+        combinator = " "
+        for token in tokens:
+            if token == ">":
+                combinator = ">"
+                continue
+            steps.append((combinator, _css_matcher(token)))
+            combinator = " "
+        for node in root.iter():
+            if node not in results and _css_matches(node, steps):
+                results.append(node)
+    order = {id(node): index for index, node in enumerate(root.iter())}
+    return sorted(results, key=lambda node: order[id(node)])
+
+
+def _css_matches(node: Node, steps: List[Tuple[str, Callable[[Node], bool]]]) -> bool:
+    if not steps:
+        return False
+    combinator, matcher = steps[-1]
+    if not matcher(node):
+        return False
+    if len(steps) == 1:
+        return True
+    parent = node.parent
+    if combinator == ">":
+        return parent is not None and _css_matches(parent, steps[:-1])
+    while parent is not None:
+        if _css_matches(parent, steps[:-1]):
+            return True
+        parent = parent.parent
+    return False
+
+
+# --- XPath -----------------------------------------------------------------------------------
+
+_XPATH_STEP = re.compile(r"(//|/)?(\.\.|\.|\*|[\w-]+)((?:\[[^\]]*\])*)")
+_XPATH_PREDICATE = re.compile(r"\[([^\]]*)\]")
+_XPATH_ATTR = re.compile(r"^@([\w-]+)\s*(?:=\s*(['\"])(.*)\2)?$")
+_XPATH_CONTAINS = re.compile(r"^contains\(\s*(@[\w-]+|text\(\))\s*,\s*(['\"])(.*)\2\s*\)$")
+_XPATH_TEXT = re.compile(r"^text\(\)\s*=\s*(['\"])(.*)\1$")
+
+
+def _xpath_predicate(expression: str) -> Callable[[Node], bool]:
+    expression = expression.strip()
+    match = _XPATH_ATTR.match(expression)
+    if match:
+        name, _, value = match.groups()
+        if value is None:
+            return lambda node: name in node.attrs
+        return lambda node: node.attrs.get(name) == value
+    match = _XPATH_CONTAINS.match(expression)
+    if match:
+        target, _, value = match.groups()
+        if target == "text()":
+            return lambda node: value in node.text
+        return lambda node: value in node.attrs.get(target[1:], "")
+    match = _XPATH_TEXT.match(expression)
+    if match:
+        return lambda node: node.text.strip() == match.group(2)
+    raise ValueError(f"Unsupported XPath predicate: [{expression}]")
+
+
+def select_xpath(root: Node, expression: str) -> List[Node]:
+    expression = expression.strip()
+    if expression.startswith("."):
+        expression = expression[1:]
+    position = 0
+    context = [root]
+    while position < len(expression):
+        match = _XPATH_STEP.match(expression, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unsupported XPath expression: {expression!r}")
+        position = match.end()
+        axis, test, predicates = match.groups()
+        parents = (
+            [node for ctx in context for node in ctx.iter()] if axis == "//" else list(context)
+        )
+        matched: List[Node] = []
+        for parent in dict.fromkeys(parents):
+            if test == ".":
+                candidates = [parent]
+            elif test == "..":
+                candidates = [parent.parent] if parent.parent is not None else []
+            else:
+                candidates = [
+                    child for child in parent.children if test == "*" or child.tag == test.lower()
+                ]
+            for predicate in _XPATH_PREDICATE.findall(predicates):
+                if predicate.strip().isdigit():
+                    index = int(predicate) - 1
+                    candidates = candidates[index : index + 1]
+                else:
+                    check = _xpath_predicate(predicate)
+                    candidates = [node for node in candidates if check(node)]
+            matched.extend(candidates)
+        context = list(dict.fromkeys(matched))
+    return context
+
+
+def select(root: Node, selector: str) -> List[Node]:
+    """Resolve a ``selector_to_by`` style selector against ``root``."""
+
+    strategy, query = selector_to_by(selector)
+    if strategy == "xpath":
+        return select_xpath(root, query)
+    if strategy == "name":
+        return [node for node in root.iter() if node.attrs.get("name") == query]
+    return select_css(root, query)
+
+
+# --- Portal session --------------------------------------------------------------------------
+
+
+class HTTPPortal:
+    """One cookie-carrying HTTP session standing in for a browser tab."""
+
+    def __init__(self, session: Session | None = None, *, timeout: float = 15.0) -> None:
+        self.session = session or Session(timeout=timeout, cookies=CookieJar())
+        if self.session.cookies is None:
+            self.session.cookies = CookieJar()
+        self.url = ""
+        self.document = Node("#document", {})
+
+    def open(self, url: str, *, method: str = "GET", data: Dict[str, str] | None = None) -> None:
+        body = None
+        headers = {"Accept": "text/html,application/xhtml+xml"}
+        if data is not None:
+            body = urlencode(data).encode()
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        response = self.session.request(method, url, headers=headers, body=body)
+        self.url = response.url
+        self.document = parse_html(response.text())
+        logging.debug("Loaded %s (%s)", self.url, response.status)
+
+    def find_all(self, selector: str) -> List[Node]:
+        return select(self.document, selector)
+
+    def find(self, selector: str) -> Node:
+        nodes = self.find_all(selector)
+        if not nodes:
+            raise ElementNotFound(f"No element matches {selector!r} on {self.url}")
+        return nodes[0]
+
+    def attribute(self, node: Node, name: str) -> str | None:
+        value = node.attrs.get(name)
+        if value is not None and name in _URL_ATTRIBUTES:
+            return urljoin(self.url, value)
+        return value
+
+    def login_required(self, username_field: str) -> bool:
+        return bool(self.find_all(f"name:{username_field}"))
+
+    def login(
+        self, *, username: str, password: str, username_field: str, password_field: str
+    ) -> None:
+        """Submit the form holding ``username_field``, keeping its hidden fields (CSRF etc.)."""
+
+        field = self.find(f"name:{username_field}")
+        form = field.ancestor("form")
+        if form is None:
+            raise ElementNotFound(f"Login field {username_field!r} is not inside a form")
+        values = _form_values(form)
+        values[username_field] = username
+        values[password_field] = password
+        self._submit(form, values)
+
+    def click(self, selector: str) -> None:
+        """Follow links and submit forms; in-page controls (tabs, ``#`` links) are no-ops."""
+
+        node = self.find(selector)
+        link = node if node.tag == "a" else node.ancestor("a")
+        if link is not None:
+            href = link.attrs.get("href", "")
+            target = urljoin(self.url, href)
+            if (
+                href
+                and not href.startswith(("#", "javascript:"))
+                and (urldefrag(target)[0] != urldefrag(self.url)[0])
+            ):
+                self.open(target)
+            return
+        form = node.ancestor("form")
+        if form is not None and (
+            node.tag == "button" or node.attrs.get("type", "").lower() in ("submit", "image")
+        ):
+            values = _form_values(form)
+            if node.attrs.get("name"):
+                values[node.attrs["name"]] = node.attrs.get("value", "")
+            self._submit(form, values)
+
+    def _submit(self, form: Node, values: Dict[str, str]) -> None:
+        action = urljoin(self.url, form.attrs.get("action") or self.url)
+        if form.attrs.get("method", "get").lower() == "post":
+            self.open(action, method="POST", data=values)
+        else:
+            separator = "&" if "?" in action else "?"
+            self.open(f"{urldefrag(action)[0]}{separator}{urlencode(values)}")
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def _form_values(form: Node) -> Dict[str, str]:
+    values: Dict[str, str] = {}
+    for node in form.iter():
+        name = node.attrs.get("name")
+        if not name:
+            continue
+        if node.tag == "input":
+            kind = node.attrs.get("type", "text").lower()
+            if kind in ("submit", "button", "image", "reset", "file"):
+                continue
+            if kind in ("checkbox", "radio") and "checked" not in node.attrs:
+                continue
+            values[name] = node.attrs.get("value", "on" if kind in ("checkbox", "radio") else "")
+        elif node.tag == "textarea":
+            values[name] = node.text
+        elif node.tag == "select":
+            options = [option for option in node.iter() if option.tag == "option"]
+            chosen = next(
+                (o for o in options if "selected" in o.attrs), options[0] if options else None
+            )
+            if chosen is not None:
+                values[name] = chosen.attrs.get("value", chosen.text.strip())
+    return values
@@ -0,0 +1,91 @@
+"""Measure import cost of the CLI and each heavy backend with ``python -X importtime``."""
+
+from __future__ import annotations
+
+import importlib.util
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+# What each code path imports; every target is measured in a fresh interpreter.
+TARGETS: Dict[str, str] = {
+    "cli": "video_tools.__main__",
+    "youtube": "video_tools.youtube",
+    "scrape": "video_tools.scraper",
+    "yt-dlp": "yt_dlp",
+    "selenium": "selenium.webdriver",
+    "keyring": "keyring",
+    "webdriver-manager": "webdriver_manager.chrome",
+}
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportProfile:
+    target: str
+    module: str
+    cumulative_ms: float = 0.0
+    wall_ms: float = 0.0
+    slowest: List[Tuple[str, float]] = field(default_factory=list)
+    error: str | None = None
+
+
+def parse_importtime(output: str) -> Dict[str, Tuple[float, float]]:
+    """Map module name to ``(self_ms, cumulative_ms)`` from ``-X importtime`` stderr."""
+
+    modules = {}
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            modules[name] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    return modules
+
+
+def profile_import(target: str, module: str, *, top: int = 5) -> ImportProfile:
+    profile = ImportProfile(target=target, module=module)
+    if importlib.util.find_spec(module.split(".")[0]) is None:
+        profile.error = "not installed"
+        return profile
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    profile.wall_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        profile.error = completed.stderr.strip().splitlines()[-1]
+        return profile
+    modules = parse_importtime(completed.stderr)
+    profile.cumulative_ms = modules.get(module, (0.0, 0.0))[1]
+    by_self = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)
+    profile.slowest = [(name, times[0]) for name, times in by_self[:top]]
+    return profile
+
+
+def run_import_profile(budget_ms: float | None = None) -> int:
+    """Print the import table; non-zero exit if the CLI import exceeds ``budget_ms``."""
+
+    profiles = [profile_import(target, module) for target, module in TARGETS.items()]
+    print(f"{'target':<18} {'module':<26} {'import ms':>10} {'process ms':>11}")
+    for profile in profiles:
+        if profile.error:
+            print(f"{profile.target:<18} {profile.module:<26} {profile.error:>22}")
+            continue
+        print(
+            f"{profile.target:<18} {profile.module:<26} "
+            f"{profile.cumulative_ms:>10.1f} {profile.wall_ms:>11.1f}"
+        )
+    cli = profiles[0]
+    print("\nSlowest modules on the CLI path (self time):")
+    for name, self_ms in cli.slowest:
+        print(f"  {self_ms:>7.1f} ms  {name}")
+    if budget_ms is not None and cli.cumulative_ms > budget_ms:
+        print(f"\nCLI import {cli.cumulative_ms:.1f} ms exceeds the {budget_ms:.0f} ms budget")
+        return 1
+    return 0
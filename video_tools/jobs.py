@@ -0,0 +1,395 @@
+"""Durable SQLite job queue for CLI downloads with retry and crash-resume."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import random
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+STATES = (PENDING, RUNNING, DONE, FAILED)
+
+
+def default_queue_path() -> Path:
+    return Path.home() / ".video_tools" / "jobs.sqlite3"
+
+
+@dataclass
+class Job:
+    id: int
+    argv: List[str]
+    state: str
+    attempts: int
+    max_attempts: int
+    next_run_at: float
+    created_at: float
+    updated_at: float
+    worker: str | None = None
+    last_error: str | None = None
+    checkpoint: Dict[str, Any] = field(default_factory=dict)
+
+
+class JobQueue:
+    """Jobs are CLI argument vectors (``["youtube", "--url", ...]``) stored in SQLite.
+
+    Workers claim jobs under a lease that they renew while the job runs. A
+    worker that crashes stops renewing, so its jobs become claimable again once
+    the lease expires and are resumed by the next worker.
+    """
+
+    def __init__(self, path: Path | None = None, *, lease: float = 120.0) -> None:
+        self.path = path or default_queue_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease = lease
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " argv TEXT NOT NULL,"
+            " state TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " max_attempts INTEGER NOT NULL,"
+            " next_run_at REAL NOT NULL,"
+            " lease_expires_at REAL,"
+            " worker TEXT,"
+            " last_error TEXT,"
+            " checkpoint TEXT NOT NULL DEFAULT '{}',"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL"
+            ")"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, next_run_at)")
+
+    def enqueue(self, argv: Sequence[str], *, max_attempts: int = 5) -> int:
+        """Add a job; an identical pending or running job is returned instead of duplicated."""
+
+        payload = json.dumps(list(argv))
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM jobs WHERE argv = ? AND state IN (?, ?)",
+                (payload, PENDING, RUNNING),
+            ).fetchone()
+            if row:
+                return row["id"]
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (argv, state, max_attempts, next_run_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (payload, PENDING, max_attempts, now, now, now),
+            )
+            return cursor.lastrowid
+
+    def claim(self, worker: str) -> Job | None:
+        """Atomically take the oldest runnable job (or one whose lease expired)."""
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs"
+                    " WHERE (state = ? AND next_run_at <= ?)"
+                    " OR (state = ? AND lease_expires_at < ?)"
+                    " ORDER BY next_run_at, id LIMIT 1",
+                    (PENDING, now, RUNNING, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET state = ?, attempts = attempts + 1, worker = ?,"
+                    " lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                    (RUNNING, worker, now + self.lease, now, row["id"]),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"])
+
+    def heartbeat(self, job_id: int, checkpoint: Dict[str, Any] | None = None) -> None:
+        """Extend the lease of a running job and merge ``checkpoint`` into its state."""
+
+        now = time.time()
+        with self._lock:
+            if checkpoint:
+                current = self._conn.execute(
+                    "SELECT checkpoint FROM jobs WHERE id = ?", (job_id,)
+                ).fetchone()
+                merged = {**json.loads(current["checkpoint"]), **checkpoint}
+                self._conn.execute(
+                    "UPDATE jobs SET checkpoint = ? WHERE id = ?", (json.dumps(merged), job_id)
+                )
+            self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? WHERE id = ? AND state = ?",
+                (now + self.lease, now, job_id, RUNNING),
+            )
+
+    def complete(self, job_id: int) -> None:
+        self._finish(job_id, DONE, None, time.time())
+
+    def fail(self, job_id: int, error: str, *, backoff: float = 30.0) -> str:
+        """Record a failed attempt; retries with jittered exponential backoff until exhausted."""
+
+        job = self.get(job_id)
+        if job.attempts >= job.max_attempts:
+            self._finish(job_id, FAILED, error, time.time())
+            return FAILED
+        delay = backoff * (2 ** (job.attempts - 1)) * random.uniform(0.8, 1.2)
+        self._finish(job_id, PENDING, error, time.time() + delay)
+        return PENDING
+
+    def release(self, job_id: int) -> None:
+        """Hand an interrupted job back without counting the attempt."""
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, attempts = MAX(attempts - 1, 0), worker = NULL,"
+                " lease_expires_at = NULL, next_run_at = ?, updated_at = ? WHERE id = ?",
+                (PENDING, now, now, job_id),
+            )
+
+    def requeue_failed(self) -> int:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = ?, attempts = 0, next_run_at = ?, updated_at = ?"
+                " WHERE state = ?",
+                (PENDING, now, now, FAILED),
+            )
+            return cursor.rowcount
+
+    def get(self, job_id: int) -> Job:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise KeyError(job_id)
+        return _job(row)
+
+    def jobs(self, state: str | None = None, limit: int = 50) -> List[Job]:
+        query = "SELECT * FROM jobs"
+        params: tuple = ()
+        if state:
+            query += " WHERE state = ?"
+            params = (state,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id DESC LIMIT ?", (*params, limit))
+            return [_job(row) for row in rows.fetchall()]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        counts = dict.fromkeys(STATES, 0)
+        counts.update({state: count for state, count in rows})
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _finish(self, job_id: int, state: str, error: str | None, next_run_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, last_error = ?, next_run_at = ?, worker = NULL,"
+                " lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+                (state, error, next_run_at, time.time(), job_id),
+            )
+
+
+def _job(row: sqlite3.Row) -> Job:
+    return Job(
+        id=row["id"],
+        argv=json.loads(row["argv"]),
+        state=row["state"],
+        attempts=row["attempts"],
+        max_attempts=row["max_attempts"],
+        next_run_at=row["next_run_at"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        worker=row["worker"],
+        last_error=row["last_error"],
+        checkpoint=json.loads(row["checkpoint"]),
+    )
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def job_command(argv: Sequence[str]) -> List[str]:
+    return [sys.executable, "-m", "video_tools", *argv]
+
+
+def run_job(
+    queue: JobQueue,
+    job: Job,
+    *,
+    heartbeat: float = 10.0,
+    stop: threading.Event | None = None,
+) -> int:
+    """Run ``job`` as a child CLI process, renewing its lease and checkpointing output.
+
+    The child and everything it started are terminated when ``stop`` is set.
+    It runs in a session of its own, so it outlives a worker that is killed;
+    when such a job is claimed again on the same host, the previous child's
+    process group is killed first so two downloaders never write the same files.
+    """
+
+    _kill_previous_child(job)
+    process = subprocess.Popen(
+        job_command(job.argv),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+        # Keep Ctrl-C away from children; the worker decides how to stop them.
+        start_new_session=True,
+    )
+    # Clears an earlier attempt's returncode, so this child counts as running.
+    queue.heartbeat(
+        job.id,
+        {
+            "pid": process.pid,
+            "host": socket.gethostname(),
+            "started_at": time.time(),
+            "returncode": None,
+        },
+    )
+    last_line: List[str] = [""]
+
+    def pump() -> None:
+        assert process.stdout is not None
+        for line in process.stdout:
+            last_line[0] = line.rstrip()
+            logging.info("[job %d] %s", job.id, last_line[0])
+
+    reader = threading.Thread(target=pump, daemon=True)
+    reader.start()
+    try:
+        while True:
+            try:
+                returncode = process.wait(timeout=heartbeat)
+                break
+            except subprocess.TimeoutExpired:
+                if stop is not None and stop.is_set():
+                    raise InterruptedError(f"job {job.id} stopped")
+                queue.heartbeat(job.id, {"last_output": last_line[0]})
+    except BaseException:
+        _stop_child(process)
+        queue.heartbeat(job.id, {"returncode": process.returncode})
+        raise
+    reader.join(timeout=5)
+    queue.heartbeat(job.id, {"last_output": last_line[0], "returncode": returncode})
+    return returncode
+
+
+def _stop_child(process: subprocess.Popen, timeout: float = 10.0) -> None:
+    """Terminate the child's whole process group (FFmpeg, yt-dlp...), killing it if needed."""
+
+    if not hasattr(os, "killpg"):  # pragma: no cover - Windows
+        process.terminate()
+        process.wait()
+        return
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(process.pid, signal.SIGTERM)
+    with contextlib.suppress(subprocess.TimeoutExpired):
+        process.wait(timeout=timeout)
+    # Whatever is left of the group (the child or what it started) must not keep writing.
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(process.pid, signal.SIGKILL)
+    process.wait()
+
+
+def _kill_previous_child(job: Job) -> None:
+    """Kill the child left running by a worker whose lease on ``job`` expired."""
+
+    pid = job.checkpoint.get("pid")
+    if (
+        not pid
+        or job.checkpoint.get("returncode") is not None  # that child already exited
+        or job.checkpoint.get("host") != socket.gethostname()
+        or not hasattr(os, "killpg")
+    ):
+        return
+    try:
+        if os.getpgid(pid) != pid:
+            return  # the pid was reused by a process that is not a job child
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        return
+    logging.warning("Killed job %d's previous child (pid %d) before restarting it", job.id, pid)
+
+
+def run_worker(
+    queue: JobQueue,
+    *,
+    concurrency: int = 2,
+    poll_interval: float = 5.0,
+    exit_when_idle: bool = False,
+    backoff: float = 30.0,
+    heartbeat: float = 10.0,
+    stop: threading.Event | None = None,
+) -> None:
+    """Process jobs with ``concurrency`` threads until ``stop`` is set (or the queue drains)."""
+
+    stop = stop or threading.Event()
+    name = worker_id()
+
+    def loop(slot: int) -> None:
+        while not stop.is_set():
+            job = queue.claim(f"{name}/{slot}")
+            if job is None:
+                if exit_when_idle:
+                    return
+                stop.wait(poll_interval)
+                continue
+            logging.info("Job %d attempt %d: %s", job.id, job.attempts, " ".join(job.argv))
+            try:
+                returncode = run_job(queue, job, heartbeat=heartbeat, stop=stop)
+            except InterruptedError:
+                # Shutdown, not a failure: the next worker starts it again.
+                queue.release(job.id)
+                return
+            except Exception as exc:
+                state = queue.fail(job.id, str(exc), backoff=backoff)
+            else:
+                if returncode == 0:
+                    queue.complete(job.id)
+                    logging.info("Job %d done", job.id)
+                    continue
+                state = queue.fail(job.id, f"exit code {returncode}", backoff=backoff)
+            logging.warning("Job %d failed (now %s)", job.id, state)
+
+    threads = [threading.Thread(target=loop, args=(slot,)) for slot in range(max(concurrency, 1))]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=1)
+    except KeyboardInterrupt:
+        logging.info("Stopping worker; running jobs go back to the queue")
+        stop.set()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,166 @@
+"""Compressed on-disk cache of yt-dlp playlist listings and video info dicts."""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict
+
+DEFAULT_TTL = 7 * 24 * 3600.0
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_path() -> Path:
+    return Path.home() / ".video_tools" / "metadata.sqlite3"
+
+
+def listing_key(url: str) -> str:
+    return f"listing {url}"
+
+
+def info_key(url: str) -> str:
+    return f"info {url}"
+
+
+def file_key(path: Path | str) -> str:
+    return f"file {Path(path).resolve()}"
+
+
+@dataclass
+class CacheStats:
+    entries: int
+    stored_bytes: int
+    hits: int
+    misses: int
+
+
+class MetadataCache:
+    """zlib-compressed JSON blobs in SQLite with TTL expiry and LRU size eviction.
+
+    ``ttl`` bounds how long anything is kept; callers pass a tighter
+    ``max_age`` to :meth:`get` when the data goes stale sooner (stream URLs
+    inside video info expire after a few hours, new uploads change listings).
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.path = path or default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS metadata ("
+            " key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL,"
+            " stored_at REAL NOT NULL, accessed_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS metadata_lru ON metadata (accessed_at)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM metadata").fetchone()[0]
+
+    def get(self, key: str, *, max_age: float | None = None) -> Dict[str, Any] | None:
+        limit = self.ttl if max_age is None else min(max_age, self.ttl)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, stored_at FROM metadata WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > limit:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE metadata SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def age(self, key: str) -> float | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at FROM metadata WHERE key = ?", (key,)
+            ).fetchone()
+        return None if row is None else time.time() - row[0]
+
+    def put(self, key: str, info: Dict[str, Any]) -> None:
+        data = zlib.compress(json.dumps(info, separators=(",", ":")).encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM metadata WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata (key, data, size, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), now, now),
+            )
+            self._size += len(data) - (previous[0] if previous else 0)
+            if self._size > self.max_bytes:
+                self._evict(now)
+            self._conn.commit()
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM metadata WHERE key = ?", (key,))
+            self._conn.commit()
+            self._size = self._total()
+
+    def prune(self) -> int:
+        """Drop expired entries and shrink to ``max_bytes``; returns entries removed."""
+
+        with self._lock:
+            before = self._count()
+            self._evict(time.time())
+            self._conn.commit()
+            return before - self._count()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._count(), self._size, self.hits, self.misses)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> MetadataCache:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM metadata WHERE stored_at < ?", (now - self.ttl,))
+        self._size = self._total()
+        if self._size <= self.max_bytes:
+            return
+        # Least recently used first, until the cache fits again.
+        excess = self._size - self.max_bytes
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM metadata ORDER BY accessed_at"):
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= size
+        self._conn.executemany("DELETE FROM metadata WHERE key = ?", doomed)
+        self._size = self._total()
+        logging.debug("Evicted %d metadata cache entries", len(doomed))
+
+    def _total(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM metadata").fetchone()[0]
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
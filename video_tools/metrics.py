@@ -0,0 +1,295 @@
+"""In-process download metrics fed by yt-dlp progress hooks."""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import IO, Any, Callable, Deque, Dict, List, Tuple
+
+RATE_WINDOW = 10.0
+_RETRY_PATTERN = re.compile(r"Retrying.*\(\d+/\d+\)")
+
+
+@dataclass
+class _Transfer:
+    downloaded: int = 0
+    total: int | None = None
+    fragment_index: int | None = None
+    fragment_at: float | None = None
+
+
+class DownloadMetrics:
+    """Aggregate yt-dlp progress callbacks into counters and a sliding-window rate.
+
+    Instances are used directly as yt-dlp progress hooks and may be shared by
+    several concurrent downloads. Instead of one log line per callback, a summary
+    is logged (and appended to ``stats_file`` as JSON Lines) at most every
+    ``interval`` seconds; ``dashboard`` redraws a single console status line.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = 5.0,
+        stats_file: Path | None = None,
+        dashboard: bool = False,
+        stream: IO[str] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.interval = interval
+        self.dashboard = dashboard
+        self.stream = stream or sys.stderr
+        self.clock = clock
+        self.started = clock()
+        self.downloaded_bytes = 0
+        self.files_finished = 0
+        self.retries = 0
+        self.errors = 0
+        self.queue_depth = 0
+        self.fragments = 0
+        self.fragment_seconds = 0.0
+        self._latencies: Deque[float] = deque(maxlen=1024)
+        self._samples: Deque[Tuple[float, int]] = deque([(self.started, 0)])
+        self._transfers: Dict[str, _Transfer] = {}
+        self._lock = threading.Lock()
+        self._last_report = self.started
+        self._last_draw = 0.0
+        self._stats = stats_file.open("a", encoding="utf-8") if stats_file else None
+        self._server: ThreadingHTTPServer | None = None
+
+    def __call__(self, status: Dict[str, Any]) -> None:
+        now = self.clock()
+        name = status.get("filename") or status.get("tmpfilename") or "unknown"
+        state = status.get("status")
+        with self._lock:
+            transfer = self._transfers.setdefault(name, _Transfer())
+            downloaded = status.get("downloaded_bytes")
+            if state == "finished":
+                downloaded = status.get("total_bytes") or downloaded
+            if downloaded is not None and downloaded > transfer.downloaded:
+                self.downloaded_bytes += int(downloaded) - transfer.downloaded
+                transfer.downloaded = int(downloaded)
+            transfer.total = status.get("total_bytes") or status.get("total_bytes_estimate")
+            fragment = status.get("fragment_index")
+            if fragment is not None and fragment != transfer.fragment_index:
+                if transfer.fragment_at is not None:
+                    self._fragment_done(now - transfer.fragment_at)
+                transfer.fragment_index = fragment
+                transfer.fragment_at = now
+            if state == "finished":
+                self.files_finished += 1
+                del self._transfers[name]
+            elif state == "error":
+                self.errors += 1
+                del self._transfers[name]
+            self._samples.append((now, self.downloaded_bytes))
+            while len(self._samples) > 2 and now - self._samples[0][0] > RATE_WINDOW:
+                self._samples.popleft()
+        self.report()
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def set_queue_depth(self, depth: int) -> None:
+        with self._lock:
+            self.queue_depth = depth
+
+    def dequeued(self) -> None:
+        with self._lock:
+            self.queue_depth = max(self.queue_depth - 1, 0)
+
+    def logger(self) -> YtDlpLogger:
+        return YtDlpLogger(self)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = self.clock()
+        with self._lock:
+            (first_at, first_bytes), (last_at, last_bytes) = self._samples[0], self._samples[-1]
+            span = max(now, last_at) - first_at
+            rate = (last_bytes - first_bytes) / span if span > 0 else 0.0
+            remaining = [t.total - t.downloaded for t in self._transfers.values() if t.total]
+            latencies = sorted(self._latencies)
+            return {
+                "time": time.time(),
+                "elapsed": now - self.started,
+                "downloaded_bytes": self.downloaded_bytes,
+                "bytes_per_second": rate,
+                "eta": sum(remaining) / rate if remaining and rate > 0 else None,
+                "active": len(self._transfers),
+                "files_finished": self.files_finished,
+                "retries": self.retries,
+                "errors": self.errors,
+                "queue_depth": self.queue_depth,
+                "fragments": self.fragments,
+                "fragment_latency_p50": _quantile(latencies, 0.5),
+                "fragment_latency_p95": _quantile(latencies, 0.95),
+            }
+
+    def report(self, force: bool = False) -> None:
+        """Emit the throttled log line, stats record and dashboard refresh when due."""
+
+        now = self.clock()
+        with self._lock:
+            draw = self.dashboard and (force or now - self._last_draw >= min(self.interval, 0.5))
+            due = force or now - self._last_report >= self.interval
+            if draw:
+                self._last_draw = now
+            if due:
+                self._last_report = now
+        if draw:
+            end = "\n" if force or not self.stream.isatty() else ""
+            self.stream.write(f"\r\x1b[2K{format_snapshot(self.snapshot())}{end}")
+            self.stream.flush()
+        if not due:
+            return
+        snapshot = self.snapshot()
+        if not self.dashboard:
+            logging.info("Progress: %s", format_snapshot(snapshot))
+        if self._stats is not None:
+            self._stats.write(json.dumps(snapshot) + "\n")
+            self._stats.flush()
+
+    def prometheus(self) -> str:
+        """Render the current snapshot in the Prometheus text exposition format."""
+
+        snapshot = self.snapshot()
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str, value: Any) -> None:
+            lines.append(f"# HELP video_tools_{name} {help_text}")
+            lines.append(f"# TYPE video_tools_{name} {kind}")
+            lines.append(f"video_tools_{name} {0 if value is None else value}")
+
+        metric(
+            "downloaded_bytes_total", "counter", "Bytes downloaded.", snapshot["downloaded_bytes"]
+        )
+        metric("download_speed_bytes", "gauge", "Bytes per second.", snapshot["bytes_per_second"])
+        metric("eta_seconds", "gauge", "Estimated seconds left for active files.", snapshot["eta"])
+        metric("active_downloads", "gauge", "Files being downloaded.", snapshot["active"])
+        metric("files_finished_total", "counter", "Files completed.", snapshot["files_finished"])
+        metric("retries_total", "counter", "Network retries reported by yt-dlp.", self.retries)
+        metric("errors_total", "counter", "Failed file downloads.", snapshot["errors"])
+        metric("queue_depth", "gauge", "Downloads waiting to start.", snapshot["queue_depth"])
+        lines.append("# HELP video_tools_fragment_latency_seconds Time per HLS/DASH fragment.")
+        lines.append("# TYPE video_tools_fragment_latency_seconds summary")
+        for quantile, key in (("0.5", "fragment_latency_p50"), ("0.95", "fragment_latency_p95")):
+            value = snapshot[key]
+            lines.append(
+                f'video_tools_fragment_latency_seconds{{quantile="{quantile}"}} {value or 0}'
+            )
+        lines.append(f"video_tools_fragment_latency_seconds_sum {self.fragment_seconds}")
+        lines.append(f"video_tools_fragment_latency_seconds_count {self.fragments}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> Tuple[str, int]:
+        """Serve ``/metrics`` (Prometheus) and ``/`` (JSON) from a background thread."""
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path == "/metrics":
+                    body, kind = metrics.prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/":
+                    body, kind = json.dumps(metrics.snapshot()), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                payload = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", kind)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logging.debug("metrics: " + format, *args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        address = self._server.server_address
+        logging.info("Serving metrics on http://%s:%d/metrics", address[0], address[1])
+        return address[0], address[1]
+
+    def close(self) -> None:
+        self.report(force=True)
+        if self._stats is not None:
+            self._stats.close()
+            self._stats = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> DownloadMetrics:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _fragment_done(self, seconds: float) -> None:
+        self.fragments += 1
+        self.fragment_seconds += seconds
+        self._latencies.append(seconds)
+
+
+class YtDlpLogger:
+    """yt-dlp ``logger`` that forwards to :mod:`logging` and counts retries."""
+
+    def __init__(self, metrics: DownloadMetrics | None = None) -> None:
+        self.metrics = metrics
+
+    def debug(self, message: str) -> None:
+        # yt-dlp routes its own console progress here too; keep it out of INFO.
+        logging.debug(message)
+
+    def info(self, message: str) -> None:
+        logging.info(message)
+
+    def warning(self, message: str) -> None:
+        if self.metrics is not None and _RETRY_PATTERN.search(message):
+            self.metrics.record_retry()
+        logging.warning(message)
+
+    def error(self, message: str) -> None:
+        logging.error(message)
+
+
+def format_bytes(count: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(count) < 1024:
+            return f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} TiB"
+
+
+def format_snapshot(snapshot: Dict[str, Any]) -> str:
+    eta = snapshot["eta"]
+    parts = [
+        f"{format_bytes(snapshot['downloaded_bytes'])}",
+        f"{format_bytes(snapshot['bytes_per_second'])}/s",
+        f"ETA {eta:.0f}s" if eta is not None else "ETA --",
+        f"{snapshot['active']} active",
+        f"{snapshot['files_finished']} done",
+        f"{snapshot['queue_depth']} queued",
+        f"{snapshot['retries']} retries",
+    ]
+    if snapshot["fragments"]:
+        parts.append(f"frag p50 {snapshot['fragment_latency_p50'] * 1000:.0f}ms")
+    return " | ".join(parts)
+
+
+def _quantile(values: List[float], q: float) -> float | None:
+    if not values:
+        return None
+    return values[min(int(q * len(values)), len(values) - 1)]
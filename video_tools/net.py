@@ -0,0 +1,267 @@
+"""Pooled keep-alive HTTP client shared by the native downloaders."""
+
+from __future__ import annotations
+
+import http.client
+import logging
+import random
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass
+from email.message import Message
+from http.cookiejar import CookieJar
+from typing import Callable, Dict, Iterator, Mapping, Tuple
+from urllib.parse import urljoin, urlsplit
+
+USER_AGENT = "video-tools (+https://github.com/krisarmstrong/video-tools)"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+_PoolKey = Tuple[str, str, int]
+
+
+class HTTPError(RuntimeError):
+    def __init__(self, status: int, url: str) -> None:
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+        self.url = url
+
+
+class Cancelled(RuntimeError):
+    """Raised by requests and body reads after :meth:`Session.cancel`."""
+
+
+@dataclass
+class Response:
+    status: int
+    url: str
+    headers: Message
+    _raw: http.client.HTTPResponse
+    _release: Callable[[bool], None] | None
+    _cancelled: threading.Event | None = None
+
+    def info(self) -> Message:
+        # http.cookiejar expects urllib-style responses.
+        return self.headers
+
+    def iter_content(self, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+        try:
+            while True:
+                if self._cancelled is not None and self._cancelled.is_set():
+                    raise Cancelled(f"Download of {self.url} was cancelled")
+                chunk = self._raw.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            self.close()
+
+    def read(self) -> bytes:
+        try:
+            return self._raw.read()
+        finally:
+            self.close()
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.read().decode(self.headers.get_content_charset() or encoding, "replace")
+
+    def close(self) -> None:
+        release, self._release = self._release, None
+        if release is not None:
+            # A fully read body leaves the keep-alive connection reusable.
+            release(self._raw.isclosed())
+
+
+class Session:
+    """Thread-safe HTTP client that keeps one keep-alive connection per host and thread.
+
+    Requests follow redirects, carry cookies from ``cookies`` when given, and
+    retry connection failures and ``RETRY_STATUSES`` with jittered exponential
+    backoff (honouring ``Retry-After``). ``on_throttle`` is called with the
+    URL of every HTTP 429 and may return a longer delay, e.g.
+    :meth:`~video_tools.scheduler.Scheduler.record_throttle`.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 30.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        headers: Mapping[str, str] | None = None,
+        cookies: CookieJar | None = None,
+        max_redirects: int = 10,
+        on_throttle: Callable[[str], float] | None = None,
+    ) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.headers = {"User-Agent": USER_AGENT, **(headers or {})}
+        self.cookies = cookies
+        self.max_redirects = max_redirects
+        self.on_throttle = on_throttle
+        self._local = threading.local()
+        self._all: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def get(self, url: str, **kwargs) -> Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> Response:
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        body: bytes | None = None,
+        ok_statuses: frozenset[int] | None = None,
+    ) -> Response:
+        """Send a request; raises :class:`HTTPError` for statuses >= 400 by default."""
+
+        for _ in range(self.max_redirects + 1):
+            response = self._request_with_retries(method, url, headers, body)
+            location = response.headers.get("Location")
+            if response.status in _REDIRECT_STATUSES and location:
+                response.read()
+                url = urljoin(url, location)
+                if response.status == 303 or (response.status in (301, 302) and method == "POST"):
+                    method, body = "GET", None
+                continue
+            if ok_statuses is not None:
+                if response.status not in ok_statuses:
+                    response.close()
+                    raise HTTPError(response.status, url)
+            elif response.status >= 400:
+                response.close()
+                raise HTTPError(response.status, url)
+            return response
+        raise RuntimeError(f"Too many redirects for {url}")
+
+    def cancel(self) -> None:
+        """Make every request and body read in progress (on any thread) raise :class:`Cancelled`.
+
+        Reads stop at the next chunk; the session cannot be used afterwards.
+        """
+
+        self._cancelled.set()
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._all = self._all, []
+        for conn in connections:
+            conn.close()
+
+    def __enter__(self) -> Session:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _request_with_retries(
+        self, method: str, url: str, headers: Mapping[str, str] | None, body: bytes | None
+    ) -> Response:
+        attempt = 0
+        while True:
+            try:
+                response = self._send(method, url, headers, body)
+            except (OSError, http.client.HTTPException) as exc:
+                if attempt >= self.retries:
+                    raise
+                delay = self._delay(attempt, None)
+                logging.debug("%s %s failed (%s); retrying in %.1fs", method, url, exc, delay)
+            else:
+                if response.status not in RETRY_STATUSES or attempt >= self.retries:
+                    return response
+                delay = self._delay(attempt, response.headers.get("Retry-After"))
+                if response.status == 429 and self.on_throttle is not None:
+                    delay = max(delay, self.on_throttle(url))
+                response.read()
+                logging.debug("%s %s -> %d; retrying in %.1fs", method, url, response.status, delay)
+            attempt += 1
+            time.sleep(delay)
+
+    def _delay(self, attempt: int, retry_after: str | None) -> float:
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2**attempt) * random.uniform(0.5, 1.5)
+
+    def _send(
+        self, method: str, url: str, headers: Mapping[str, str] | None, body: bytes | None
+    ) -> Response:
+        if self._cancelled.is_set():
+            raise Cancelled(f"{method} {url} was cancelled")
+        parts = urlsplit(url)
+        request_headers = {**self.headers, **(headers or {})}
+        if self.cookies is not None:
+            probe = urllib.request.Request(url, headers=request_headers, method=method)
+            self.cookies.add_cookie_header(probe)
+            request_headers = dict(probe.header_items())
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        key = _pool_key(url)
+        conn = self._connection(key)
+        try:
+            conn.request(method, path, body=body, headers=request_headers)
+            raw = conn.getresponse()
+        except (OSError, http.client.HTTPException):
+            # Stale keep-alive connections fail on first use; drop and let the caller retry.
+            self._discard(key, conn)
+            raise
+
+        def release(reusable: bool) -> None:
+            if not reusable or raw.will_close:
+                self._discard(key, conn)
+
+        response = Response(raw.status, url, raw.msg, raw, release, self._cancelled)
+        if method == "HEAD":
+            raw.read()
+            response.close()
+        if self.cookies is not None:
+            self.cookies.extract_cookies(
+                response, urllib.request.Request(url, headers=request_headers)
+            )
+        return response
+
+    def _connection(self, key: _PoolKey) -> http.client.HTTPConnection:
+        pool: Dict[_PoolKey, http.client.HTTPConnection] | None = getattr(self._local, "pool", None)
+        if pool is None:
+            pool = self._local.pool = {}
+        conn = pool.get(key)
+        if conn is None:
+            scheme, host, port = key
+            factory = (
+                http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            )
+            conn = factory(host, port, timeout=self.timeout)
+            pool[key] = conn
+            with self._lock:
+                self._all.append(conn)
+        return conn
+
+    def _discard(self, key: _PoolKey, conn: http.client.HTTPConnection) -> None:
+        conn.close()
+        pool = getattr(self._local, "pool", {})
+        if pool.get(key) is conn:
+            del pool[key]
+        with self._lock:
+            if conn in self._all:
+                self._all.remove(conn)
+
+
+def _pool_key(url: str) -> _PoolKey:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported URL scheme: {url}")
+    port = parts.port or (443 if scheme == "https" else 80)
+    return scheme, parts.hostname or "", port
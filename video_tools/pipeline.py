@@ -0,0 +1,189 @@
+"""Bounded post-processing pipeline that overlaps yt-dlp downloads with merge/remux."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Set
+
+_STOP = object()
+
+
+@dataclass
+class _Job:
+    run: Callable[[], Dict[str, Any]]
+    name: str
+    archive_key: str | None = None
+
+
+class PostProcessPipeline:
+    """Run yt-dlp's post-processing for video N while video N+1 downloads.
+
+    :meth:`attach` replaces ``YoutubeDL.post_process`` (merge, remux, thumbnail
+    embedding, moving into place) with a hand-off to ``workers`` threads fed by
+    a queue of at most ``depth`` videos. When the queue is full the download
+    thread blocks, so at most ``workers + depth`` finished downloads wait in
+    temporary files. ``checksum`` adds a stage writing ``<file>.sha256``.
+    Archive entries are only recorded once a video's post-processing succeeded.
+    With ``workers=0`` every stage runs inline, as yt-dlp does by default.
+    """
+
+    def __init__(self, *, workers: int = 1, depth: int = 2, checksum: bool = False) -> None:
+        self.workers = max(workers, 0)
+        self.checksum = checksum
+        self.processed = 0
+        self.failures: List[str] = []
+        self.waited = 0.0
+        self._queue: queue.Queue = queue.Queue(maxsize=max(depth, 1))
+        self._lock = threading.Lock()
+        self._in_flight: Set[str] = set()
+        self._approved: Set[str] = set()
+        self._failed_keys: Set[str] = set()
+        self._archive: Any = None
+        self._threads = [
+            threading.Thread(target=self._work, name=f"postprocess-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def attach(self, ydl: Any) -> None:
+        """Route ``ydl``'s post-processing (and archive writes) through this pipeline."""
+
+        run_inline = ydl.post_process
+
+        def post_process(filename: str, info: Dict[str, Any], files_to_move=None):
+            # yt-dlp keeps mutating ``info`` after this returns; the job gets its own copy.
+            job_info = dict(info)
+            key = ydl._make_archive_id(info) if self._archive is not None else None
+            self.submit(
+                _Job(
+                    run=lambda: run_inline(filename, job_info, files_to_move),
+                    name=filename,
+                    archive_key=key,
+                )
+            )
+            info["filepath"] = filename
+            return info
+
+        ydl.post_process = post_process
+        if ydl.archive:
+            self._archive = ydl.archive
+            ydl.archive = _PendingArchive(self)
+
+    def submit(self, job: _Job) -> None:
+        if job.archive_key:
+            with self._lock:
+                self._in_flight.add(job.archive_key)
+        if not self._threads:
+            self._process(job)
+            return
+        started = time.monotonic()
+        self._queue.put(job)
+        waited = time.monotonic() - started
+        if waited > 0.05:
+            logging.debug("Download waited %.1fs for post-processing of %s", waited, job.name)
+        with self._lock:
+            self.waited += waited
+
+    def join(self) -> None:
+        """Wait until every submitted video has been post-processed."""
+
+        self._queue.join()
+
+    def close(self) -> None:
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self.processed or self.failures:
+            logging.info(
+                "Post-processed %d file(s), %d failed; downloads waited %.1fs for the pipeline",
+                self.processed,
+                len(self.failures),
+                self.waited,
+            )
+
+    def __enter__(self) -> PostProcessPipeline:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                self._process(job)
+            finally:
+                self._queue.task_done()
+
+    def _process(self, job: _Job) -> None:
+        try:
+            info = job.run()
+            if self.checksum and info.get("filepath"):
+                write_checksum(Path(info["filepath"]))
+        except Exception as exc:  # one bad merge must not take the worker down
+            logging.error("Post-processing %s failed: %s", job.name, exc)
+            with self._lock:
+                self.failures.append(f"{job.name}: {exc}")
+                if job.archive_key:
+                    self._in_flight.discard(job.archive_key)
+                    self._failed_keys.add(job.archive_key)
+            return
+        with self._lock:
+            self.processed += 1
+            if not job.archive_key:
+                return
+            self._in_flight.discard(job.archive_key)
+            record = job.archive_key in self._approved
+            self._approved.discard(job.archive_key)
+        if record:
+            self._archive.add(job.archive_key)
+
+    def _record(self, key: str) -> None:
+        # yt-dlp records a video once process_info returns, which may be before or
+        # after its post-processing finished; only successful videos reach the archive.
+        with self._lock:
+            if key in self._in_flight:
+                self._approved.add(key)
+                return
+            if key in self._failed_keys:
+                return
+        self._archive.add(key)
+
+
+class _PendingArchive:
+    """Archive view for yt-dlp that defers writes until post-processing succeeds."""
+
+    def __init__(self, pipeline: PostProcessPipeline) -> None:
+        self.pipeline = pipeline
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.pipeline._archive or key in self.pipeline._in_flight
+
+    def __bool__(self) -> bool:
+        return True
+
+    def add(self, key: str) -> None:
+        self.pipeline._record(key)
+
+
+def write_checksum(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Write ``<path>.sha256`` in ``sha256sum`` format and return the digest."""
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(chunk_size):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    path.with_name(path.name + ".sha256").write_text(f"{value}  {path.name}\n", encoding="utf-8")
+    return value
@@ -0,0 +1,426 @@
+"""TOML job files: many YouTube sources and scrape portals planned and run in one process."""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, TextIO, Tuple
+
+from .archive import DownloadArchive, make_key
+from .diskspace import DiskBudget
+from .metacache import MetadataCache, listing_key
+from .metrics import DownloadMetrics, format_bytes
+from .scheduler import host_of, parse_rate
+from .waits import StepTimings
+
+try:
+    import tomllib  # Python 3.11+
+except ModuleNotFoundError:  # pragma: no cover
+    import tomli as tomllib
+
+SETTINGS_KEYS = {"workers", "archive", "metadata_cache", "assumed_rate"}
+YOUTUBE_KEYS = {
+    "url", "name", "output_dir", "format", "cookies", "rate_limit", "retries", "resume",
+    "incremental", "full_rescan", "postprocess_workers", "checksum", "scratch_dir",
+}  # fmt: skip
+SCRAPE_KEYS = {
+    "url", "name", "video_selector", "video_attribute", "navigation", "username_field",
+    "password_field", "credential_alias", "engine", "all", "next_page", "max_pages",
+    "download", "output_file", "headless", "wait_timeout", "segment_workers",
+    "block_resources", "scratch_dir",
+}  # fmt: skip
+KIND_KEYS = {"youtube": YOUTUBE_KEYS, "scrape": SCRAPE_KEYS}
+
+# Estimates used until the metadata cache or recorded step timings know better.
+ASSUMED_RATE = 10 * 1024**2  # bytes/s per transfer
+VIDEO_BITRATE = 500_000  # bytes/s of media (~4 Mbit/s) when only the duration is known
+VIDEO_BYTES = 200 * 1024**2  # when the duration is unknown too
+EXTRACT_SECONDS = 3.0  # per video: page and player extraction
+UNKNOWN_SOURCE_SECONDS = 600.0  # channel never listed; ordered as a big job
+SCRAPE_SECONDS = 30.0
+
+
+@dataclass
+class Job:
+    kind: str
+    name: str
+    url: str
+    options: Dict[str, Any]
+    bytes: int | None = None
+    seconds: float = 0.0
+    estimated: bool = False
+    detail: str = ""
+
+
+@dataclass
+class Group:
+    """Jobs that share a host and credential; they run back to back on one worker."""
+
+    kind: str
+    host: str
+    credential: str
+    jobs: List[Job] = field(default_factory=list)
+
+    @property
+    def seconds(self) -> float:
+        return sum(job.seconds for job in self.jobs)
+
+
+@dataclass
+class Plan:
+    groups: List[Group]
+    workers: int
+    settings: Dict[str, Any]
+
+    @property
+    def jobs(self) -> List[Job]:
+        return [job for group in self.groups for job in group.jobs]
+
+    def makespan(self) -> float:
+        """Wall time if groups start in plan order on ``workers`` parallel workers."""
+
+        finish = [0.0] * max(min(self.workers, len(self.groups)), 1)
+        for group in self.groups:
+            heapq.heappush(finish, heapq.heappop(finish) + group.seconds)
+        return max(finish)
+
+    def format(self) -> str:
+        lines = [
+            (
+                f"Plan: {len(self.jobs)} job(s) in {len(self.groups)} group(s) on "
+                f"{self.workers} worker(s); ~{_size(self.jobs)}, "
+                f"~{_duration(self.makespan())}"
+            )
+        ]
+        for number, group in enumerate(self.groups, start=1):
+            credential = f" [{group.credential}]" if group.credential else ""
+            lines.append(
+                f"{number:>3}. {group.kind:<7} {group.host}{credential}: {len(group.jobs)} job(s), "
+                f"~{_size(group.jobs)}, ~{_duration(group.seconds)}"
+            )
+            for job in group.jobs:
+                size = format_bytes(job.bytes) if job.bytes is not None else "?"
+                detail = f" {job.detail}" if job.detail else ""
+                guess = "" if job.estimated or job.detail else " (default estimate)"
+                lines.append(f"       {job.name}{detail}: {size}, ~{_duration(job.seconds)}{guess}")
+        return "\n".join(lines)
+
+
+@dataclass
+class JobResult:
+    name: str
+    kind: str
+    error: str | None = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _size(jobs: List[Job]) -> str:
+    known = format_bytes(sum(job.bytes or 0 for job in jobs))
+    return known + "+" if any(job.bytes is None for job in jobs) else known
+
+
+def _duration(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{secs:02d}s"
+
+
+def load_jobfile(path: Path) -> Tuple[Dict[str, Any], List[Job]]:
+    """Parse ``[settings]``, ``[defaults.<kind>]`` and ``[[youtube]]`` / ``[[scrape]]`` tables."""
+
+    with path.open("rb") as handle:
+        data = tomllib.load(handle)
+    unknown = set(data) - {"settings", "defaults", *KIND_KEYS}
+    if unknown:
+        raise ValueError(f"Unknown table(s) in {path}: {', '.join(sorted(unknown))}")
+    settings = dict(data.get("settings", {}))
+    _check_keys(settings, SETTINGS_KEYS, "[settings]")
+    _check_settings(settings)
+    defaults = data.get("defaults", {})
+    _check_keys(defaults, set(KIND_KEYS), "[defaults]")
+
+    jobs: List[Job] = []
+    for kind, keys in KIND_KEYS.items():
+        base = defaults.get(kind, {})
+        _check_keys(base, keys - {"url", "name"}, f"[defaults.{kind}]")
+        for index, entry in enumerate(data.get(kind, []), start=1):
+            label = f"[[{kind}]] #{index}"
+            _check_keys(entry, keys, label)
+            options = {**base, **entry}
+            if "url" not in options:
+                raise ValueError(f"{label} needs a url")
+            if kind == "scrape" and "video_selector" not in options:
+                raise ValueError(f"{label} needs a video_selector")
+            url = options.pop("url")
+            jobs.append(Job(kind, options.pop("name", url), url, options))
+    outputs: Dict[Path, str] = {}
+    for job in jobs:
+        if job.kind != "scrape" or not job.options.get("download") or job.options.get("all"):
+            continue
+        output = _output_file(job)
+        if output in outputs:
+            raise ValueError(f"{outputs[output]!r} and {job.name!r} both download to {output}")
+        outputs[output] = job.name
+    return settings, jobs
+
+
+def _output_file(job: Job) -> Path:
+    """A scrape job's ``output_file``, by default named after the job."""
+
+    if job.options.get("output_file"):
+        return Path(job.options["output_file"]).expanduser()
+    name = re.sub(r"[^\w.-]+", "_", job.name).strip("_.")
+    return Path(f"video_{name}.mp4")
+
+
+def _check_keys(table: Dict[str, Any], allowed: set, label: str) -> None:
+    unknown = set(table) - allowed
+    if unknown:
+        raise ValueError(f"Unknown key(s) in {label}: {', '.join(sorted(unknown))}")
+
+
+def _check_settings(settings: Dict[str, Any]) -> None:
+    workers = settings.get("workers", 1)
+    if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+        raise ValueError(f"[settings] workers must be a positive integer, not {workers!r}")
+    if "assumed_rate" in settings:
+        rate = settings["assumed_rate"]
+        try:
+            valid = not isinstance(rate, bool) and parse_rate(str(rate)) > 0
+        except ValueError:
+            valid = False
+        if not valid:
+            raise ValueError(f'[settings] assumed_rate must be a rate such as "10M", not {rate!r}')
+    if not isinstance(settings.get("archive", ""), str):
+        raise ValueError("[settings] archive must be a path")
+    if not isinstance(settings.get("metadata_cache", False), (bool, str)):
+        raise ValueError("[settings] metadata_cache must be true, false or a path")
+
+
+def _archived(entry: Dict[str, Any], archive: DownloadArchive | None) -> bool:
+    extractor = entry.get("ie_key") or entry.get("extractor_key")
+    if archive is None or not extractor or not entry.get("id"):
+        return False
+    return make_key(extractor, entry["id"]) in archive
+
+
+def estimate(
+    job: Job,
+    *,
+    cache: MetadataCache | None = None,
+    archive: DownloadArchive | None = None,
+    timings: StepTimings | None = None,
+    rate: float = ASSUMED_RATE,
+) -> None:
+    """Fill in ``job.bytes``/``job.seconds`` from local knowledge only (no network)."""
+
+    if job.kind == "scrape":
+        recorded = timings.expected_seconds(job.url) if timings is not None else None
+        pages = (job.options.get("max_pages") or 1) if job.options.get("all") else 1
+        job.seconds = (recorded or SCRAPE_SECONDS) * pages
+        job.estimated = recorded is not None
+        return
+
+    from .youtube import listing_entries
+
+    listing = cache.get(listing_key(job.url), max_age=None) if cache is not None else None
+    if listing is None:
+        job.seconds = UNKNOWN_SOURCE_SECONDS
+        job.detail = "(not listed yet)"
+        return
+    pending = [entry for entry in listing_entries(listing) if not _archived(entry, archive)]
+    total = 0
+    for entry in pending:
+        size = entry.get("filesize") or entry.get("filesize_approx")
+        if not size and entry.get("duration"):
+            size = entry["duration"] * VIDEO_BITRATE
+        total += int(size or VIDEO_BYTES)
+    job.bytes = total
+    job.seconds = total / rate + EXTRACT_SECONDS * len(pending)
+    job.estimated = True
+    job.detail = f"({len(pending)} new video(s))"
+
+
+def build_plan(
+    settings: Dict[str, Any],
+    jobs: List[Job],
+    *,
+    workers: int | None = None,
+    cache: MetadataCache | None = None,
+    archive: DownloadArchive | None = None,
+    timings: StepTimings | None = None,
+) -> Plan:
+    """Group jobs by host and credential, then order for throughput.
+
+    Groups run longest first (so the biggest one does not start last and
+    stretch the total); inside a group the cheapest jobs go first.
+    """
+
+    from .scraper import hostname_alias
+
+    rate = parse_rate(str(settings["assumed_rate"])) if "assumed_rate" in settings else None
+    groups: Dict[Tuple[str, ...], Group] = {}
+    for job in jobs:
+        estimate(job, cache=cache, archive=archive, timings=timings, rate=rate or ASSUMED_RATE)
+        if job.kind == "youtube":
+            credential = str(job.options.get("cookies") or "")
+            key: Tuple[str, ...] = ("youtube", host_of(job.url), credential)
+        else:
+            credential = job.options.get("credential_alias") or hostname_alias(job.url)
+            key = ("scrape", host_of(job.url), credential, job.options.get("engine", "browser"))
+        groups.setdefault(key, Group(job.kind, host_of(job.url), credential)).jobs.append(job)
+    for group in groups.values():
+        group.jobs.sort(key=lambda job: job.seconds)
+    ordered = sorted(groups.values(), key=lambda group: group.seconds, reverse=True)
+    return Plan(ordered, workers or int(settings.get("workers", 4)), settings)
+
+
+def run_plan(
+    plan: Plan,
+    *,
+    archive: DownloadArchive | None = None,
+    cache: MetadataCache | None = None,
+    metrics: DownloadMetrics | None = None,
+    output: TextIO | None = None,
+) -> List[JobResult]:
+    """Run every group on a pool of ``plan.workers`` threads; failures are reported, not raised.
+
+    Scrape groups share one logged-in browser; scraped URLs are written to
+    ``output`` (stdout) as JSON Lines tagged with the job name.
+    """
+
+    from . import scraper
+
+    output = output or sys.stdout
+    lock = threading.Lock()
+    aliases = {group.credential for group in plan.groups if group.kind == "scrape"}
+    credentials = scraper.CredentialStore().get_many(aliases) if aliases else {}
+    disk = DiskBudget()  # shared, since parallel groups often write to the same volume
+
+    def emit(record: Dict[str, Any]) -> None:
+        with lock:
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+
+    def run_group(group: Group) -> List[JobResult]:
+        results = []
+        pool = None
+        try:
+            for job in group.jobs:
+                started = time.monotonic()
+                result = JobResult(job.name, job.kind)
+                try:
+                    if job.kind == "youtube":
+                        _run_youtube(job, archive, cache, metrics, disk)
+                    else:
+                        login = credentials.get(group.credential)
+                        if login is None:
+                            raise RuntimeError(
+                                f"no stored credentials for {group.credential!r}; "
+                                "store them with scrape --remember"
+                            )
+                        if pool is None and job.options.get("engine", "browser") == "browser":
+                            pool = scraper.driver_pool(
+                                headless=job.options.get("headless", True),
+                                size=1,
+                                block_resources=job.options.get("block_resources", True),
+                            )
+                        _run_scrape(job, group.credential, login, pool, emit)
+                except Exception as exc:  # pragma: no cover - network dependent
+                    result.error = f"{type(exc).__name__}: {exc}"
+                    logging.error("Job %s failed: %s", job.name, result.error)
+                result.seconds = time.monotonic() - started
+                results.append(result)
+        finally:
+            if pool is not None:
+                pool.close()
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(plan.workers, 1)) as executor:
+        batches = list(executor.map(run_group, plan.groups))
+    return [result for batch in batches for result in batch]
+
+
+def _path(value: str | None) -> Path | None:
+    return Path(value).expanduser() if value else None
+
+
+def _run_youtube(
+    job: Job,
+    archive: DownloadArchive | None,
+    cache: MetadataCache | None,
+    metrics: DownloadMetrics | None,
+    disk: DiskBudget,
+) -> None:
+    from . import youtube
+
+    options = job.options
+    youtube.download_channel(
+        job.url,
+        output_dir=Path(options.get("output_dir", "downloads")).expanduser(),
+        video_format=options.get("format", "bestvideo+bestaudio"),
+        resume=options.get("resume", True),
+        rate_limit=options.get("rate_limit"),
+        cookies=_path(options.get("cookies")),
+        retries=options.get("retries", 3),
+        archive=archive,
+        incremental=options.get("incremental", False),
+        full_rescan=options.get("full_rescan", False),
+        metrics=metrics,
+        cache=cache,
+        postprocess_workers=options.get("postprocess_workers", 0),
+        checksum=options.get("checksum", False),
+        scratch_dir=_path(options.get("scratch_dir")),
+        disk=disk,
+    )
+
+
+def _run_scrape(job: Job, alias: str, login: Tuple[str, str], pool: Any, emit: Any) -> None:
+    from . import scraper
+
+    options = job.options
+    common = dict(
+        url=job.url,
+        username=login[0],
+        password=login[1],
+        username_field=options.get("username_field", "Email"),
+        password_field=options.get("password_field", "Password"),
+        navigation_steps=options.get("navigation", []),
+        video_selector=options["video_selector"],
+        video_attribute=options.get("video_attribute", "href"),
+        headless=options.get("headless", True),
+        wait_timeout=options.get("wait_timeout", 15),
+        credential_alias=alias,
+        pool=pool,
+        engine=options.get("engine", "browser"),
+        block_resources=options.get("block_resources", True),
+    )
+    if options.get("all"):
+        for video in scraper.scrape_portal_many(
+            next_page_selector=options.get("next_page"),
+            max_pages=options.get("max_pages"),
+            **common,
+        ):
+            emit({"job": job.name, "url": video.url, "page": video.page, "source": video.source})
+        return
+    output_file = _output_file(job)
+    video_url = scraper.scrape_portal(
+        download=options.get("download", False),
+        output_file=output_file,
+        segment_workers=options.get("segment_workers", 8),
+        scratch_dir=_path(options.get("scratch_dir")),
+        **common,
+    )
+    emit({"job": job.name, "url": video_url})
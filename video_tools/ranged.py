@@ -0,0 +1,259 @@
+"""Parallel byte-range downloader for progressive media files (MP4, WebM, MP3...)."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import posixpath
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from . import trace
+from .net import Session
+
+MIN_CHUNK = 1 << 20
+MAX_CHUNK = 64 << 20
+# Chunks per connection, so fast connections pick up the slow ones' share.
+CHUNKS_PER_CONNECTION = 4
+# Progress is persisted at most this often per chunk (bytes) for resume.
+CHECKPOINT_BYTES = 4 << 20
+
+# Containers a file can be saved as without remuxing; keyed by family.
+_FAMILY_SUFFIXES = {
+    "mp4": {".mp4", ".m4v", ".m4a", ".mov"},
+    "matroska": {".webm", ".mkv"},
+    "mp3": {".mp3"},
+    "mpegts": {".ts"},
+}
+_FAMILY_TYPES = {
+    "video/mp4": "mp4",
+    "audio/mp4": "mp4",
+    "video/x-m4v": "mp4",
+    "video/quicktime": "mp4",
+    "video/webm": "matroska",
+    "audio/webm": "matroska",
+    "video/x-matroska": "matroska",
+    "audio/mpeg": "mp3",
+    "video/mp2t": "mpegts",
+}
+_GENERIC_TYPES = {"", "application/octet-stream", "binary/octet-stream"}
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+class NeedsRemux(RuntimeError):
+    """The source is not a progressive file that can be saved as ``output_file`` as is."""
+
+
+@dataclass
+class Probe:
+    url: str
+    size: int | None
+    ranges: bool
+    content_type: str
+    validator: str
+
+
+def _family_of_suffix(path: str) -> str | None:
+    suffix = posixpath.splitext(path)[1].lower()
+    return next((name for name, values in _FAMILY_SUFFIXES.items() if suffix in values), None)
+
+
+def source_family(url: str, content_type: str) -> str | None:
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    if content_type not in _GENERIC_TYPES:
+        return _FAMILY_TYPES.get(content_type)
+    return _family_of_suffix(urlsplit(url).path)
+
+
+def probe(url: str, session: Session) -> Probe:
+    """One-byte ranged GET: reports size, range support and a validator (ETag/mtime)."""
+
+    response = session.get(url, headers={"Range": "bytes=0-0"}, ok_statuses=frozenset({200, 206}))
+    headers = response.headers
+    match = _CONTENT_RANGE.match(headers.get("Content-Range", ""))
+    if response.status == 206 and match and match.group(3) != "*":
+        size, ranges = int(match.group(3)), True
+    else:
+        length = headers.get("Content-Length")
+        size, ranges = (int(length) if length and length.isdigit() else None), False
+    if response.status == 206:
+        response.read()
+    else:
+        response.close()  # do not stream the whole file just to probe it
+    return Probe(
+        url=response.url,
+        size=size,
+        ranges=ranges,
+        content_type=headers.get("Content-Type", ""),
+        validator=headers.get("ETag") or headers.get("Last-Modified") or "",
+    )
+
+
+class _ResumeState:
+    """``<output>.part.json``: bytes already written per chunk, keyed on the source version."""
+
+    def __init__(self, path: Path, identity: Dict[str, object]) -> None:
+        self.path = path
+        self.identity = identity
+        self.done: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        try:
+            saved = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if saved.get("identity") == identity:
+            self.done = {int(index): int(count) for index, count in saved["done"].items()}
+
+    def update(self, index: int, written: int) -> None:
+        with self._lock:
+            self.done[index] = written
+            temp = self.path.with_name(self.path.name + ".tmp")
+            temp.write_text(json.dumps({"identity": self.identity, "done": self.done}))
+            os.replace(temp, self.path)
+
+
+def _pwrite(fd: int, data: bytes, offset: int, lock: threading.Lock) -> None:
+    if hasattr(os, "pwrite"):
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view, offset = view[written:], offset + written
+        return
+    with lock:  # pragma: no cover - Windows has no pwrite
+        os.lseek(fd, offset, os.SEEK_SET)
+        os.write(fd, data)
+
+
+def _plan(size: int, connections: int, chunk_size: int | None) -> List[Tuple[int, int]]:
+    if chunk_size is None:
+        chunk_size = min(max(size // (connections * CHUNKS_PER_CONNECTION), MIN_CHUNK), MAX_CHUNK)
+    return [(start, min(start + chunk_size, size) - 1) for start in range(0, size, chunk_size)]
+
+
+def download_ranged(
+    url: str,
+    output_file: Path,
+    *,
+    connections: int = 8,
+    session: Session | None = None,
+    chunk_size: int | None = None,
+) -> None:
+    """Download a progressive file over ``connections`` parallel byte-range requests.
+
+    Chunks are written in place into a preallocated ``<output_file>.part`` and
+    per-chunk progress is kept beside it, so an interrupted download resumes
+    the unfinished chunks. Servers without range support get one plain stream.
+    Raises :class:`NeedsRemux` when the source is a manifest or a container
+    that differs from ``output_file``'s (FFmpeg has to remux those).
+    """
+
+    own_session = session is None
+    session = session or Session()
+    try:
+        info = probe(url, session)
+        family = source_family(info.url, info.content_type)
+        wanted = _family_of_suffix(output_file.name)
+        if family is None or family != wanted:
+            raise NeedsRemux(
+                f"{info.content_type or 'unknown type'} cannot be saved as {output_file.suffix}"
+            )
+        with trace.span("download.ranged", host=urlsplit(url).hostname) as span:
+            if info.ranges and info.size:
+                _fetch_ranges(info, output_file, session, connections, chunk_size)
+            else:
+                logging.info("%s does not support ranges; downloading in one stream", url)
+                _fetch_stream(info, output_file, session)
+            span["bytes"] = output_file.stat().st_size
+    finally:
+        if own_session:
+            session.close()
+
+
+def _fetch_ranges(
+    info: Probe,
+    output_file: Path,
+    session: Session,
+    connections: int,
+    chunk_size: int | None,
+) -> None:
+    assert info.size is not None
+    part = output_file.with_name(output_file.name + ".part")
+    chunks = _plan(info.size, connections, chunk_size)
+    state = _ResumeState(
+        output_file.with_name(output_file.name + ".part.json"),
+        {
+            "url": info.url,
+            "size": info.size,
+            "validator": info.validator,
+            "chunk": chunks[0][1] + 1,
+        },
+    )
+    if not part.exists():
+        state.done = {}
+    todo = [
+        (index, start, end)
+        for index, (start, end) in enumerate(chunks)
+        if state.done.get(index, 0) < end - start + 1
+    ]
+    logging.info(
+        "Fetching %s in %d of %d chunk(s) over %d connection(s)",
+        info.url,
+        len(todo),
+        len(chunks),
+        connections,
+    )
+
+    fd = os.open(part, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+    seek_lock = threading.Lock()
+    try:
+        if os.fstat(fd).st_size != info.size:
+            os.ftruncate(fd, info.size)
+            if hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(fd, 0, info.size)
+                except OSError:  # filesystem without fallocate; sparse file is fine
+                    pass
+
+        def fetch(job: Tuple[int, int, int]) -> None:
+            index, start, end = job
+            written = state.done.get(index, 0)
+            headers = {"Range": f"bytes={start + written}-{end}"}
+            if info.validator.startswith(('"', "W/")):
+                headers["If-Range"] = info.validator
+            response = session.get(info.url, headers=headers, ok_statuses=frozenset({206}))
+            checkpoint = written
+            for data in response.iter_content(1 << 18):
+                if written + len(data) > end - start + 1:
+                    response.close()
+                    raise RuntimeError(f"Server sent more than the requested range of {info.url}")
+                _pwrite(fd, data, start + written, seek_lock)
+                written += len(data)
+                if written - checkpoint >= CHECKPOINT_BYTES:
+                    state.update(index, written)
+                    checkpoint = written
+            if written != end - start + 1:
+                state.update(index, written)
+                raise RuntimeError(f"Chunk {index} of {info.url} ended early")
+            state.update(index, written)
+
+        with ThreadPoolExecutor(max_workers=max(connections, 1)) as pool:
+            list(pool.map(fetch, todo))
+    finally:
+        os.close(fd)
+    part.replace(output_file)
+    state.path.unlink(missing_ok=True)
+
+
+def _fetch_stream(info: Probe, output_file: Path, session: Session) -> None:
+    part = output_file.with_name(output_file.name + ".part")
+    response = session.get(info.url)
+    with part.open("wb") as handle:
+        for data in response.iter_content(1 << 18):
+            handle.write(data)
+    part.replace(output_file)
@@ -0,0 +1,376 @@
+"""Shared per-host download scheduler: token buckets, AIMD concurrency and backoff."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from urllib.parse import urlparse
+
+_RATE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*$", re.IGNORECASE)
+_RATE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+_WINDOW_PATTERN = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*=\s*(\S+)\s*$")
+THROTTLE_PATTERN = re.compile(
+    r"\b429\b|too many requests|rate.?limit|confirm you.?re not a bot", re.IGNORECASE
+)
+# A throttled host regains one concurrent slot per quiet interval between runs.
+RECOVERY_INTERVAL = 600.0
+# Per-download throughput may drop this far below the best seen before growth stops.
+THROUGHPUT_FLOOR = 0.8
+
+
+def default_state_path() -> Path:
+    return Path.home() / ".video_tools" / "scheduler.json"
+
+
+def parse_rate(value: str | float | int) -> float:
+    """Convert yt-dlp style rates (``500K``, ``2M``) to bytes per second."""
+
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _RATE_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Invalid rate: {value!r}")
+    number, unit = match.groups()
+    return float(number) * _RATE_UNITS[unit.upper()]
+
+
+def host_of(url: str) -> str:
+    return (urlparse(url).hostname or "default").removeprefix("www.")
+
+
+class BandwidthSchedule:
+    """Time-of-day bandwidth caps such as ``"01:00-07:00=50M,07:00-23:00=5M"``.
+
+    Windows may wrap midnight; ``unlimited`` lifts the cap. Outside every
+    window there is no cap.
+    """
+
+    def __init__(self, windows: List[Tuple[int, int, float | None]]) -> None:
+        self.windows = windows
+
+    @classmethod
+    def parse(cls, text: str) -> BandwidthSchedule:
+        windows = []
+        for part in filter(None, (item.strip() for item in text.split(","))):
+            match = _WINDOW_PATTERN.match(part)
+            if not match:
+                raise ValueError(f"Invalid bandwidth window: {part!r} (expected HH:MM-HH:MM=RATE)")
+            start_h, start_m, end_h, end_m, rate = match.groups()
+            start, end = int(start_h) * 60 + int(start_m), int(end_h) * 60 + int(end_m)
+            if start >= 24 * 60 or end > 24 * 60:
+                raise ValueError(f"Invalid bandwidth window: {part!r}")
+            cap = None if rate.lower() == "unlimited" else parse_rate(rate)
+            windows.append((start, end, cap))
+        return cls(windows)
+
+    def current(self, now: datetime | None = None) -> float | None:
+        now = now or datetime.now()
+        minute = now.hour * 60 + now.minute
+        for start, end, cap in self.windows:
+            inside = start <= minute < end if start < end else minute >= start or minute < end
+            if inside:
+                return cap
+        return None
+
+
+@dataclass
+class HostState:
+    limit: float
+    backoff_level: int = 0
+    blocked_until: float = 0.0
+    best_throughput: float = 0.0
+    updated_at: float = 0.0
+
+
+class _Host:
+    def __init__(self, state: HostState, rate: float, burst: float, now: float) -> None:
+        self.state = state
+        self.active = 0
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.refilled_at = now
+        self.throughput = 0.0
+
+
+class Scheduler:
+    """Gatekeeper every download of a process goes through.
+
+    Per host it combines a token bucket on requests (``request_rate`` per
+    second, bursts of ``burst``), an AIMD concurrency limit between 1 and
+    ``per_host`` (halved on HTTP 429/bot checks, grown by ``1/limit`` per
+    finished download while per-download throughput holds up), and a jittered
+    exponential backoff during which no new work starts. Limits and backoff
+    are saved to ``state_path`` so the next run resumes where this one ended.
+    """
+
+    def __init__(
+        self,
+        *,
+        per_host: int = 2,
+        request_rate: float = 2.0,
+        burst: float = 5.0,
+        schedule: BandwidthSchedule | None = None,
+        state_path: Path | None = None,
+        base_delay: float = 2.0,
+        max_delay: float = 600.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.per_host = max(per_host, 1)
+        self.request_rate = request_rate
+        self.burst = max(burst, 1.0)
+        self.schedule = schedule
+        self.state_path = state_path
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.sleep = sleep
+        self._hosts: Dict[str, _Host] = {}
+        self._changed = threading.Condition()
+        self._saved: Dict[str, HostState] = self._load() if state_path else {}
+
+    # -- persistence -------------------------------------------------------
+
+    def _load(self) -> Dict[str, HostState]:
+        try:
+            raw = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logging.warning("Ignoring unreadable scheduler state %s: %s", self.state_path, exc)
+            return {}
+        now = self.clock()
+        saved = {}
+        for host, values in raw.items():
+            try:
+                state = HostState(**values)
+            except TypeError as exc:
+                logging.warning("Dropping saved scheduler state for %s: %s", host, exc)
+                continue
+            quiet = max(now - state.updated_at, 0.0)
+            state.limit = min(state.limit + quiet / RECOVERY_INTERVAL, float(self.per_host))
+            state.backoff_level = max(state.backoff_level - int(quiet // 3600), 0)
+            saved[host] = state
+        return saved
+
+    def save(self) -> None:
+        if self.state_path is None:
+            return
+        with self._changed:
+            data = {host: asdict(state) for host, state in self._saved.items()}
+            data.update({host: asdict(entry.state) for host, entry in self._hosts.items()})
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.state_path.with_name(self.state_path.name + ".tmp")
+        temp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(temp, self.state_path)
+
+    def close(self) -> None:
+        self.save()
+
+    def __enter__(self) -> Scheduler:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # -- scheduling --------------------------------------------------------
+
+    def _host(self, url: str) -> _Host:
+        host = host_of(url)
+        entry = self._hosts.get(host)
+        if entry is None:
+            now = self.clock()
+            state = self._saved.pop(host, None) or HostState(limit=float(self.per_host))
+            state.limit = min(max(state.limit, 1.0), float(self.per_host))
+            entry = self._hosts[host] = _Host(state, self.request_rate, self.burst, now)
+        return entry
+
+    def concurrency(self, url: str) -> int:
+        with self._changed:
+            return int(self._host(url).state.limit)
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """Hold one of the host's adaptive concurrency slots (waits out backoff)."""
+
+        with self._changed:
+            entry = self._host(url)
+            while True:
+                delay = entry.state.blocked_until - self.clock()
+                if delay <= 0 and entry.active < int(entry.state.limit):
+                    break
+                self._changed.wait(timeout=delay if delay > 0 else None)
+            entry.active += 1
+        try:
+            yield
+        finally:
+            with self._changed:
+                entry.active -= 1
+                self._changed.notify_all()
+
+    def acquire(self, url: str) -> float:
+        """Take one request token for the host, sleeping as needed; returns seconds waited."""
+
+        waited = 0.0
+        while True:
+            with self._changed:
+                entry = self._host(url)
+                now = self.clock()
+                delay = entry.state.blocked_until - now
+                if delay <= 0:
+                    if entry.rate <= 0:
+                        return waited
+                    entry.tokens = min(
+                        entry.burst, entry.tokens + (now - entry.refilled_at) * entry.rate
+                    )
+                    entry.refilled_at = now
+                    if entry.tokens >= 1:
+                        entry.tokens -= 1
+                        return waited
+                    delay = (1 - entry.tokens) / entry.rate
+            self.sleep(delay)
+            waited += delay
+
+    def record_throttle(self, url: str) -> float:
+        """Halve the host's concurrency and back off; returns the backoff in seconds."""
+
+        with self._changed:
+            entry = self._host(url)
+            state = entry.state
+            remaining = state.blocked_until - self.clock()
+            if remaining > 0:
+                # yt-dlp repeats the error on every retry; one backoff covers them all.
+                return remaining
+            delay = self.backoff(state.backoff_level)
+            state.backoff_level += 1
+            state.limit = max(state.limit / 2, 1.0)
+            state.blocked_until = max(state.blocked_until, self.clock() + delay)
+            state.updated_at = self.clock()
+            entry.tokens = 0.0
+        logging.warning(
+            "%s is throttling; concurrency %d, pausing new requests for %.0fs",
+            host_of(url),
+            int(state.limit),
+            delay,
+        )
+        self.save()
+        return delay
+
+    def record_success(self, url: str, nbytes: int, seconds: float) -> None:
+        """Feed a finished download into the host's AIMD controller."""
+
+        with self._changed:
+            entry = self._host(url)
+            state = entry.state
+            if seconds > 0 and nbytes > 0:
+                rate = nbytes / seconds
+                entry.throughput = (
+                    rate if not entry.throughput else 0.7 * entry.throughput + 0.3 * rate
+                )
+                state.best_throughput = max(state.best_throughput, entry.throughput)
+            state.backoff_level = 0
+            holding = entry.throughput >= THROUGHPUT_FLOOR * state.best_throughput
+            if holding and state.limit < self.per_host:
+                state.limit = min(state.limit + 1 / state.limit, float(self.per_host))
+                self._changed.notify_all()
+            state.updated_at = self.clock()
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered exponential delay: ``base * 2**attempt`` scaled by 0.5–1.5, capped."""
+
+        return min(self.base_delay * 2**attempt, self.max_delay) * random.uniform(0.5, 1.5)
+
+    def retry_sleep(self, n: int) -> float:
+        # yt-dlp calls ``retry_sleep_functions`` with the zero-based retry as ``n``.
+        return self.backoff(n)
+
+    def bandwidth_cap(self, now: datetime | None = None) -> float | None:
+        return self.schedule.current(now) if self.schedule else None
+
+    # -- yt-dlp integration ------------------------------------------------
+
+    def configure(self, opts: Dict[str, Any], url: str, *, bandwidth: bool = True) -> None:
+        """Route a YoutubeDL options dict for ``url`` through this scheduler.
+
+        Each playlist entry/video waits for a request token, retries sleep with
+        jittered backoff, throttling messages feed the AIMD controller, and
+        finished files count as successes. With ``bandwidth`` the
+        time-of-day cap is applied to ``ratelimit`` as downloads progress.
+        """
+
+        opts["retry_sleep_functions"] = {
+            kind: self.retry_sleep for kind in ("http", "fragment", "extractor", "file_access")
+        }
+        opts["match_filter"] = _GatedFilter(self, url, opts.get("match_filter"))
+        opts["logger"] = _ThrottleLogger(opts.get("logger"), lambda: self.record_throttle(url))
+        base = opts.get("ratelimit")
+        started: Dict[str, float] = {}
+
+        def hook(status: Dict[str, Any]) -> None:
+            name = status.get("filename") or ""
+            if status.get("status") == "downloading":
+                started.setdefault(name, self.clock())
+                if bandwidth and self.schedule is not None:
+                    cap = self.bandwidth_cap()
+                    limits = [limit for limit in (base, cap) if limit]
+                    opts["ratelimit"] = min(limits) if limits else None
+            elif status.get("status") == "finished":
+                elapsed = status.get("elapsed") or self.clock() - started.pop(name, self.clock())
+                nbytes = status.get("total_bytes") or status.get("downloaded_bytes") or 0
+                self.record_success(url, int(nbytes), float(elapsed))
+
+        opts.setdefault("progress_hooks", []).append(hook)
+
+
+class _GatedFilter:
+    """``match_filter`` that takes a request token before yt-dlp touches each entry."""
+
+    def __init__(self, scheduler: Scheduler, url: str, inner: Any) -> None:
+        self.scheduler = scheduler
+        self.url = url
+        self.inner = inner
+
+    def __call__(self, info: Dict[str, Any], *, incomplete: bool = False) -> str | None:
+        self.scheduler.acquire(self.url)
+        if self.inner is None:
+            return None
+        return self.inner(info, incomplete=incomplete)
+
+
+class _ThrottleLogger:
+    """Wrap a yt-dlp logger and report rate-limit responses to the scheduler."""
+
+    def __init__(self, inner: Any, on_throttle: Callable[[], Any]) -> None:
+        self.inner = inner
+        self.on_throttle = on_throttle
+
+    def debug(self, message: str) -> None:
+        if self.inner is not None:
+            self.inner.debug(message)
+
+    def info(self, message: str) -> None:
+        if self.inner is not None:
+            self.inner.info(message)
+
+    def warning(self, message: str) -> None:
+        if THROTTLE_PATTERN.search(message):
+            self.on_throttle()
+        if self.inner is not None:
+            self.inner.warning(message)
+
+    def error(self, message: str) -> None:
+        if THROTTLE_PATTERN.search(message):
+            self.on_throttle()
+        if self.inner is not None:
+            self.inner.error(message)
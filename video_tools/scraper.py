@@ -2,72 +2,179 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import os
+import shutil
 import subprocess
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, TYPE_CHECKING, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, TYPE_CHECKING, Tuple
 from urllib.parse import urlparse
 
-try:  # pragma: no cover
-    import keyring  # type: ignore
-except ImportError:  # pragma: no cover
-    keyring = None  # type: ignore
-try:  # pragma: no cover
-    from webdriver_manager.chrome import ChromeDriverManager  # type: ignore
-except ImportError:  # pragma: no cover
-    ChromeDriverManager = None  # type: ignore
+from . import _lazy, chromedriver, diskspace, ranged, segments, trace
+from .net import Session
+from .sessions import BrowserSession, CookieJarStore, DriverPool
+from .waits import WaitPolicy
+from .waits import block_resources as _block_resources
 
 if TYPE_CHECKING:  # pragma: no cover
     from selenium import webdriver
 
+    from .http_scraper import HTTPPortal
+    from .scheduler import Scheduler
+
+
+# Loaded on first use so the CLI and the HTTP engine never pay for them.
+keyring: Any = None
+ChromeDriverManager: Any = None
+
+
+def _keyring() -> Any:
+    global keyring
+    if keyring is None:
+        keyring = _lazy.load("keyring", "keyring")
+    return keyring
+
+
+def _chrome_driver_manager() -> Any:
+    global ChromeDriverManager
+    if ChromeDriverManager is None:
+        module = _lazy.load("webdriver_manager.chrome", "webdriver-manager")
+        ChromeDriverManager = module.ChromeDriverManager
+    return ChromeDriverManager
+
 
 def default_store_path() -> Path:
     return Path.home() / ".video_tools" / "credentials.json"
 
 
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Exclusive advisory lock on ``path`` (created if needed) across processes."""
+
+    with path.open("a+b") as handle:
+        try:
+            import fcntl
+        except ImportError:  # pragma: no cover - Windows
+            import msvcrt
+
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
 @dataclass
 class CredentialStore:
-    """Persist username metadata + secrets in keyring."""
+    """Persist username metadata + secrets in keyring.
+
+    The metadata file is parsed once and re-read only when its mtime/size
+    changes; writes are locked and atomically renamed so concurrent processes
+    cannot corrupt it. Secrets read from the keyring (a D-Bus round-trip on
+    some backends) are cached in memory for ``secret_ttl`` seconds.
+    """
 
     path: Path = field(default_factory=default_store_path)
+    secret_ttl: float = 300.0
 
     def __post_init__(self) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._data: dict = {}
+        self._signature: Tuple[int, int] | None = None
+        self._secrets: Dict[str, Tuple[str, float]] = {}
 
     def load(self) -> dict:
-        if not self.path.exists():
-            return {}
-        return json.loads(self.path.read_text(encoding="utf-8"))
+        with self._lock:
+            return dict(self._load_locked())
+
+    def _load_locked(self) -> dict:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._data, self._signature = {}, None
+            return self._data
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._signature = signature
+        return self._data
 
     def save_metadata(self, alias: str, username: str) -> None:
-        data = self.load()
-        data[alias] = {"username": username}
-        self.path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        self.save_many({alias: username})
+
+    def save_many(self, usernames: Dict[str, str]) -> None:
+        """Record ``alias -> username`` entries in one locked read-modify-write."""
+
+        with self._lock, _file_lock(self.path.with_name(self.path.name + ".lock")):
+            self._signature = None  # another process may have written since we looked
+            data = dict(self._load_locked())
+            for alias, username in usernames.items():
+                data[alias] = {"username": username}
+            temp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            temp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            os.replace(temp, self.path)
+            self._data = data
+            stat = self.path.stat()
+            self._signature = (stat.st_mtime_ns, stat.st_size)
 
     def get(self, alias: str) -> Tuple[str, str] | None:
-        data = self.load()
-        profile = data.get(alias)
-        if not profile:
-            return None
-        username = profile["username"]
-        if keyring is None:
-            raise RuntimeError(
-                "keyring is not installed. Install video-tools with its default extras."
-            )
-        password = keyring.get_password("video-tools", username)
-        if not password:
-            return None
-        return username, password
+        return self.get_many([alias])[alias]
+
+    def get_many(self, aliases: Iterable[str]) -> Dict[str, Tuple[str, str] | None]:
+        """Resolve several aliases with one metadata read and one keyring call per username."""
+
+        with self._lock:
+            data = self._load_locked()
+            profiles = {alias: data.get(alias) for alias in aliases}
+        result: Dict[str, Tuple[str, str] | None] = {}
+        for alias, profile in profiles.items():
+            if not profile:
+                result[alias] = None
+                continue
+            username = profile["username"]
+            password = self._secret(username)
+            result[alias] = (username, password) if password else None
+        return result
 
     def store(self, alias: str, username: str, password: str) -> None:
         self.save_metadata(alias, username)
-        if keyring is None:
-            raise RuntimeError(
-                "keyring is not installed. Install video-tools with its default extras."
-            )
-        keyring.set_password("video-tools", username, password)
+        _keyring().set_password("video-tools", username, password)
+        with self._lock:
+            self._secrets[username] = (password, time.monotonic() + self.secret_ttl)
+
+    def clear_secrets(self) -> None:
+        """Drop every cached secret so the next lookup goes back to the keyring."""
+
+        with self._lock:
+            self._secrets.clear()
+
+    def _secret(self, username: str) -> str | None:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._secrets.get(username)
+            if cached is not None and cached[1] > now:
+                return cached[0]
+            self._secrets.pop(username, None)
+        password = _keyring().get_password("video-tools", username)
+        if password and self.secret_ttl > 0:
+            with self._lock:
+                self._secrets[username] = (password, now + self.secret_ttl)
+        return password
 
 
 def selector_to_by(selector: str) -> Tuple[str, str]:
@@ -97,6 +204,7 @@ def _resolve_by(strategy: str, By) -> str:
 
 
 def _selenium():
+    _lazy.load("selenium", "selenium")
     from selenium import webdriver
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support import expected_conditions as EC
@@ -107,48 +215,184 @@ def _selenium():
     return webdriver, By, EC, WebDriverWait, Options, Service
 
 
-def create_driver(headless: bool = True):
+def resolve_chromedriver(
+    driver_path: Path | str | None = None, *, refresh: bool = False
+) -> chromedriver.DriverInfo:
+    """Pinned, cached or freshly resolved ChromeDriver (see :mod:`video_tools.chromedriver`)."""
+
+    resolver = chromedriver.DriverResolver(lambda: _chrome_driver_manager()().install())
+    return resolver.resolve(driver_path, refresh=refresh)
+
+
+def create_driver(
+    headless: bool = True,
+    block_resources: bool = False,
+    driver_path: Path | str | None = None,
+    arguments: Iterable[str] = (),
+):
+    """Launch Chrome; ``block_resources`` skips images, fonts and media while navigating.
+
+    ``driver_path`` pins a local ChromeDriver binary instead of resolving one;
+    ``arguments`` are extra Chrome switches (e.g. ``--user-data-dir``).
+    """
+
     webdriver, _, _, _, Options, Service = _selenium()
-    if ChromeDriverManager is None:
-        raise RuntimeError(
-            "webdriver-manager is not installed. Install video-tools with its default dependencies."
-        )
     options = Options()
     if headless:
         options.add_argument("--headless")
+    if block_resources:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
     options.add_argument("--disable-gpu")
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--disable-extensions")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    for argument in arguments:
+        options.add_argument(argument)
+    with trace.span("driver.install") as span:
+        resolved = resolve_chromedriver(driver_path)
+        span["source"] = resolved.source
+    service = Service(str(resolved.driver))
+    with trace.span("driver.launch", headless=headless):
+        driver = webdriver.Chrome(service=service, options=options)
+    if block_resources:
+        _block_resources(driver)
     return driver
 
 
-def login_and_navigate(
+def login(
     driver: webdriver.Chrome,
     *,
-    url: str,
     username: str,
     password: str,
     username_field: str,
     password_field: str,
-    navigation_steps: Iterable[str],
     wait_timeout: int,
+    waits: WaitPolicy | None = None,
 ) -> None:
-    _, By, EC, WebDriverWait, _, _ = _selenium()
+    """Fill and submit the login form on the current page."""
 
-    driver.get(url)
-    wait = WebDriverWait(driver, wait_timeout)
+    _, By, _, _, _, _ = _selenium()
+
+    waits = waits or WaitPolicy(timeout=wait_timeout)
+    with trace.span("login", host=hostname_alias(driver.current_url)):
+        waits.element(driver, (By.NAME, username_field), "login").send_keys(username)
+        waits.element(driver, (By.NAME, password_field), "login").send_keys(password + "\n")
 
-    wait.until(EC.presence_of_element_located((By.NAME, username_field))).send_keys(username)
-    wait.until(EC.presence_of_element_located((By.NAME, password_field))).send_keys(password + "\n")
 
-    for raw_selector in navigation_steps:
+def login_required(driver: webdriver.Chrome, username_field: str) -> bool:
+    """Return True when the current page shows the login form."""
+
+    _, By, _, _, _, _ = _selenium()
+    return bool(driver.find_elements(By.NAME, username_field))
+
+
+def navigate(
+    driver: webdriver.Chrome,
+    navigation_steps: Iterable[str],
+    wait_timeout: int,
+    waits: WaitPolicy | None = None,
+) -> None:
+    _, By, _, _, _, _ = _selenium()
+
+    waits = waits or WaitPolicy(timeout=wait_timeout)
+    for index, raw_selector in enumerate(navigation_steps, start=1):
         strategy, query = selector_to_by(raw_selector)
         locator = (_resolve_by(strategy, By), query)
-        wait.until(EC.element_to_be_clickable(locator)).click()
+        with trace.span("navigate", step=index, selector=raw_selector):
+            waits.element(driver, locator, f"navigate:{index}", clickable=True).click()
+
+
+def login_and_navigate(
+    driver: webdriver.Chrome,
+    *,
+    url: str,
+    username: str,
+    password: str,
+    username_field: str,
+    password_field: str,
+    navigation_steps: Iterable[str],
+    wait_timeout: int,
+    waits: WaitPolicy | None = None,
+) -> None:
+    driver.get(url)
+    login(
+        driver,
+        username=username,
+        password=password,
+        username_field=username_field,
+        password_field=password_field,
+        wait_timeout=wait_timeout,
+        waits=waits,
+    )
+    navigate(driver, navigation_steps, wait_timeout, waits)
+
+
+def open_authenticated(
+    session: BrowserSession,
+    *,
+    url: str,
+    username: str,
+    password: str,
+    username_field: str,
+    password_field: str,
+    wait_timeout: int,
+    cookies: CookieJarStore | None = None,
+    waits: WaitPolicy | None = None,
+) -> None:
+    """Load ``url`` in ``session``, logging in only when the portal asks for it.
+
+    Warm sessions that are still logged in skip the form entirely; fresh
+    sessions first try the cookies saved for the alias by an earlier login.
+    """
+
+    driver = session.driver
+    with trace.span("page.load", url=url):
+        driver.get(url)
+    if session.authenticated:
+        if not login_required(driver, username_field):
+            return
+        logging.info("Session for %s was logged out; logging in again", session.alias)
+        session.authenticated = False
+    elif cookies is not None:
+        saved = cookies.load(session.alias)
+        if saved:
+            for cookie in saved:
+                try:
+                    driver.add_cookie(cookie)
+                except Exception:  # cookie for another domain/path
+                    logging.debug("Skipping cookie %s", cookie.get("name"))
+            driver.get(url)
+            if not login_required(driver, username_field):
+                logging.info("Reused saved session cookies for %s", session.alias)
+                session.authenticated = True
+                return
+            cookies.clear(session.alias)
+
+    login(
+        driver,
+        username=username,
+        password=password,
+        username_field=username_field,
+        password_field=password_field,
+        wait_timeout=wait_timeout,
+        waits=waits,
+    )
+    session.authenticated = True
+    if cookies is None:
+        return
+    # The form only submits; the session cookie arrives with the response or its redirect.
+    waits = waits or WaitPolicy(timeout=wait_timeout)
+    deadline = waits.clock() + waits.timeout_for(driver.current_url, "login")
+    while login_required(driver, username_field):
+        if waits.clock() >= deadline:
+            logging.warning("Login to %s not confirmed; not saving its cookies", session.alias)
+            return
+        time.sleep(waits.poll)
+    cookies.save(session.alias, driver.get_cookies())
 
 
 def extract_video_url(
@@ -157,27 +401,276 @@ def extract_video_url(
     selector: str,
     attribute: str,
     wait_timeout: int,
+    waits: WaitPolicy | None = None,
 ) -> str:
+    _, By, _, _, _, _ = _selenium()
+
+    waits = waits or WaitPolicy(timeout=wait_timeout)
+    strategy, query = selector_to_by(selector)
+    with trace.span("extract", selector=selector):
+        element = waits.element(driver, (_resolve_by(strategy, By), query), "extract")
+        return element.get_attribute(attribute)
+
+
+def extract_video_urls(
+    driver: webdriver.Chrome,
+    *,
+    selector: str,
+    attribute: str,
+    wait_timeout: int,
+    waits: WaitPolicy | None = None,
+) -> List[str]:
+    """Return ``attribute`` of every element matching ``selector`` on the current page."""
+
+    _, By, _, _, _, _ = _selenium()
+
+    waits = waits or WaitPolicy(timeout=wait_timeout)
+    strategy, query = selector_to_by(selector)
+    with trace.span("extract", selector=selector) as span:
+        elements = waits.elements(driver, (_resolve_by(strategy, By), query), "extract")
+        values = (element.get_attribute(attribute) for element in elements)
+        found = [value for value in values if value]
+        span["count"] = len(found)
+    return found
+
+
+def next_page(
+    driver: webdriver.Chrome,
+    selector: str,
+    wait_timeout: int,
+    waits: WaitPolicy | None = None,
+    results: str | None = None,
+) -> bool:
+    """Click the pagination control; returns False when there is no further page.
+
+    ``results`` (the video selector) marks the current page's list, so pages
+    updated in place are detected as soon as that list is re-rendered.
+    """
+
+    from selenium.common.exceptions import TimeoutException
+
     _, By, EC, WebDriverWait, _, _ = _selenium()
 
-    wait = WebDriverWait(driver, wait_timeout)
+    waits = waits or WaitPolicy(timeout=wait_timeout)
     strategy, query = selector_to_by(selector)
-    element = wait.until(EC.presence_of_element_located((_resolve_by(strategy, By), query)))
-    return element.get_attribute(attribute)
-
-
-def download_with_ffmpeg(video_url: str, output_file: Path) -> None:
-    command = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        video_url,
-        "-c",
-        "copy",
-        str(output_file),
-    ]
+    candidates = driver.find_elements(_resolve_by(strategy, By), query)
+    control = next((el for el in candidates if el.is_displayed() and el.is_enabled()), None)
+    if control is None or control.get_attribute("aria-disabled") == "true":
+        return False
+    # Full-page pagination replaces <body>; in-place pagination replaces the results.
+    markers = [driver.find_element(By.TAG_NAME, "body")]
+    if results:
+        result_strategy, result_query = selector_to_by(results)
+        markers += driver.find_elements(_resolve_by(result_strategy, By), result_query)[:1]
+    with trace.span("next_page"):
+        control.click()
+        try:
+            WebDriverWait(driver, min(wait_timeout, 5), poll_frequency=waits.poll).until(
+                lambda current: any(EC.staleness_of(marker)(current) for marker in markers)
+            )
+        except TimeoutException:
+            pass
+        waits.settle(driver, "next_page")
+    return True
+
+
+def download_with_ffmpeg(
+    video_url: str,
+    output_file: Path,
+    *,
+    segment_workers: int = 8,
+    scratch_dir: Path | None = None,
+    scheduler: Scheduler | None = None,
+    session: Any = None,
+) -> None:
+    """Download ``video_url`` with ``segment_workers`` parallel connections.
+
+    HLS/DASH manifests are fetched segment by segment before remuxing, and
+    progressive files in ``output_file``'s container are fetched as byte ranges.
+    FFmpeg only handles what needs remuxing (or everything with one worker).
+    With ``scratch_dir`` the download and its temp files live there until the
+    finished file is moved to ``output_file``. A ``scheduler`` holds one of the
+    host's slots and a request token for the whole download, learns from
+    HTTP 429s on segment and range requests, and records the throughput.
+    """
+
+    if scheduler is not None:
+        with scheduler.slot(video_url), Session(on_throttle=scheduler.record_throttle) as session:
+            scheduler.acquire(video_url)
+            started = scheduler.clock()
+            download_with_ffmpeg(
+                video_url,
+                output_file,
+                segment_workers=segment_workers,
+                scratch_dir=scratch_dir,
+                session=session,
+            )
+            elapsed = scheduler.clock() - started
+            scheduler.record_success(video_url, output_file.stat().st_size, elapsed)
+        return
+
+    if scratch_dir is not None:
+        # Named after the target, so an interrupted ranged download resumes.
+        digest = hashlib.sha1(str(output_file.absolute()).encode("utf-8")).hexdigest()[:12]
+        work_dir = scratch_dir / f"{output_file.stem}-{digest}"
+        work_dir.mkdir(parents=True, exist_ok=True)
+        work_file = work_dir / output_file.name
+        download_with_ffmpeg(video_url, work_file, segment_workers=segment_workers, session=session)
+        diskspace.move_file(work_file, output_file)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        return
+
+    if segment_workers > 1 and download_native(
+        video_url, output_file, workers=segment_workers, session=session
+    ):
+        return
+    command = ffmpeg_command(video_url, output_file)
     logging.info("Running FFmpeg command: %s", " ".join(command))
-    subprocess.run(command, check=True)
+    with trace.span("download.ffmpeg", host=hostname_alias(video_url)) as span:
+        subprocess.run(command, check=True)
+        span["bytes"] = output_file.stat().st_size
+
+
+def download_native(
+    video_url: str, output_file: Path, *, workers: int = 8, session: Any = None
+) -> bool:
+    """Fetch a manifest's segments or a progressive file's byte ranges over ``workers`` connections.
+
+    Returns False, having written nothing final, when only FFmpeg can handle the URL.
+    """
+
+    if segments.is_manifest_url(video_url):
+        try:
+            with trace.span("download.segments", host=hostname_alias(video_url)) as span:
+                segments.download_segmented(
+                    video_url, output_file, workers=workers, session=session
+                )
+                span["bytes"] = output_file.stat().st_size
+            return True
+        except segments.UnsupportedManifest as exc:
+            logging.info("Falling back to FFmpeg for %s: %s", video_url, exc)
+    elif urlparse(video_url).scheme in ("http", "https"):
+        try:
+            ranged.download_ranged(video_url, output_file, connections=workers, session=session)
+            return True
+        except ranged.NeedsRemux as exc:
+            logging.info("Falling back to FFmpeg for %s: %s", video_url, exc)
+    return False
+
+
+def ffmpeg_command(video_url: str, output_file: Path) -> List[str]:
+    """FFmpeg invocation that copies ``video_url``'s streams into ``output_file``."""
+
+    return ["ffmpeg", "-y", "-i", video_url, "-c", "copy", str(output_file)]
+
+
+def driver_pool(
+    *,
+    headless: bool = True,
+    size: int = 2,
+    cookies: CookieJarStore | None = None,
+    block_resources: bool = False,
+    driver_path: Path | str | None = None,
+) -> DriverPool:
+    """Return a :class:`DriverPool` that launches Chrome via :func:`create_driver`."""
+
+    return DriverPool(
+        lambda: create_driver(
+            headless=headless, block_resources=block_resources, driver_path=driver_path
+        ),
+        size=size,
+        cookies=cookies,
+    )
+
+
+@contextmanager
+def _portal_session(
+    *,
+    url: str,
+    username: str,
+    password: str,
+    username_field: str,
+    password_field: str,
+    navigation_steps: Iterable[str],
+    headless: bool,
+    wait_timeout: int,
+    credential_alias: str | None,
+    pool: DriverPool | None,
+    cookies: CookieJarStore | None,
+    waits: WaitPolicy | None = None,
+    block_resources: bool = False,
+    driver_path: Path | str | None = None,
+) -> Iterator[webdriver.Chrome]:
+    alias = credential_alias or hostname_alias(url)
+    own_pool = pool is None
+    if pool is None:
+        pool = driver_pool(
+            headless=headless,
+            size=1,
+            cookies=cookies,
+            block_resources=block_resources,
+            driver_path=driver_path,
+        )
+    cookies = cookies or pool.cookies
+    try:
+        with pool.session(alias) as session:
+            try:
+                open_authenticated(
+                    session,
+                    url=url,
+                    username=username,
+                    password=password,
+                    username_field=username_field,
+                    password_field=password_field,
+                    wait_timeout=wait_timeout,
+                    cookies=cookies,
+                    waits=waits,
+                )
+                navigate(session.driver, navigation_steps, wait_timeout, waits)
+                yield session.driver
+            except Exception:
+                # A logged-out or broken session must not be replayed on the next run.
+                if cookies is not None:
+                    cookies.clear(alias)
+                raise
+    finally:
+        if own_pool:
+            pool.close()
+
+
+@contextmanager
+def _http_portal(
+    *,
+    url: str,
+    username: str,
+    password: str,
+    username_field: str,
+    password_field: str,
+    navigation_steps: Iterable[str],
+    wait_timeout: int,
+) -> Iterator[HTTPPortal]:
+    from .http_scraper import HTTPPortal
+
+    portal = HTTPPortal(timeout=wait_timeout)
+    try:
+        portal.open(url)
+        if portal.login_required(username_field):
+            portal.login(
+                username=username,
+                password=password,
+                username_field=username_field,
+                password_field=password_field,
+            )
+        for raw_selector in navigation_steps:
+            portal.click(raw_selector)
+        yield portal
+    finally:
+        portal.close()
+
+
+def _http_attributes(portal: HTTPPortal, selector: str, attribute: str) -> List[str]:
+    values = (portal.attribute(node, attribute) for node in portal.find_all(selector))
+    return [value for value in values if value]
 
 
 def scrape_portal(
@@ -194,29 +687,195 @@ def scrape_portal(
     output_file: Path,
     headless: bool,
     wait_timeout: int = 15,
+    segment_workers: int = 8,
+    credential_alias: str | None = None,
+    pool: DriverPool | None = None,
+    cookies: CookieJarStore | None = None,
+    engine: str = "browser",
+    waits: WaitPolicy | None = None,
+    block_resources: bool = False,
+    driver_path: Path | str | None = None,
+    scratch_dir: Path | None = None,
+    scheduler: Scheduler | None = None,
 ) -> str:
-    """Navigate site, return video URL, optionally download via ffmpeg."""
+    """Navigate site, return video URL, optionally download via ffmpeg.
+
+    Pass a shared ``pool`` to keep authenticated browsers warm across calls;
+    ``cookies`` (or the pool's cookie store) lets fresh browsers skip the login
+    form while the saved session is still valid. ``engine="http"`` runs the
+    same steps without a browser for server-rendered portals. ``waits`` sets
+    the polling, idle detection and learned per-step timeouts of the browser;
+    ``driver_path`` pins the ChromeDriver binary. Downloads are staged in
+    ``scratch_dir`` when given and gated by ``scheduler`` when given.
+    """
+
+    with trace.span("scrape_portal", host=hostname_alias(url), engine=engine):
+        if engine == "http":
+            with _http_portal(
+                url=url,
+                username=username,
+                password=password,
+                username_field=username_field,
+                password_field=password_field,
+                navigation_steps=navigation_steps,
+                wait_timeout=wait_timeout,
+            ) as portal:
+                found = _http_attributes(portal, video_selector, video_attribute)
+                if not found:
+                    raise RuntimeError(f"No {video_attribute!r} found for {video_selector!r}")
+                video_url = found[0]
+        elif engine == "browser":
+            with _portal_session(
+                url=url,
+                username=username,
+                password=password,
+                username_field=username_field,
+                password_field=password_field,
+                navigation_steps=navigation_steps,
+                headless=headless,
+                wait_timeout=wait_timeout,
+                credential_alias=credential_alias,
+                pool=pool,
+                cookies=cookies,
+                waits=waits,
+                block_resources=block_resources,
+                driver_path=driver_path,
+            ) as driver:
+                video_url = extract_video_url(
+                    driver,
+                    selector=video_selector,
+                    attribute=video_attribute,
+                    wait_timeout=wait_timeout,
+                    waits=waits,
+                )
+        else:
+            raise ValueError(f"Unknown scrape engine: {engine!r}")
 
-    driver = create_driver(headless=headless)
-    try:
-        login_and_navigate(
-            driver,
-            url=url,
-            username=username,
-            password=password,
-            username_field=username_field,
-            password_field=password_field,
-            navigation_steps=navigation_steps,
-            wait_timeout=wait_timeout,
-        )
-        video_url = extract_video_url(
-            driver,
-            selector=video_selector,
-            attribute=video_attribute,
-            wait_timeout=wait_timeout,
-        )
         if download:
-            download_with_ffmpeg(video_url, output_file)
-        return video_url
-    finally:
-        driver.quit()
+            download_with_ffmpeg(
+                video_url,
+                output_file,
+                segment_workers=segment_workers,
+                scratch_dir=scratch_dir,
+                scheduler=scheduler,
+            )
+    return video_url
+
+
+@dataclass
+class ScrapedVideo:
+    url: str
+    page: int
+    source: str
+
+
+def scrape_portal_many(
+    *,
+    url: str,
+    username: str,
+    password: str,
+    username_field: str,
+    password_field: str,
+    navigation_steps: Iterable[str],
+    video_selector: str,
+    video_attribute: str,
+    headless: bool,
+    wait_timeout: int = 15,
+    next_page_selector: str | None = None,
+    max_pages: int | None = None,
+    credential_alias: str | None = None,
+    pool: DriverPool | None = None,
+    cookies: CookieJarStore | None = None,
+    engine: str = "browser",
+    waits: WaitPolicy | None = None,
+    block_resources: bool = False,
+    driver_path: Path | str | None = None,
+) -> Iterator[ScrapedVideo]:
+    """Yield every distinct video URL matching ``video_selector`` from one login.
+
+    Follows ``next_page_selector`` until it disappears or ``max_pages`` is
+    reached. Results are yielded as each page is read, so callers can stream them.
+    """
+
+    login_options = dict(
+        url=url,
+        username=username,
+        password=password,
+        username_field=username_field,
+        password_field=password_field,
+        navigation_steps=navigation_steps,
+        wait_timeout=wait_timeout,
+    )
+    if engine == "http":
+        pages = _http_pages(login_options, video_selector, video_attribute, next_page_selector)
+    elif engine == "browser":
+        pages = _browser_pages(
+            login_options,
+            video_selector,
+            video_attribute,
+            next_page_selector,
+            headless=headless,
+            credential_alias=credential_alias,
+            pool=pool,
+            cookies=cookies,
+            waits=waits,
+            block_resources=block_resources,
+            driver_path=driver_path,
+        )
+    else:
+        raise ValueError(f"Unknown scrape engine: {engine!r}")
+
+    seen = set()
+    page = 0
+    for page, source, video_urls in pages:
+        for video_url in video_urls:
+            if video_url not in seen:
+                seen.add(video_url)
+                yield ScrapedVideo(url=video_url, page=page, source=source)
+        if max_pages and page >= max_pages:
+            break
+    pages.close()
+    logging.info("Collected %d unique video URL(s) across %d page(s)", len(seen), page)
+
+
+def _browser_pages(
+    login_options: dict,
+    selector: str,
+    attribute: str,
+    next_page_selector: str | None,
+    **session_options,
+) -> Iterator[Tuple[int, str, List[str]]]:
+    wait_timeout = login_options["wait_timeout"]
+    waits = session_options.get("waits")
+    with _portal_session(**login_options, **session_options) as driver:
+        page = 1
+        while True:
+            video_urls = extract_video_urls(
+                driver,
+                selector=selector,
+                attribute=attribute,
+                wait_timeout=wait_timeout,
+                waits=waits,
+            )
+            yield page, driver.current_url, video_urls
+            if not next_page_selector or not next_page(
+                driver, next_page_selector, wait_timeout, waits=waits, results=selector
+            ):
+                return
+            page += 1
+
+
+def _http_pages(
+    login_options: dict, selector: str, attribute: str, next_page_selector: str | None
+) -> Iterator[Tuple[int, str, List[str]]]:
+    with _http_portal(**login_options) as portal:
+        page = 1
+        while True:
+            yield page, portal.url, _http_attributes(portal, selector, attribute)
+            if not next_page_selector or not portal.find_all(next_page_selector):
+                return
+            previous = portal.url
+            portal.click(next_page_selector)
+            if portal.url == previous:
+                return
+            page += 1
@@ -0,0 +1,415 @@
+"""Parallel HLS/DASH segment fetcher with local FFmpeg remux."""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import shutil
+import subprocess
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from .net import Session
+
+MANIFEST_SUFFIXES = (".m3u8", ".mpd")
+
+
+class UnsupportedManifest(RuntimeError):
+    """Raised for manifests the native fetcher cannot handle (callers fall back to FFmpeg)."""
+
+
+@dataclass
+class Segment:
+    url: str
+    byte_range: Tuple[int, int] | None = None  # inclusive start/end
+
+
+@dataclass
+class SegmentPlaylist:
+    segments: List[Segment] = field(default_factory=list)
+    init: Segment | None = None
+
+
+def is_manifest_url(url: str) -> bool:
+    return urlsplit(url).path.lower().endswith(MANIFEST_SUFFIXES)
+
+
+# --- HLS -------------------------------------------------------------------------------------
+
+_ATTRIBUTE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+def _attributes(line: str) -> Dict[str, str]:
+    return {key: value.strip('"') for key, value in _ATTRIBUTE.findall(line.split(":", 1)[1])}
+
+
+def _byte_range(spec: str, previous_end: int) -> Tuple[int, int]:
+    length, _, offset = spec.partition("@")
+    start = int(offset) if offset else previous_end + 1
+    return start, start + int(length) - 1
+
+
+def parse_m3u8(text: str, base_url: str) -> Tuple[SegmentPlaylist | None, List[str]]:
+    """Parse an HLS playlist.
+
+    Returns ``(playlist, [])`` for media playlists and ``(None, renditions)`` for
+    master playlists, where ``renditions`` holds the best variant's URL followed
+    by its separate audio rendition when there is one.
+    """
+
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if not lines or lines[0] != "#EXTM3U":
+        raise UnsupportedManifest("Not an HLS playlist")
+
+    variants: List[Tuple[int, str, str | None]] = []
+    audio: Dict[str, str] = {}
+    playlist = SegmentPlaylist()
+    pending_range: str | None = None
+    last_end = -1
+    stream_info: Dict[str, str] | None = None
+
+    for line in lines[1:]:
+        if line.startswith("#EXT-X-STREAM-INF"):
+            stream_info = _attributes(line)
+        elif line.startswith("#EXT-X-MEDIA") and "TYPE=AUDIO" in line:
+            attrs = _attributes(line)
+            if "URI" in attrs and (attrs.get("DEFAULT") == "YES" or attrs["GROUP-ID"] not in audio):
+                audio[attrs["GROUP-ID"]] = urljoin(base_url, attrs["URI"])
+        elif line.startswith("#EXT-X-KEY"):
+            if _attributes(line).get("METHOD", "NONE") != "NONE":
+                raise UnsupportedManifest("Encrypted HLS streams are handled by FFmpeg")
+        elif line.startswith("#EXT-X-MAP"):
+            attrs = _attributes(line)
+            init_range = None
+            if "BYTERANGE" in attrs:
+                init_range = _byte_range(attrs["BYTERANGE"], -1)
+            playlist.init = Segment(urljoin(base_url, attrs["URI"]), init_range)
+        elif line.startswith("#EXT-X-BYTERANGE"):
+            pending_range = line.split(":", 1)[1]
+        elif line.startswith("#"):
+            continue
+        elif stream_info is not None:
+            bandwidth = int(stream_info.get("BANDWIDTH", "0"))
+            variants.append((bandwidth, urljoin(base_url, line), stream_info.get("AUDIO")))
+            stream_info = None
+        else:
+            byte_range = None
+            if pending_range:
+                byte_range = _byte_range(pending_range, last_end)
+                last_end = byte_range[1]
+                pending_range = None
+            playlist.segments.append(Segment(urljoin(base_url, line), byte_range))
+
+    if variants:
+        _, url, group = max(variants, key=lambda variant: variant[0])
+        renditions = [url]
+        if group and group in audio:
+            renditions.append(audio[group])
+        return None, renditions
+    if "#EXT-X-ENDLIST" not in lines:
+        raise UnsupportedManifest("Live HLS playlists are handled by FFmpeg")
+    return playlist, []
+
+
+# --- DASH ------------------------------------------------------------------------------------
+
+_DURATION = re.compile(
+    r"^P(?:(?P<days>\d+(?:\.\d+)?)D)?"
+    r"(?:T(?:(?P<hours>\d+(?:\.\d+)?)H)?(?:(?P<minutes>\d+(?:\.\d+)?)M)?"
+    r"(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?$"
+)
+_TEMPLATE = re.compile(r"\$(RepresentationID|Number|Time|Bandwidth)(?:%0(\d+)d)?\$")
+
+
+def _iso_duration(value: str | None) -> float:
+    match = _DURATION.match(value or "")
+    if not match:
+        return 0.0
+    parts = {key: float(number or 0) for key, number in match.groupdict().items()}
+    return parts["days"] * 86400 + parts["hours"] * 3600 + parts["minutes"] * 60 + parts["seconds"]
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child(element: ET.Element, name: str) -> ET.Element | None:
+    for child in element:
+        if _local(child.tag) == name:
+            return child
+    return None
+
+
+def _children(element: ET.Element, name: str) -> List[ET.Element]:
+    return [child for child in element if _local(child.tag) == name]
+
+
+def _inherited(name: str, *elements: ET.Element) -> ET.Element | None:
+    # Elements with no children are falsy, so ``or`` chains cannot be used here.
+    for element in elements:
+        child = _child(element, name)
+        if child is not None:
+            return child
+    return None
+
+
+def _base(element: ET.Element, base_url: str) -> str:
+    node = _child(element, "BaseURL")
+    if node is not None and node.text:
+        return urljoin(base_url, node.text.strip())
+    return base_url
+
+
+def _fill_template(template: str, values: Dict[str, object]) -> str:
+    def replace(match: re.Match) -> str:
+        value = values[match.group(1)]
+        width = match.group(2)
+        return str(value).zfill(int(width)) if width else str(value)
+
+    return _TEMPLATE.sub(replace, template).replace("$$", "$")
+
+
+def _repeat_to_end(
+    following: List[ET.Element],
+    template: ET.Element,
+    time: int,
+    duration: int,
+    period_duration: float,
+) -> int:
+    """Repeat count of an ``r="-1"`` entry: up to the next ``S@t`` or the end of the period."""
+
+    if following and following[0].get("t") is not None:
+        end = int(following[0].get("t"))
+    elif not following and period_duration:
+        offset = int(template.get("presentationTimeOffset", "0"))
+        end = offset + round(period_duration * int(template.get("timescale", "1")))
+    else:
+        raise UnsupportedManifest('SegmentTimeline r="-1" without a known end')
+    if duration <= 0 or end <= time:
+        raise UnsupportedManifest('SegmentTimeline r="-1" without a known end')
+    return math.ceil((end - time) / duration) - 1
+
+
+def _representation_playlist(
+    representation: ET.Element,
+    adaptation: ET.Element,
+    base_url: str,
+    period_duration: float,
+) -> SegmentPlaylist:
+    base_url = _base(representation, base_url)
+    values: Dict[str, object] = {
+        "RepresentationID": representation.get("id", ""),
+        "Bandwidth": representation.get("bandwidth", "0"),
+    }
+    playlist = SegmentPlaylist()
+
+    segment_list = _inherited("SegmentList", representation, adaptation)
+    template = _inherited("SegmentTemplate", representation, adaptation)
+
+    if segment_list is not None:
+        init = _child(segment_list, "Initialization")
+        if init is not None and init.get("sourceURL"):
+            playlist.init = Segment(urljoin(base_url, init.get("sourceURL")))
+        for item in _children(segment_list, "SegmentURL"):
+            playlist.segments.append(Segment(urljoin(base_url, item.get("media", ""))))
+        return playlist
+
+    if template is not None:
+        if template.get("initialization"):
+            playlist.init = Segment(
+                urljoin(base_url, _fill_template(template.get("initialization"), values))
+            )
+        media = template.get("media")
+        if not media:
+            raise UnsupportedManifest("SegmentTemplate without media attribute")
+        number = int(template.get("startNumber", "1"))
+        timescale = int(template.get("timescale", "1"))
+        timeline = _child(template, "SegmentTimeline")
+        if timeline is not None:
+            time = 0
+            entries = _children(timeline, "S")
+            for index, entry in enumerate(entries):
+                time = int(entry.get("t", time))
+                duration = int(entry.get("d"))
+                repeat = int(entry.get("r", "0"))
+                if repeat < 0:
+                    repeat = _repeat_to_end(
+                        entries[index + 1 :], template, time, duration, period_duration
+                    )
+                for _ in range(repeat + 1):
+                    values.update(Number=number, Time=time)
+                    playlist.segments.append(
+                        Segment(urljoin(base_url, _fill_template(media, values)))
+                    )
+                    number += 1
+                    time += duration
+        else:
+            duration = int(template.get("duration", "0"))
+            if not duration or not period_duration:
+                raise UnsupportedManifest("SegmentTemplate without timeline or duration")
+            for offset in range(math.ceil(period_duration * timescale / duration)):
+                values.update(Number=number + offset, Time=offset * duration)
+                playlist.segments.append(Segment(urljoin(base_url, _fill_template(media, values))))
+        return playlist
+
+    # SegmentBase or bare BaseURL: the representation is a single file.
+    playlist.segments.append(Segment(base_url))
+    return playlist
+
+
+def parse_mpd(text: str, base_url: str) -> List[SegmentPlaylist]:
+    """Return the best video and best audio representation of a static MPD."""
+
+    root = ET.fromstring(text)
+    if root.get("type", "static") != "static":
+        raise UnsupportedManifest("Live DASH manifests are handled by FFmpeg")
+    base_url = _base(root, base_url)
+    periods = _children(root, "Period")
+    if len(periods) != 1:
+        raise UnsupportedManifest("Multi-period DASH manifests are handled by FFmpeg")
+    period = periods[0]
+    period_duration = _iso_duration(period.get("duration") or root.get("mediaPresentationDuration"))
+    period_base = _base(period, base_url)
+
+    best: Dict[str, Tuple[int, SegmentPlaylist]] = {}
+    for adaptation in _children(period, "AdaptationSet"):
+        if _children(adaptation, "ContentProtection"):
+            raise UnsupportedManifest("DRM-protected DASH streams are not supported")
+        adaptation_base = _base(adaptation, period_base)
+        for representation in _children(adaptation, "Representation"):
+            mime = representation.get("mimeType") or adaptation.get("mimeType") or ""
+            kind = (adaptation.get("contentType") or mime.split("/")[0]) or "video"
+            if kind not in ("video", "audio"):
+                continue
+            bandwidth = int(representation.get("bandwidth", "0"))
+            if kind not in best or bandwidth > best[kind][0]:
+                playlist = _representation_playlist(
+                    representation, adaptation, adaptation_base, period_duration
+                )
+                best[kind] = (bandwidth, playlist)
+    if not best:
+        raise UnsupportedManifest("No audio/video representations found")
+    return [best[kind][1] for kind in ("video", "audio") if kind in best]
+
+
+# --- Fetching --------------------------------------------------------------------------------
+
+
+def resolve_manifest(url: str, session: Session) -> List[SegmentPlaylist]:
+    """Fetch ``url`` and return one playlist per stream that must be remuxed together."""
+
+    text = session.get(url).text()
+    if urlsplit(url).path.lower().endswith(".mpd") or text.lstrip().startswith("<"):
+        return parse_mpd(text, url)
+    playlist, renditions = parse_m3u8(text, url)
+    if playlist is not None:
+        return [playlist]
+    playlists = []
+    for rendition in renditions:
+        media, _ = parse_m3u8(session.get(rendition).text(), rendition)
+        if media is None:
+            raise UnsupportedManifest("Nested HLS master playlists are not supported")
+        playlists.append(media)
+    return playlists
+
+
+def fetch_segment(session: Session, segment: Segment, destination: Path) -> Path:
+    """Download one segment, resuming a previous ``.part`` file when the server allows it."""
+
+    if destination.exists():
+        return destination
+    part = destination.with_name(destination.name + ".part")
+    offset = part.stat().st_size if part.exists() else 0
+    start, end = segment.byte_range or (0, None)
+    headers = {}
+    if segment.byte_range or offset:
+        headers["Range"] = f"bytes={start + offset}-{'' if end is None else end}"
+
+    # Sub-range segments are only correct if the server honours the range.
+    ok_statuses = frozenset({206}) if segment.byte_range else frozenset({200, 206})
+    response = session.get(segment.url, headers=headers, ok_statuses=ok_statuses)
+    if offset and response.status != 206:
+        offset = 0  # server ignored the range; start the segment over
+    with part.open("r+b" if offset else "wb") as handle:
+        handle.seek(offset)
+        for chunk in response.iter_content():
+            handle.write(chunk)
+        handle.truncate()
+    part.replace(destination)
+    return destination
+
+
+def fetch_playlist(
+    playlist: SegmentPlaylist, work_dir: Path, session: Session, *, workers: int = 8
+) -> Path:
+    """Fetch all segments concurrently and join them into one local stream file."""
+
+    work_dir.mkdir(parents=True, exist_ok=True)
+    jobs: List[Tuple[Segment, Path]] = []
+    if playlist.init is not None:
+        jobs.append((playlist.init, work_dir / "init.seg"))
+    jobs.extend(
+        (segment, work_dir / f"{index:06d}.seg") for index, segment in enumerate(playlist.segments)
+    )
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        paths = list(pool.map(lambda job: fetch_segment(session, *job), jobs))
+
+    joined = work_dir / "joined.bin"
+    with joined.open("wb") as output:
+        for path in paths:
+            with path.open("rb") as handle:
+                shutil.copyfileobj(handle, output, 1 << 20)
+    return joined
+
+
+def remux(inputs: List[Path], output_file: Path) -> None:
+    command = ["ffmpeg", "-y", "-loglevel", "error"]
+    for path in inputs:
+        command += ["-i", str(path)]
+    for index in range(len(inputs)):
+        command += ["-map", str(index)]
+    command += ["-c", "copy", str(output_file)]
+    logging.info("Running FFmpeg command: %s", " ".join(command))
+    subprocess.run(command, check=True)
+
+
+def download_segmented(
+    url: str,
+    output_file: Path,
+    *,
+    workers: int = 8,
+    session: Session | None = None,
+) -> None:
+    """Download an HLS/DASH stream segment-by-segment in parallel, then remux with FFmpeg.
+
+    Segments are kept in ``<output_file>.segments/`` until the remux succeeds,
+    so an interrupted download resumes where it stopped. Raises
+    :class:`UnsupportedManifest` for live, encrypted or unusual manifests.
+    """
+
+    own_session = session is None
+    session = session or Session()
+    work_dir = output_file.with_name(output_file.name + ".segments")
+    try:
+        playlists = resolve_manifest(url, session)
+        logging.info(
+            "Fetching %d segment(s) from %s with %d workers",
+            sum(len(playlist.segments) for playlist in playlists),
+            url,
+            workers,
+        )
+        inputs = [
+            fetch_playlist(playlist, work_dir / f"stream{index}", session, workers=workers)
+            for index, playlist in enumerate(playlists)
+        ]
+        remux(inputs, output_file)
+    finally:
+        if own_session:
+            session.close()
+    shutil.rmtree(work_dir, ignore_errors=True)
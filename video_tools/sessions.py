@@ -0,0 +1,197 @@
+"""Warm browser session pool and persisted cookie jar for authenticated portals."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+
+def default_cookie_dir() -> Path:
+    return Path.home() / ".video_tools" / "cookies"
+
+
+@dataclass
+class CookieJarStore:
+    """Per-alias browser cookies saved after login and reused until ``ttl`` expires."""
+
+    directory: Path = field(default_factory=default_cookie_dir)
+    ttl: float = 3600.0
+
+    def _path(self, alias: str) -> Path:
+        return self.directory / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', alias)}.json"
+
+    def load(self, alias: str) -> List[Dict[str, Any]] | None:
+        path = self._path(alias)
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        now = time.time()
+        if now - data.get("saved_at", 0) > self.ttl:
+            return None
+        # Drop cookies that expired on their own since they were saved.
+        return [cookie for cookie in data["cookies"] if cookie.get("expiry", now + 1) > now]
+
+    def save(self, alias: str, cookies: List[Dict[str, Any]]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(alias)
+        tmp = path.with_suffix(".tmp")
+        # Session cookies are credentials: keep them private to the user.
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump({"saved_at": time.time(), "cookies": cookies}, handle)
+        os.replace(tmp, path)
+
+    def clear(self, alias: str) -> None:
+        self._path(alias).unlink(missing_ok=True)
+
+
+@dataclass
+class BrowserSession:
+    driver: Any
+    alias: str
+    created_at: float = field(default_factory=time.monotonic)
+    authenticated: bool = False
+
+
+class DriverPool:
+    """Keep up to ``size`` warm WebDriver sessions per credential alias.
+
+    Idle sessions are health-checked before reuse and quit once older than
+    ``ttl`` seconds. A session that raises inside :meth:`session` is evicted.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        *,
+        size: int = 2,
+        ttl: float = 900.0,
+        cookies: CookieJarStore | None = None,
+    ) -> None:
+        self.factory = factory
+        self.size = size
+        self.ttl = ttl
+        self.cookies = cookies
+        self._idle: Dict[str, List[BrowserSession]] = {}
+        self._busy: Dict[str, int] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._holders: Dict[int, BrowserSession] = {}
+
+    @contextmanager
+    def session(self, alias: str) -> Iterator[BrowserSession]:
+        session = self._acquire(alias)
+        holder = threading.get_ident()
+        with self._cond:
+            self._holders[holder] = session
+        try:
+            yield session
+        except GeneratorExit:
+            # A consumer stopped iterating early; the browser itself is fine.
+            self._forget(holder, session)
+            self._release(session)
+            raise
+        except BaseException:
+            self._forget(holder, session)
+            self._discard(session)
+            raise
+        self._forget(holder, session)
+        self._release(session)
+
+    def kill(self, holder: int) -> bool:
+        """Quit the browser the thread ``holder`` is using, aborting its work there.
+
+        The thread's next WebDriver call fails and the session is evicted.
+        Returns False when that thread holds no session.
+        """
+
+        with self._cond:
+            session = self._holders.pop(holder, None)
+        if session is None:
+            return False
+        _quit(session)
+        return True
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = [session for sessions in self._idle.values() for session in sessions]
+            self._idle.clear()
+            self._cond.notify_all()
+        for session in idle:
+            _quit(session)
+
+    def __enter__(self) -> DriverPool:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def healthy(self, session: BrowserSession) -> bool:
+        if time.monotonic() - session.created_at > self.ttl:
+            return False
+        try:
+            return session.driver.execute_script("return 1") == 1
+        except Exception:  # dead browser or lost chromedriver connection
+            return False
+
+    def _acquire(self, alias: str) -> BrowserSession:
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed")
+                idle = self._idle.get(alias)
+                candidate = idle.pop() if idle else None
+                if candidate is None and self._busy.get(alias, 0) >= self.size:
+                    self._cond.wait()
+                    continue
+                self._busy[alias] = self._busy.get(alias, 0) + 1
+            if candidate is not None:
+                if self.healthy(candidate):
+                    return candidate
+                logging.debug("Evicting stale browser session for %s", alias)
+                self._discard(candidate)
+                continue
+            try:
+                return BrowserSession(driver=self.factory(), alias=alias)
+            except BaseException:
+                self._done(alias)
+                raise
+
+    def _release(self, session: BrowserSession) -> None:
+        with self._cond:
+            if not self._closed:
+                self._idle.setdefault(session.alias, []).append(session)
+                self._busy[session.alias] -= 1
+                self._cond.notify()
+                return
+        self._discard(session)
+
+    def _forget(self, holder: int, session: BrowserSession) -> None:
+        with self._cond:
+            if self._holders.get(holder) is session:
+                del self._holders[holder]
+
+    def _discard(self, session: BrowserSession) -> None:
+        _quit(session)
+        self._done(session.alias)
+
+    def _done(self, alias: str) -> None:
+        with self._cond:
+            self._busy[alias] -= 1
+            self._cond.notify()
+
+
+def _quit(session: BrowserSession) -> None:
+    try:
+        session.driver.quit()
+    except Exception:  # pragma: no cover - browser already gone
+        logging.debug("Browser for %s did not quit cleanly", session.alias)
@@ -0,0 +1,219 @@
+"""Content-addressed media store: one copy per unique file, linked into place."""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import logging
+import mmap
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+CHUNK_SIZE = 1 << 20
+MMAP_THRESHOLD = 16 * 1024 * 1024
+LINK_MODES = ("hardlink", "reflink")
+_FICLONE = 0x40049409  # linux/fs.h
+
+
+def hash_file(path: Path, chunk_size: int = CHUNK_SIZE) -> str:
+    """Return the SHA-256 of ``path``, read in chunks (memory-mapped for large files)."""
+
+    digest = hashlib.sha256()
+    with path.open("rb", buffering=0) as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            try:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for offset in range(0, size, chunk_size):
+                            digest.update(view[offset : offset + chunk_size])
+                    finally:
+                        view.release()
+                return digest.hexdigest()
+            except (OSError, ValueError):  # e.g. filesystems without mmap support
+                digest = hashlib.sha256()
+                handle.seek(0)
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while read := handle.readinto(buffer):
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def link_file(source: Path, target: Path, mode: str = "hardlink") -> None:
+    """Atomically replace ``target`` with a hardlink or reflink of ``source``."""
+
+    temp = target.with_name(f".{target.name}.link")
+    temp.unlink(missing_ok=True)
+    if mode == "reflink":
+        _reflink(source, temp)
+    else:
+        os.link(source, temp)
+    os.replace(temp, target)
+
+
+def _reflink(source: Path, target: Path) -> None:
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "reflinks are only supported on Linux")
+    import fcntl
+
+    with source.open("rb") as src, target.open("wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            target.unlink(missing_ok=True)
+            raise
+
+
+class ContentStore:
+    """Files stored once under ``objects/<aa>/<sha256>`` and linked to their paths.
+
+    Hardlinks need the store on the same filesystem as the media; ``reflink``
+    gives copy-on-write clones (Btrfs, XFS) so editing one path cannot change
+    the others. If linking fails the file is left untouched.
+    """
+
+    def __init__(self, root: Path, *, link_mode: str = "hardlink") -> None:
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"link_mode must be one of {', '.join(LINK_MODES)}")
+        self.root = root
+        self.link_mode = link_mode
+        (root / "objects").mkdir(parents=True, exist_ok=True)
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    def ingest(self, path: Path, digest: str | None = None) -> Tuple[str, int]:
+        """Store ``path`` (or link it to an existing copy); returns digest and bytes saved."""
+
+        digest = digest or hash_file(path)
+        stored = self.object_path(digest)
+        if stored.exists():
+            if _same_file(stored, path):
+                return digest, 0
+            size = path.stat().st_size
+            if stored.stat().st_size != size:  # pragma: no cover - hash collision guard
+                raise ValueError(f"{path} does not match stored object {digest}")
+            try:
+                link_file(stored, path, self.link_mode)
+            except OSError as exc:
+                logging.warning("Could not link %s to the content store: %s", path, exc)
+                return digest, 0
+            logging.debug("Deduplicated %s (%s)", path, digest[:12])
+            return digest, size
+        stored.parent.mkdir(exist_ok=True)
+        try:
+            if self.link_mode == "reflink":
+                _reflink(path, stored)
+            else:
+                os.link(path, stored)
+        except OSError as exc:
+            if exc.errno != errno.EEXIST:
+                logging.warning("Could not add %s to the content store: %s", path, exc)
+                return digest, 0
+            return self.ingest(path, digest)  # another worker stored it first
+        return digest, 0
+
+    def postprocessor(self) -> _StorePostProcessor:
+        return _StorePostProcessor(self)
+
+
+class _StorePostProcessor:
+    """yt-dlp ``after_move`` hook that ingests each finished file."""
+
+    def __init__(self, store: ContentStore) -> None:
+        self.store = store
+
+    def set_downloader(self, downloader: Any) -> None:
+        pass
+
+    def run(self, info: Dict[str, Any]) -> tuple:
+        filepath = info.get("filepath")
+        if filepath and os.path.isfile(filepath):
+            self.store.ingest(Path(filepath))
+        return [], info
+
+
+@dataclass
+class DedupeReport:
+    files: int = 0
+    hashed: int = 0
+    duplicates: int = 0
+    reclaimed_bytes: int = 0
+
+
+def dedupe_tree(
+    roots: Iterable[Path],
+    *,
+    store: ContentStore | None = None,
+    workers: int = 4,
+    min_size: int = 1,
+    dry_run: bool = False,
+    link_mode: str = "hardlink",
+) -> DedupeReport:
+    """Link identical files under ``roots`` together, hashing in parallel.
+
+    Only files sharing a size with another file are hashed. With ``store``
+    every hashed file is also ingested into the content store.
+    """
+
+    report = DedupeReport()
+    by_size: Dict[int, List[Path]] = defaultdict(list)
+    skip = store.root.resolve() if store is not None else None
+    for root in roots:
+        for directory, dirnames, filenames in os.walk(root):
+            if skip is not None and Path(directory).resolve() == skip:
+                dirnames[:] = []
+                continue
+            for name in filenames:
+                path = Path(directory) / name
+                if path.is_symlink() or name.startswith("."):
+                    continue
+                size = path.stat().st_size
+                if size >= min_size:
+                    by_size[size].append(path)
+                    report.files += 1
+
+    candidates = [path for paths in by_size.values() if len(paths) > 1 for path in paths]
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        digests = list(pool.map(hash_file, candidates))
+    report.hashed = len(candidates)
+
+    groups: Dict[str, List[Path]] = defaultdict(list)
+    for path, digest in zip(candidates, digests):
+        groups[digest].append(path)
+    for digest, paths in groups.items():
+        keep, *copies = paths
+        size = keep.stat().st_size
+        for path in copies:
+            if _same_file(keep, path):
+                continue
+            report.duplicates += 1
+            if dry_run:
+                report.reclaimed_bytes += size
+                continue
+            if store is not None:
+                continue  # ingest below links every copy to the stored object
+            try:
+                link_file(keep, path, link_mode)
+                report.reclaimed_bytes += size
+            except OSError as exc:
+                logging.warning("Could not link %s to %s: %s", path, keep, exc)
+        if store is not None and not dry_run:
+            for path in paths:
+                report.reclaimed_bytes += store.ingest(path, digest)[1]
+    return report
+
+
+def _same_file(a: Path, b: Path) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
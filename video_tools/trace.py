@@ -0,0 +1,188 @@
+"""Span-based phase timing for scrape and download runs, exportable as a Chrome trace."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, TextIO
+
+# The active tracer; ``None`` keeps :func:`span` down to one global lookup.
+_tracer: Tracer | None = None
+
+
+@dataclass
+class Span:
+    name: str
+    attrs: Dict[str, Any]
+    tid: int
+    start: float = 0.0
+    duration: float = 0.0
+    children: float = 0.0
+    tracer: Tracer | None = field(default=None, repr=False)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.attrs[key] = value
+
+    def __enter__(self) -> Span:
+        self.start = time.perf_counter()
+        stack = self.tracer._stack()
+        stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration = time.perf_counter() - self.start
+        stack = self.tracer._stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += self.duration
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer._finish(self)
+
+    @property
+    def self_time(self) -> float:
+        return max(self.duration - self.children, 0.0)
+
+
+class _NullSpan:
+    """Shared no-op span used while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+@dataclass
+class PhaseStats:
+    name: str
+    count: int = 0
+    total: float = 0.0
+    self_total: float = 0.0
+    longest: float = 0.0
+
+
+class Tracer:
+    """Collects finished spans from every thread."""
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def span(self, name: str, **attrs: Any) -> Span:
+        return Span(name, attrs, threading.get_ident(), tracer=self)
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> List[PhaseStats]:
+        """Per-name totals, longest total first; self time excludes nested spans."""
+
+        phases: Dict[str, PhaseStats] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            stats = phases.setdefault(span.name, PhaseStats(span.name))
+            stats.count += 1
+            stats.total += span.duration
+            stats.self_total += span.self_time
+            stats.longest = max(stats.longest, span.duration)
+        return sorted(phases.values(), key=lambda stats: stats.total, reverse=True)
+
+    def print_summary(self, stream: TextIO) -> None:
+        rows = self.summary()
+        if not rows:
+            stream.write("No spans recorded.\n")
+            return
+        width = max(len("phase"), *(len(row.name) for row in rows))
+        stream.write(
+            f"{'phase':<{width}}  {'count':>5}  {'total s':>9}  {'self s':>9}  {'max s':>8}\n"
+        )
+        for row in rows:
+            stream.write(
+                f"{row.name:<{width}}  {row.count:>5}  {row.total:>9.3f}"
+                f"  {row.self_total:>9.3f}  {row.longest:>8.3f}\n"
+            )
+
+    def chrome_events(self) -> List[Dict[str, Any]]:
+        """Complete ("X") events in the Chrome trace-event format (microseconds)."""
+
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        threads = {tid: index for index, tid in enumerate(dict.fromkeys(s.tid for s in spans))}
+        events = [
+            {
+                "name": span.name,
+                "ph": "X",
+                "ts": round((span.start - self.origin) * 1e6, 1),
+                "dur": round(span.duration * 1e6, 1),
+                "pid": pid,
+                "tid": threads[span.tid],
+                "args": {key: _jsonable(value) for key, value in span.attrs.items()},
+            }
+            for span in spans
+        ]
+        events.sort(key=lambda event: event["ts"])
+        return events
+
+    def write_chrome(self, path: Path) -> None:
+        """Write a file loadable in chrome://tracing or https://ui.perfetto.dev."""
+
+        payload = {"traceEvents": self.chrome_events(), "displayTimeUnit": "ms"}
+        path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def span(name: str, **attrs: Any) -> Span | _NullSpan:
+    """Context manager timing ``name``; a shared no-op unless tracing is enabled."""
+
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, **attrs)
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def enable() -> Tracer:
+    """Start recording spans process-wide and return the tracer."""
+
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable() -> Tracer | None:
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
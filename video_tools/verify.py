@@ -0,0 +1,283 @@
+"""Parallel integrity check of a download tree with an incremental checksum manifest."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from .metacache import MetadataCache, file_key
+from .store import hash_file
+
+MEDIA_EXTENSIONS = {
+    ".mp4", ".m4v", ".mkv", ".webm", ".mov", ".flv", ".avi", ".ts",
+    ".m4a", ".mp3", ".opus", ".ogg", ".aac", ".flac", ".wav",
+}  # fmt: skip
+PARTIAL_EXTENSIONS = {".part", ".ytdl"}
+MANIFEST_NAME = ".verify.sqlite3"
+# Container duration may differ from the extractor's rounded value by a little.
+DURATION_TOLERANCE = 0.02
+MIN_DURATION_SLACK = 2.0
+
+OK = "ok"
+CORRUPT = "corrupt"
+TRUNCATED = "truncated"
+PARTIAL = "partial"
+CHANGED = "changed"
+
+
+@dataclass
+class FileCheck:
+    path: Path
+    status: str
+    size: int
+    mtime_ns: int
+    sha256: str | None = None
+    duration: float | None = None
+    error: str | None = None
+    url: str | None = None
+    archive_key: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == OK
+
+
+@dataclass
+class VerifyReport:
+    checked: List[FileCheck] = field(default_factory=list)
+    skipped: int = 0
+
+    @property
+    def bad(self) -> List[FileCheck]:
+        return [check for check in self.checked if not check.ok]
+
+
+class Manifest:
+    """Per-tree record of each file's size, mtime, checksum and last verdict.
+
+    The expected metadata (source URL, duration, size) is kept with it, so
+    files stay checkable after their metadata cache entry has expired.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+            " sha256 TEXT, duration REAL, status TEXT NOT NULL, error TEXT,"
+            " verified_at REAL NOT NULL, expected TEXT) WITHOUT ROWID"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(files)")}
+        if "expected" not in columns:  # manifests written before it was kept
+            self._conn.execute("ALTER TABLE files ADD COLUMN expected TEXT")
+        self._conn.commit()
+
+    def get(self, path: str) -> Dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, sha256, status, expected FROM files WHERE path = ?",
+                (path,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "size": row[0],
+            "mtime_ns": row[1],
+            "sha256": row[2],
+            "status": row[3],
+            "expected": json.loads(row[4]) if row[4] else None,
+        }
+
+    def record(self, path: str, check: FileCheck, expected: Dict[str, Any] | None = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files"
+                " (path, size, mtime_ns, sha256, duration, status, error, verified_at, expected)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    path,
+                    check.size,
+                    check.mtime_ns,
+                    check.sha256,
+                    check.duration,
+                    check.status,
+                    check.error,
+                    time.time(),
+                    json.dumps(expected) if expected else None,
+                ),
+            )
+            self._conn.commit()
+
+    def forget_missing(self, present: set[str]) -> int:
+        with self._lock:
+            rows = self._conn.execute("SELECT path FROM files").fetchall()
+            gone = [(path,) for (path,) in rows if path not in present]
+            self._conn.executemany("DELETE FROM files WHERE path = ?", gone)
+            self._conn.commit()
+        return len(gone)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def probe(path: Path) -> Dict[str, Any]:
+    """Return ffprobe's format/stream summary; errors it prints are under ``"errors"``."""
+
+    if shutil.which("ffprobe") is None:
+        raise RuntimeError("ffprobe is required for verify; install FFmpeg.")
+    result = subprocess.run(
+        [
+            "ffprobe", "-v", "error", "-show_entries",
+            "format=duration:stream=codec_type,duration", "-of", "json", str(path),
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )  # fmt: skip
+    info = json.loads(result.stdout or "{}")
+    info["errors"] = result.stderr.strip()
+    info["returncode"] = result.returncode
+    return info
+
+
+def check_media(
+    path: Path, expected: Dict[str, Any] | None = None
+) -> tuple[str, float | None, str]:
+    """Classify ``path`` as ok/corrupt/truncated from ffprobe and expected metadata."""
+
+    info = probe(path)
+    streams = info.get("streams") or []
+    try:
+        duration = float(info.get("format", {}).get("duration"))
+    except (TypeError, ValueError):
+        duration = None
+    if info["returncode"] != 0 or not streams:
+        return CORRUPT, duration, info["errors"] or "no readable streams"
+    if not duration or duration <= 0:
+        return CORRUPT, duration, "container reports no duration"
+    expected = expected or {}
+    size = path.stat().st_size
+    if expected.get("filesize") and size < expected["filesize"] * (1 - DURATION_TOLERANCE):
+        return TRUNCATED, duration, f"{size} of {expected['filesize']} bytes"
+    wanted = expected.get("duration")
+    if wanted and duration < wanted - max(MIN_DURATION_SLACK, wanted * DURATION_TOLERANCE):
+        return TRUNCATED, duration, f"{duration:.1f}s of {wanted:.1f}s"
+    if info["errors"]:
+        return CORRUPT, duration, info["errors"].splitlines()[0]
+    return OK, duration, ""
+
+
+def iter_media(root: Path) -> Iterator[Path]:
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+        for name in filenames:
+            suffix = os.path.splitext(name)[1].lower()
+            if suffix in MEDIA_EXTENSIONS or suffix in PARTIAL_EXTENSIONS:
+                yield Path(directory) / name
+
+
+def verify_tree(
+    root: Path,
+    *,
+    manifest: Manifest | None = None,
+    cache: MetadataCache | None = None,
+    workers: int = 4,
+    full: bool = False,
+    checksum: bool = True,
+) -> VerifyReport:
+    """Check every media file under ``root`` in parallel.
+
+    Files whose size and mtime match a previous ``ok`` verdict in ``manifest``
+    are skipped unless ``full``. A file whose content hash changed although its
+    previous verdict was ok is reported as ``changed`` (silent corruption).
+    """
+
+    manifest = manifest or Manifest(root / MANIFEST_NAME)
+    report = VerifyReport()
+    present: set[str] = set()
+    todo: List[tuple[Path, str, os.stat_result, Dict[str, Any] | None]] = []
+    for path in iter_media(root):
+        relative = path.relative_to(root).as_posix()
+        present.add(relative)
+        stat = path.stat()
+        previous = manifest.get(relative)
+        if (
+            not full
+            and previous is not None
+            and previous["status"] == OK
+            and previous["size"] == stat.st_size
+            and previous["mtime_ns"] == stat.st_mtime_ns
+        ):
+            report.skipped += 1
+            continue
+        todo.append((path, relative, stat, previous))
+
+    def check_one(item: tuple[Path, str, os.stat_result, Dict[str, Any] | None]) -> FileCheck:
+        path, relative, stat, previous = item
+        expected = cache.get(file_key(path)) if cache is not None else None
+        if not expected and previous:
+            expected = previous["expected"]
+        check = FileCheck(path=path, status=OK, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        if expected:
+            check.url = expected.get("url")
+            check.archive_key = expected.get("archive_key")
+        if path.suffix.lower() in PARTIAL_EXTENSIONS:
+            check.status, check.error = PARTIAL, "incomplete download left behind"
+        else:
+            try:
+                check.status, check.duration, check.error = check_media(path, expected)
+                if checksum:
+                    check.sha256 = hash_file(path)
+            except (OSError, ValueError) as exc:
+                check.status, check.error = CORRUPT, str(exc)
+            unchanged = previous and (previous["size"], previous["mtime_ns"]) == (
+                stat.st_size,
+                stat.st_mtime_ns,
+            )
+            if (
+                check.ok
+                and unchanged
+                and previous["status"] == OK
+                and previous["sha256"]
+                and check.sha256
+                and previous["sha256"] != check.sha256
+            ):
+                check.status, check.error = CHANGED, "content changed without size/mtime change"
+        manifest.record(relative, check, expected)
+        if not check.ok:
+            logging.warning("%s: %s (%s)", check.status.upper(), path, check.error)
+        return check
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        report.checked = list(pool.map(check_one, todo))
+    removed = manifest.forget_missing(present)
+    if removed:
+        logging.info("Dropped %d deleted file(s) from the manifest", removed)
+    return report
+
+
+def write_redownload_list(report: VerifyReport, path: Path) -> int:
+    """Write the source URLs of bad files (one per line, ``--channel-list`` format)."""
+
+    lines = []
+    for check in report.bad:
+        if check.url:
+            lines.append(check.url)
+        else:
+            lines.append(f"# {check.status}: {check.path} (source URL unknown)")
+    path.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+    return sum(1 for line in lines if not line.startswith("#"))
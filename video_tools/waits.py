@@ -0,0 +1,285 @@
+"""Selenium wait engine: fast polling, DOM/network idle detection and learned timeouts."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Tuple
+from urllib.parse import urlparse
+
+from . import _lazy
+
+# Chrome URL patterns skipped while navigating; video URLs are read from attributes, and
+# manifests (.m3u8/.mpd) stay allowed so players can still set their sources.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico", "*.svg",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.m4s", "*.m4a", "*.mp3",
+]  # fmt: skip
+HISTORY = 20
+MIN_SAMPLES = 3
+# Learned timeout = this multiple of the host/step p95 latency.
+TIMEOUT_MULTIPLIER = 3.0
+MIN_TIMEOUT = 2.0
+
+# Resolves as soon as the selector matches, driven by a MutationObserver instead of polling.
+_APPEAR_SCRIPT = """
+const [kind, query, timeoutMs, done] = arguments;
+const find = () => kind === 'xpath'
+  ? document.evaluate(query, document, null, 9, null).singleNodeValue
+  : document.querySelector(query);
+if (find()) { done(true); return; }
+const observer = new MutationObserver(() => {
+  if (find()) { observer.disconnect(); done(true); }
+});
+observer.observe(document, {childList: true, subtree: true, attributes: true});
+setTimeout(() => { observer.disconnect(); done(false); }, timeoutMs);
+"""
+
+# Installs DOM/network activity tracking once per document and returns the quiet time in ms
+# (-1 while the document is loading or requests are in flight).
+_QUIET_SCRIPT = """
+let w = window.__videoToolsWatch;
+if (!w) {
+  w = window.__videoToolsWatch = {last: performance.now(), pending: 0};
+  const touch = () => { w.last = performance.now(); };
+  new MutationObserver(touch).observe(
+    document, {childList: true, subtree: true, attributes: true});
+  try { new PerformanceObserver(touch).observe({entryTypes: ['resource']}); } catch (e) {}
+  const fetch = window.fetch;
+  if (fetch) {
+    window.fetch = function (...args) {
+      w.pending++;
+      return fetch.apply(this, args).finally(() => { w.pending--; touch(); });
+    };
+  }
+  const send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function (...args) {
+    w.pending++;
+    this.addEventListener('loadend', () => { w.pending--; touch(); });
+    return send.apply(this, args);
+  };
+}
+if (document.readyState !== 'complete' || w.pending > 0) return -1;
+return performance.now() - w.last;
+"""
+
+
+def default_timings_path() -> Path:
+    return Path.home() / ".video_tools" / "step_timings.json"
+
+
+def _host(url: str | None) -> str:
+    return (urlparse(url or "").hostname or "default").removeprefix("www.")
+
+
+class StepTimings:
+    """Recent latencies per host and scrape step, persisted between runs."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Dict[str, Deque[float]]] = {}
+        if path is not None and path.exists():
+            try:
+                raw = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                logging.warning("Ignoring unreadable step timings %s: %s", path, exc)
+                raw = {}
+            for host, steps in raw.items():
+                self._samples[host] = {
+                    step: deque(values, maxlen=HISTORY) for step, values in steps.items()
+                }
+
+    def record(self, host: str, step: str, seconds: float) -> None:
+        with self._lock:
+            steps = self._samples.setdefault(host, {})
+            steps.setdefault(step, deque(maxlen=HISTORY)).append(round(seconds, 3))
+
+    def timeout(self, host: str, step: str, default: float, ceiling: float) -> float:
+        """``default`` until enough samples exist, then a multiple of their p95."""
+
+        with self._lock:
+            values = sorted(self._samples.get(host, {}).get(step, ()))
+        if len(values) < MIN_SAMPLES:
+            return default
+        p95 = values[min(int(0.95 * len(values)), len(values) - 1)]
+        return min(max(p95 * TIMEOUT_MULTIPLIER, MIN_TIMEOUT), ceiling)
+
+    def expected_seconds(self, url: str) -> float | None:
+        """Typical time of one scrape of ``url``'s host: the sum of its steps' medians."""
+
+        with self._lock:
+            steps = [sorted(values) for values in self._samples.get(_host(url), {}).values()]
+        if not steps:
+            return None
+        return sum(values[len(values) // 2] for values in steps if values)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            data = {
+                host: {step: list(values) for step, values in steps.items()}
+                for host, steps in self._samples.items()
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        temp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(temp, self.path)
+
+
+class WaitPolicy:
+    """How scrape steps wait for the page.
+
+    Selectors are awaited with a MutationObserver (no poll interval at all),
+    falling back to WebDriverWait polling every ``poll`` seconds. :meth:`settle`
+    waits until the DOM and network have been quiet for ``idle`` seconds.
+    Each step's timeout is learned from ``timings`` for the current host,
+    between ``MIN_TIMEOUT`` and ``max_timeout`` (default 4x ``timeout``), so
+    slow pages get more time and hung ones fail sooner.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 15.0,
+        poll: float = 0.1,
+        idle: float = 0.3,
+        timings: StepTimings | None = None,
+        max_timeout: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.timeout = timeout
+        self.poll = poll
+        self.idle = idle
+        self.timings = timings
+        self.max_timeout = max_timeout or timeout * 4
+        self.clock = clock
+
+    def timeout_for(self, url: str | None, step: str) -> float:
+        if self.timings is None:
+            return self.timeout
+        return self.timings.timeout(_host(url), step, self.timeout, self.max_timeout)
+
+    def until(
+        self,
+        driver: Any,
+        condition: Callable[[Any], Any],
+        step: str,
+        *,
+        timeout: float | None = None,
+        started: float | None = None,
+    ) -> Any:
+        """WebDriverWait with this policy's poll interval, learned timeout and timing record.
+
+        A step that already waited (``started`` earlier) only gets what is left
+        of ``timeout``, and its sample covers the whole step.
+        """
+
+        _lazy.load("selenium", "selenium")
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        url = driver.current_url
+        timeout = self.timeout_for(url, step) if timeout is None else timeout
+        started = self.clock() if started is None else started
+        remaining = max(timeout - (self.clock() - started), 0.0)
+        try:
+            result = WebDriverWait(driver, remaining, poll_frequency=self.poll).until(condition)
+        except TimeoutException:
+            # Censored sample: the step took at least this long.
+            self._record(url, step, self.clock() - started)
+            raise
+        self._record(url, step, self.clock() - started)
+        return result
+
+    def element(self, driver: Any, locator: Tuple[str, str], step: str, *, clickable=False) -> Any:
+        """Return the first element matching ``locator`` once present (or clickable)."""
+
+        _lazy.load("selenium", "selenium")
+        from selenium.webdriver.support import expected_conditions as EC
+
+        timeout = self.timeout_for(driver.current_url, step)
+        started = self.clock()
+        self._appear(driver, locator, timeout)
+        condition = EC.element_to_be_clickable if clickable else EC.presence_of_element_located
+        return self.until(driver, condition(locator), step, timeout=timeout, started=started)
+
+    def elements(self, driver: Any, locator: Tuple[str, str], step: str) -> List[Any]:
+        """Return every match once the first one exists and the page stopped changing."""
+
+        _lazy.load("selenium", "selenium")
+        from selenium.webdriver.support import expected_conditions as EC
+
+        timeout = self.timeout_for(driver.current_url, step)
+        started = self.clock()
+        self._appear(driver, locator, timeout)
+        self.until(
+            driver,
+            EC.presence_of_all_elements_located(locator),
+            step,
+            timeout=timeout,
+            started=started,
+        )
+        self.settle(driver, f"{step}:settle", timeout=min(self.timeout, 5.0))
+        return driver.find_elements(*locator)
+
+    def settle(self, driver: Any, step: str, timeout: float | None = None) -> bool:
+        """Wait for ``idle`` seconds without DOM mutations or pending requests."""
+
+        _lazy.load("selenium", "selenium")
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        idle_ms = self.idle * 1000
+
+        def quiet(current: Any) -> bool:
+            try:
+                return (current.execute_script(_QUIET_SCRIPT) or -1) >= idle_ms
+            except WebDriverException:  # navigation replaced the document mid-check
+                return False
+
+        started = self.clock()
+        try:
+            WebDriverWait(driver, timeout or self.timeout, poll_frequency=self.poll).until(quiet)
+        except TimeoutException:
+            logging.debug("Page did not settle within %.1fs (%s)", timeout or self.timeout, step)
+            return False
+        self._record(driver.current_url, step, self.clock() - started)
+        return True
+
+    def _appear(self, driver: Any, locator: Tuple[str, str], timeout: float) -> None:
+        # Best effort: any failure (navigation, CSP, old driver) falls back to polling.
+        by, query = locator
+        kind = {"xpath": "xpath", "css selector": "css", "name": "css"}.get(by)
+        if kind is None:
+            return
+        if by == "name":
+            query = f'[name="{query}"]'
+        try:
+            driver.set_script_timeout(timeout + 1)
+            driver.execute_async_script(_APPEAR_SCRIPT, kind, query, int(timeout * 1000))
+        except Exception as exc:
+            logging.debug("Observer wait for %s unavailable: %s", query, exc)
+
+    def _record(self, url: str | None, step: str, seconds: float) -> None:
+        if self.timings is not None:
+            self.timings.record(_host(url), step, seconds)
+
+
+def block_resources(driver: Any, patterns: List[str] | None = None) -> bool:
+    """Tell Chrome (via CDP) not to fetch images, fonts and media; returns success."""
+
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns or BLOCKED_URL_PATTERNS})
+    except Exception as exc:  # non-Chromium drivers have no CDP
+        logging.debug("Resource blocking unavailable: %s", exc)
+        return False
+    return True
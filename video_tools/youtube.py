@@ -2,14 +2,34 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, List
 
-try:  # pragma: no cover - optional dependency
-    import yt_dlp  # type: ignore
-except ImportError:  # pragma: no cover
-    yt_dlp = None  # type: ignore
+from . import _lazy, trace
+from .archive import DownloadArchive, HighWaterMark, make_key
+from .diskspace import DiskBudget
+from .metacache import MetadataCache, file_key, info_key, listing_key
+from .metrics import DownloadMetrics, YtDlpLogger, format_bytes
+from .pipeline import PostProcessPipeline
+from .scheduler import BandwidthSchedule, Scheduler, host_of, parse_rate
+from .store import ContentStore
+
+# yt-dlp's extractor registry is slow to import; it is loaded on the first download.
+yt_dlp: Any = None
+
+
+def _yt_dlp() -> Any:
+    global yt_dlp
+    if yt_dlp is None:
+        yt_dlp = _lazy.load("yt_dlp", "yt-dlp")
+    return yt_dlp
 
 
 def build_yt_dlp_options(
@@ -19,26 +39,110 @@ def build_yt_dlp_options(
     rate_limit: str | None,
     cookies: Path | None,
     retries: int,
+    archive: DownloadArchive | None = None,
+    incremental: IncrementalFilter | None = None,
+    metrics: DownloadMetrics | None = None,
+    scratch_dir: Path | None = None,
 ) -> Dict[str, Any]:
-    """Return a configured options dict ready for YoutubeDL."""
+    """Return a configured options dict ready for YoutubeDL.
+
+    With ``scratch_dir``, partial downloads and merge temp files live there and
+    finished files are moved into ``output_dir``.
+    """
 
     output_dir.mkdir(parents=True, exist_ok=True)
+    metrics = metrics or DownloadMetrics()
 
+    template = "%(uploader)s/%(upload_date)s_%(title)s.%(ext)s"
     opts: Dict[str, Any] = {
         "format": video_format,
         "merge_output_format": "mp4",
         "continuedl": resume,
         "retries": retries,
-        "outtmpl": str(output_dir / "%(uploader)s/%(upload_date)s_%(title)s.%(ext)s"),
-        "progress_hooks": [_log_download_progress],
+        "outtmpl": str(output_dir / template),
+        "progress_hooks": [metrics],
+        "logger": metrics.logger(),
     }
+    if scratch_dir is not None:
+        scratch_dir.mkdir(parents=True, exist_ok=True)
+        # yt-dlp only honours "paths" for relative output templates.
+        opts["outtmpl"] = template
+        opts["paths"] = {"home": str(output_dir), "temp": str(scratch_dir)}
     if rate_limit:
-        opts["ratelimit"] = rate_limit
+        opts["ratelimit"] = parse_rate(rate_limit)
     if cookies:
         opts["cookiefile"] = str(cookies)
+    if archive is not None:
+        opts["download_archive"] = archive
+    if incremental is not None:
+        opts.update(
+            {
+                "lazy_playlist": True,
+                "match_filter": incremental,
+                "break_on_reject": True,
+                "break_per_url": True,
+            }
+        )
     return opts
 
 
+class IncrementalFilter:
+    """yt-dlp ``match_filter`` that stops a channel walk at its previous high-water mark.
+
+    Channel upload lists are newest-first, so together with ``lazy_playlist``
+    and ``break_on_reject`` yt-dlp stops paginating at the first upload the
+    previous sync already saw. Without a stored mark (or with ``full_rescan``)
+    every entry passes and the walk is a full scan.
+    """
+
+    def __init__(self, archive: DownloadArchive, url: str, *, full_rescan: bool = False) -> None:
+        self.archive = archive
+        self.url = url
+        self.state = archive.channel_state(url)
+        self.mark = None if full_rescan or self.state is None else self.state.mark
+        self.newest: HighWaterMark | None = None
+        self._started = time.monotonic()
+
+    @property
+    def full_scan(self) -> bool:
+        return self.mark is None
+
+    def __call__(self, info: Dict[str, Any], *, incomplete: bool = False) -> str | None:
+        video_id = info.get("id")
+        if not video_id or _is_nested_playlist(info):
+            return None
+        upload_date = info.get("upload_date")
+        if self.mark is not None and (
+            video_id == self.mark.video_id
+            or (upload_date and self.mark.upload_date and upload_date < self.mark.upload_date)
+        ):
+            return "reached the newest upload seen by the previous sync"
+        if self.newest is None:
+            self.newest = HighWaterMark(video_id, upload_date)
+        elif self.newest.video_id == video_id and not self.newest.upload_date:
+            self.newest.upload_date = upload_date
+        return None
+
+    def commit(self) -> float:
+        """Persist the new high-water mark and timing; call only after a clean sync."""
+
+        elapsed = time.monotonic() - self._started
+        self.archive.record_sync(self.url, self.newest, elapsed=elapsed, full_scan=self.full_scan)
+        if not self.full_scan and self.state and self.state.last_full_elapsed:
+            logging.info(
+                "Incremental sync of %s took %.1fs (last full scan %.1fs)",
+                self.url,
+                elapsed,
+                self.state.last_full_elapsed,
+            )
+        return elapsed
+
+
+def _is_nested_playlist(info: Dict[str, Any]) -> bool:
+    # Channel roots list their tabs (videos, shorts, streams) as playlist entries.
+    return info.get("_type") == "playlist" or str(info.get("ie_key") or "").endswith("Tab")
+
+
 def download_channel(
     url: str,
     *,
@@ -48,9 +152,41 @@ def download_channel(
     rate_limit: str | None = None,
     cookies: Path | None = None,
     retries: int = 3,
+    archive: DownloadArchive | None = None,
+    incremental: bool = False,
+    full_rescan: bool = False,
+    metrics: DownloadMetrics | None = None,
+    cache: MetadataCache | None = None,
+    metadata_max_age: float = 3600.0,
+    refresh_metadata: bool = False,
+    postprocess_workers: int = 0,
+    pipeline_depth: int = 2,
+    checksum: bool = False,
+    store: ContentStore | None = None,
+    scheduler: Scheduler | None = None,
+    scratch_dir: Path | None = None,
+    disk: DiskBudget | None = None,
+    progress_hooks: Iterable[Callable[[Dict[str, Any]], None]] = (),
 ) -> None:
-    """Download all videos from a YouTube channel/playlist."""
+    """Download all videos from a YouTube channel/playlist.
+
+    With ``incremental`` the channel walk stops at the newest upload recorded in
+    ``archive`` by the previous sync; ``full_rescan`` ignores that mark once.
+    Progress is aggregated in ``metrics`` (a private instance if omitted).
+    With a metadata ``cache``, listings and video info younger than
+    ``metadata_max_age`` seconds are reused instead of being extracted again.
+    ``postprocess_workers`` merge/remux finished videos while the next one
+    downloads (see :class:`~video_tools.pipeline.PostProcessPipeline`).
+    Finished files are deduplicated into ``store`` when one is given.
+    A ``scheduler`` paces requests and backs off when the host throttles.
+    Temporary files go to ``scratch_dir`` when given, and with a ``disk``
+    budget each video waits until its estimated size fits on the volume(s).
+    ``progress_hooks`` receive yt-dlp's progress dicts next to ``metrics``.
+    """
 
+    tracker = _incremental_filter(archive, url, incremental, full_rescan)
+    own_metrics = metrics is None
+    metrics = metrics or DownloadMetrics()
     opts = build_yt_dlp_options(
         output_dir=output_dir,
         video_format=video_format,
@@ -58,25 +194,569 @@ def download_channel(
         rate_limit=rate_limit,
         cookies=cookies,
         retries=retries,
+        archive=archive,
+        incremental=tracker,
+        metrics=metrics,
+        scratch_dir=scratch_dir,
     )
+    opts["progress_hooks"].extend(progress_hooks)
+    if scheduler is not None:
+        scheduler.configure(opts, url)
+    admit = _admission(disk, output_dir, scratch_dir)
 
-    if yt_dlp is None:  # pragma: no cover - run-time error
-        raise RuntimeError(
-            "yt-dlp is not installed. Please install video-tools with its default dependencies."
+    pipeline = _pipeline(postprocess_workers, pipeline_depth, checksum)
+    with trace.span("download_channel", host=host_of(url)):
+        try:
+            with scheduler.slot(url) if scheduler is not None else contextlib.nullcontext():
+                _download(
+                    url,
+                    opts,
+                    cache,
+                    tracker,
+                    metadata_max_age,
+                    refresh_metadata,
+                    pipeline,
+                    store,
+                    admit,
+                )
+        finally:
+            if pipeline is not None:
+                pipeline.close()
+            if own_metrics:
+                metrics.close()
+    if tracker is not None:
+        tracker.commit()
+
+
+def _admission(
+    disk: DiskBudget | None, output_dir: Path, scratch_dir: Path | None
+) -> Callable[[Any], None] | None:
+    if disk is None:
+        return None
+    return functools.partial(disk.attach, output_dir=output_dir, scratch_dir=scratch_dir)
+
+
+def _pipeline(workers: int, depth: int, checksum: bool) -> PostProcessPipeline | None:
+    if workers <= 0 and not checksum:
+        return None
+    return PostProcessPipeline(workers=workers, depth=depth, checksum=checksum)
+
+
+def _download(
+    url: str,
+    opts: Dict[str, Any],
+    cache: MetadataCache | None,
+    tracker: IncrementalFilter | None,
+    max_age: float,
+    refresh: bool,
+    pipeline: PostProcessPipeline | None = None,
+    store: ContentStore | None = None,
+    admit: Callable[[Any], None] | None = None,
+) -> None:
+    extras: Dict[str, Any] = {
+        name: value
+        for name, value in (("pipeline", pipeline), ("store", store), ("admit", admit))
+        if value is not None
+    }
+    if cache is None:
+        _run_yt_dlp(url, opts, **extras)
+        return
+    # Incremental walks must see the live feed; they still reuse cached video info.
+    listing = None
+    if tracker is None:
+        listing = extract_listing(
+            url, cache=cache, cookies=opts.get("cookiefile"), max_age=max_age, refresh=refresh
         )
+    _run_yt_dlp(url, opts, cache=cache, listing=listing, max_age=max_age, **extras)
+
+
+def _incremental_filter(
+    archive: DownloadArchive | None, url: str, incremental: bool, full_rescan: bool
+) -> IncrementalFilter | None:
+    if not incremental:
+        return None
+    if archive is None:
+        raise ValueError("Incremental sync needs a download archive to store high-water marks.")
+    return IncrementalFilter(archive, url, full_rescan=full_rescan)
+
 
+def _run_yt_dlp(
+    url: str,
+    opts: Dict[str, Any],
+    *,
+    cache: MetadataCache | None = None,
+    listing: Dict[str, Any] | None = None,
+    max_age: float | None = None,
+    pipeline: PostProcessPipeline | None = None,
+    store: ContentStore | None = None,
+    admit: Callable[[Any], None] | None = None,
+) -> None:
+    backend = _yt_dlp()
     logging.info("Starting yt-dlp download for %s", url)
-    with yt_dlp.YoutubeDL(opts) as ydl:
-        ydl.download([url])
+    with trace.span("yt-dlp", host=host_of(url)), backend.YoutubeDL(opts) as ydl:
+        if trace.enabled():
+            _trace_phases(ydl)
+        if admit is not None:
+            admit(ydl)  # before the pipeline, so reservations last until files are merged
+        if cache is not None:
+            ydl.add_post_processor(_InfoCacher(cache), when="pre_process")
+            ydl.add_post_processor(_FileRecorder(cache), when="after_move")
+        if store is not None:
+            ydl.add_post_processor(store.postprocessor(), when="after_move")
+        if pipeline is not None:
+            pipeline.attach(ydl)
+        try:
+            if listing is None:
+                retcode = ydl.download([url])
+            else:
+                ydl.process_ie_result(with_cached_info(listing, cache, max_age), download=True)
+                retcode = ydl._download_retcode
+        finally:
+            if pipeline is not None:
+                pipeline.join()
+    if pipeline is not None and pipeline.failures:
+        raise RuntimeError(f"post-processing failed for {len(pipeline.failures)} file(s)")
+    if retcode:
+        raise RuntimeError(f"yt-dlp reported errors for {url}")
     logging.info("Download completed for %s", url)
 
 
-def _log_download_progress(status: dict) -> None:
-    if status.get("status") == "downloading":
-        logging.info(
-            "Downloading %s %s",
-            status.get("filename", "unknown"),
-            status.get("_percent_str", "0%"),
-        )
-    elif status.get("status") == "finished":
-        logging.info("Finished downloading %s", status.get("filename", "unknown"))
+def _trace_phases(ydl: Any) -> None:
+    """Time extraction, transfer and post-processing (merge/remux) as separate spans."""
+
+    extract_info, dl, post_process = ydl.extract_info, ydl.dl, ydl.post_process
+
+    def traced_extract(url, *args, **kwargs):
+        with trace.span("extract", url=url):
+            return extract_info(url, *args, **kwargs)
+
+    def traced_dl(name, info, *args, **kwargs):
+        with trace.span("transfer", id=info.get("id"), format=info.get("format_id")) as span:
+            result = dl(name, info, *args, **kwargs)
+            with contextlib.suppress(OSError):
+                span["bytes"] = Path(name).stat().st_size
+            return result
+
+    def traced_post_process(filename, info, *args, **kwargs):
+        with trace.span("postprocess", id=info.get("id")):
+            return post_process(filename, info, *args, **kwargs)
+
+    # Instance attributes shadow the methods for yt-dlp's own internal calls too. Installed
+    # before the pipeline wraps post_process, so merges are timed on the worker threads.
+    ydl.extract_info, ydl.dl, ydl.post_process = traced_extract, traced_dl, traced_post_process
+
+
+# Set on info dicts served from the cache so they are not re-stored as fresh.
+_FROM_CACHE = "__video_tools_cached"
+
+
+def _flat_options(cookies: Path | str | None) -> Dict[str, Any]:
+    opts: Dict[str, Any] = {
+        "extract_flat": "in_playlist",
+        "skip_download": True,
+        "quiet": True,
+        "logger": YtDlpLogger(),
+    }
+    if cookies:
+        opts["cookiefile"] = str(cookies)
+    return opts
+
+
+def extract_listing(
+    url: str,
+    *,
+    cache: MetadataCache | None = None,
+    cookies: Path | str | None = None,
+    max_age: float | None = None,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """Return the flat listing (ids, titles, URLs) of a channel or playlist.
+
+    Channel tabs are expanded one level. A single video URL yields its info dict.
+    """
+
+    key = listing_key(url)
+    if cache is not None and not refresh:
+        cached = cache.get(key, max_age=max_age)
+        if cached is not None:
+            logging.debug("Using cached listing for %s", url)
+            return cached
+
+    with trace.span("extract.listing", url=url), _yt_dlp().YoutubeDL(_flat_options(cookies)) as ydl:
+        raw = ydl.extract_info(url, download=False, process=False)
+        if raw.get("_type") in ("playlist", "multi_video"):
+            raw = ydl.process_ie_result(raw, download=False)
+        listing = ydl.sanitize_info(raw, remove_private_keys=False)
+        entries = listing.get("entries") or []
+        for index, entry in enumerate(entries):
+            if entry and _is_nested_playlist(entry) and entry.get("url"):
+                nested = ydl.extract_info(entry["url"], download=False)
+                entries[index] = ydl.sanitize_info(nested)
+    if cache is not None:
+        cache.put(key, listing)
+        if listing.get("formats"):
+            store_video_info(cache, listing, url)
+    return listing
+
+
+def extract_video_info(
+    url: str,
+    *,
+    cache: MetadataCache | None = None,
+    cookies: Path | str | None = None,
+    max_age: float | None = None,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """Return the full info dict (all formats, before format selection) for one video."""
+
+    if cache is not None and not refresh:
+        cached = cache.get(info_key(url), max_age=max_age)
+        if cached is not None:
+            return cached
+
+    opts = _flat_options(cookies)
+    opts.pop("extract_flat")
+    with _yt_dlp().YoutubeDL(opts) as ydl:
+        info = ydl.extract_info(url, download=False, process=False)
+        if info.get("_type") in ("url", "url_transparent"):
+            info = ydl.extract_info(
+                info["url"], download=False, process=False, ie_key=info.get("ie_key")
+            )
+        info = ydl.sanitize_info(info, remove_private_keys=True)
+    if cache is not None:
+        store_video_info(cache, info, url)
+    return info
+
+
+def listing_entries(listing: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The videos of a listing from :func:`extract_listing`, with channel tabs flattened."""
+
+    if "entries" not in listing:
+        return [listing]
+    entries = []
+    for entry in listing["entries"] or []:
+        if entry and entry.get("entries") is not None:
+            entries.extend(listing_entries(entry))
+        elif entry:
+            entries.append(entry)
+    return entries
+
+
+def store_video_info(cache: MetadataCache, info: Dict[str, Any], *urls: str) -> None:
+    """Cache a video's info dict under its canonical URL (and any alias ``urls``)."""
+
+    # Playlist context belongs to the run that produced it, not to the video.
+    clean = {
+        key: value
+        for key, value in info.items()
+        if not key.startswith(("playlist", "n_entries", "__"))
+    }
+    for url in {info.get("webpage_url"), *urls}:
+        if url:
+            cache.put(info_key(url), clean)
+
+
+def with_cached_info(
+    listing: Dict[str, Any], cache: MetadataCache | None, max_age: float | None
+) -> Dict[str, Any]:
+    """Swap flat listing entries for cached full info so yt-dlp skips extracting them."""
+
+    if cache is None or not listing.get("entries"):
+        return listing
+    entries = []
+    for entry in listing["entries"]:
+        if entry and entry.get("entries"):
+            entry = with_cached_info(entry, cache, max_age)
+        elif entry and entry.get("_type") in ("url", "url_transparent") and entry.get("url"):
+            cached = cache.get(info_key(entry["url"]), max_age=max_age)
+            if cached is not None:
+                entry = {**cached, _FROM_CACHE: True}
+        entries.append(entry)
+    return {**listing, "entries": entries}
+
+
+class _InfoCacher:
+    """yt-dlp ``pre_process`` hook storing each freshly extracted video's info dict."""
+
+    def __init__(self, cache: MetadataCache) -> None:
+        self.cache = cache
+        self._downloader: Any = None
+
+    def set_downloader(self, downloader: Any) -> None:
+        self._downloader = downloader
+
+    def run(self, info: Dict[str, Any]) -> tuple:
+        if info.get("formats") and not info.get(_FROM_CACHE) and self._downloader is not None:
+            store_video_info(
+                self.cache, self._downloader.sanitize_info(dict(info), remove_private_keys=True)
+            )
+        return [], info
+
+
+class _FileRecorder:
+    """yt-dlp ``after_move`` hook remembering which video each output file holds."""
+
+    def __init__(self, cache: MetadataCache) -> None:
+        self.cache = cache
+
+    def set_downloader(self, downloader: Any) -> None:
+        pass
+
+    def run(self, info: Dict[str, Any]) -> tuple:
+        filepath = info.get("filepath")
+        if filepath:
+            extractor = info.get("extractor_key") or info.get("extractor")
+            self.cache.put(
+                file_key(filepath),
+                {
+                    "url": info.get("webpage_url"),
+                    "archive_key": (
+                        make_key(extractor, info["id"]) if extractor and info.get("id") else None
+                    ),
+                    "duration": info.get("duration"),
+                    # Merged downloads have no single exact size to compare against.
+                    "filesize": None if info.get("requested_formats") else info.get("filesize"),
+                },
+            )
+        return [], info
+
+
+class BandwidthBudget:
+    """Global bytes/s budget split evenly between workers that are transferring.
+
+    A ``schedule`` further caps the budget by time of day.
+    """
+
+    def __init__(
+        self,
+        total: float | None,
+        idle_after: float = 2.0,
+        schedule: BandwidthSchedule | None = None,
+    ) -> None:
+        self.total = total
+        self.schedule = schedule
+        self.idle_after = idle_after
+        self._last_seen: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def share(self, worker: int) -> float | None:
+        """Mark ``worker`` as active and return its current slice of the budget."""
+
+        window = self.schedule.current() if self.schedule is not None else None
+        limits = [limit for limit in (self.total, window) if limit]
+        if not limits:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            self._last_seen[worker] = now
+            active = sum(1 for seen in self._last_seen.values() if now - seen <= self.idle_after)
+        return min(limits) / max(active, 1)
+
+    def release(self, worker: int) -> None:
+        with self._lock:
+            self._last_seen.pop(worker, None)
+
+
+class HostLimiter:
+    """Bound the number of concurrent channel syncs against the same host."""
+
+    def __init__(self, per_host: int) -> None:
+        self.per_host = per_host
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def slot(self, url: str) -> threading.Semaphore:
+        host = host_of(url)
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.Semaphore(self.per_host)
+            return self._semaphores[host]
+
+
+@dataclass
+class ChannelResult:
+    url: str
+    ok: bool
+    elapsed: float = 0.0
+    downloaded_bytes: int = 0
+    videos: int = 0
+    incremental: bool = False
+    error: str | None = None
+
+
+@dataclass
+class SyncReport:
+    results: List[ChannelResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def downloaded_bytes(self) -> int:
+        return sum(result.downloaded_bytes for result in self.results)
+
+    @property
+    def failed(self) -> List[ChannelResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def throughput(self) -> float:
+        """Aggregate bytes per second across the whole sync."""
+
+        return self.downloaded_bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def read_channel_list(path: Path) -> List[str]:
+    """Read one URL per line, ignoring blank lines and ``#`` comments."""
+
+    urls = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            urls.append(line)
+    return urls
+
+
+def sync_channels(
+    urls: Iterable[str],
+    *,
+    output_dir: Path,
+    workers: int = 4,
+    per_host: int = 2,
+    bandwidth: str | float | None = None,
+    video_format: str = "bestvideo+bestaudio",
+    resume: bool = True,
+    rate_limit: str | None = None,
+    cookies: Path | None = None,
+    retries: int = 3,
+    archive: DownloadArchive | None = None,
+    incremental: bool = False,
+    full_rescan: bool = False,
+    metrics: DownloadMetrics | None = None,
+    cache: MetadataCache | None = None,
+    metadata_max_age: float = 3600.0,
+    refresh_metadata: bool = False,
+    postprocess_workers: int = 0,
+    pipeline_depth: int = 2,
+    checksum: bool = False,
+    store: ContentStore | None = None,
+    scheduler: Scheduler | None = None,
+    scratch_dir: Path | None = None,
+    disk: DiskBudget | None = None,
+) -> SyncReport:
+    """Download many channels concurrently; failures are reported, not raised.
+
+    ``bandwidth`` is a global budget shared by all workers that are currently
+    transferring; ``rate_limit`` still caps each individual channel. A
+    ``scheduler`` replaces the fixed ``per_host`` limit with its adaptive one.
+    One ``disk`` budget is shared by all workers.
+    """
+
+    channel_urls = list(dict.fromkeys(urls))
+    budget = BandwidthBudget(
+        parse_rate(bandwidth) if bandwidth else None,
+        schedule=scheduler.schedule if scheduler is not None else None,
+    )
+    limiter = scheduler or HostLimiter(per_host)
+    cap = parse_rate(rate_limit) if rate_limit else None
+    own_metrics = metrics is None
+    metrics = metrics or DownloadMetrics()
+    metrics.set_queue_depth(len(channel_urls))
+
+    def sync_one(worker: int, url: str) -> ChannelResult:
+        result = ChannelResult(url=url, ok=False)
+
+        def throttle(status: dict) -> None:
+            if status.get("status") == "downloading":
+                share = budget.share(worker)
+                if share is not None:
+                    opts["ratelimit"] = min(share, cap) if cap else share
+            elif status.get("status") == "finished":
+                result.downloaded_bytes += int(
+                    status.get("total_bytes") or status.get("downloaded_bytes") or 0
+                )
+                result.videos += 1
+
+        started = time.monotonic()
+        try:
+            with limiter.slot(url):
+                metrics.dequeued()
+                tracker = _incremental_filter(archive, url, incremental, full_rescan)
+                opts = build_yt_dlp_options(
+                    output_dir=output_dir,
+                    video_format=video_format,
+                    resume=resume,
+                    rate_limit=rate_limit,
+                    cookies=cookies,
+                    retries=retries,
+                    archive=archive,
+                    incremental=tracker,
+                    metrics=metrics,
+                    scratch_dir=scratch_dir,
+                )
+                if scheduler is not None:
+                    scheduler.configure(opts, url, bandwidth=False)
+                opts["progress_hooks"].append(throttle)
+                pipeline = _pipeline(postprocess_workers, pipeline_depth, checksum)
+                try:
+                    _download(
+                        url,
+                        opts,
+                        cache,
+                        tracker,
+                        metadata_max_age,
+                        refresh_metadata,
+                        pipeline,
+                        store,
+                        _admission(disk, output_dir, scratch_dir),
+                    )
+                finally:
+                    if pipeline is not None:
+                        pipeline.close()
+                if tracker is not None:
+                    tracker.commit()
+                    result.incremental = not tracker.full_scan
+            result.ok = True
+        except Exception as exc:  # one failing channel must not abort the batch
+            logging.error("Channel %s failed: %s", url, exc)
+            result.error = str(exc)
+        finally:
+            budget.release(worker)
+            result.elapsed = time.monotonic() - started
+        return result
+
+    report = SyncReport()
+    started = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            futures = [pool.submit(sync_one, index, url) for index, url in enumerate(channel_urls)]
+            for future in as_completed(futures):
+                report.results.append(future.result())
+    finally:
+        if own_metrics:
+            metrics.close()
+    report.elapsed = time.monotonic() - started
+    order = {url: index for index, url in enumerate(channel_urls)}
+    report.results.sort(key=lambda result: order[result.url])
+    return report
+
+
+def log_sync_report(report: SyncReport) -> None:
+    for result in report.results:
+        if result.ok:
+            logging.info(
+                "%s: %d file(s), %s in %.1fs%s",
+                result.url,
+                result.videos,
+                format_bytes(result.downloaded_bytes),
+                result.elapsed,
+                " (incremental)" if result.incremental else "",
+            )
+        else:
+            logging.error("%s: FAILED after %.1fs (%s)", result.url, result.elapsed, result.error)
+    logging.info(
+        "Synced %d/%d channel(s): %s in %.1fs (%s/s)",
+        len(report.results) - len(report.failed),
+        len(report.results),
+        format_bytes(report.downloaded_bytes),
+        report.elapsed,
+        format_bytes(report.throughput),
+    )